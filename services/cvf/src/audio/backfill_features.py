@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+backfill_features.py -- incremental re-extraction of a V5 results archive.
+
+For every recording in an audio directory or a manifest, compares the stored
+result document with the current engine (``task_feature_keys`` and
+``FEATURE_VERSIONS`` in extract_features_v5.py) and runs only the
+``extract_*`` functions whose features are missing or stale.  Features that
+are already current keep their stored values.  Recordings without a result
+get a full extraction.
+
+Progress is appended to a checkpoint file after every recording, so an
+interrupted run resumes where it stopped.  A checkpoint written under other
+feature versions is ignored automatically.
+
+Usage:
+    python backfill_features.py --audio-dir /archive/audio \
+        --results-dir /archive/results --task-type conversation
+
+    python backfill_features.py --manifest archive.jsonl \
+        --results-dir /archive/results --track-dir /archive/tracks --jobs 4
+
+Manifest lines are JSON objects: ``{"audio_path": "...", "task_type": "...",
+"gender": "...", "id": "..."}``; only ``audio_path`` is required and
+relative paths are resolved against the manifest's directory.  The result
+for a recording is ``<results-dir>/<id>.json``, where ``id`` defaults to the
+audio path relative to its root, without extension.  Whisper transcripts
+and temporal indicators are never backfilled.
+"""
+
+import argparse, hashlib, json, os, sys, tempfile, time
+
+import extract_features_v5 as v5
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3", ".m4a", ".webm")
+CHECKPOINT_NAME = ".backfill-checkpoint.jsonl"
+
+
+# ============================================================================
+# Archive listing
+# ============================================================================
+
+def _record_id(audio_path, root):
+    return os.path.splitext(os.path.relpath(audio_path, root))[0].replace(os.sep, "/")
+
+
+def iter_audio_dir(audio_dir):
+    """Recordings under ``audio_dir`` (recursive, sorted) as job dicts."""
+    root = os.path.realpath(audio_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                path = os.path.join(dirpath, name)
+                yield {"id": _record_id(path, root), "audio_path": path}
+
+
+def iter_manifest(manifest_path):
+    """Jobs from a JSON-lines manifest; blank lines are skipped."""
+    root = os.path.dirname(os.path.realpath(manifest_path))
+    with open(manifest_path, encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if not isinstance(entry, dict) or not entry.get("audio_path"):
+                raise ValueError(f"{manifest_path}:{line_no}: audio_path is required")
+            path = os.path.join(root, entry["audio_path"])
+            yield {
+                "id": str(entry.get("id") or _record_id(path, root)),
+                "audio_path": path,
+                "task_type": entry.get("task_type"),
+                "gender": entry.get("gender"),
+            }
+
+
+# ============================================================================
+# Planning
+# ============================================================================
+
+def plan_fingerprint():
+    """Digest of the feature definitions a checkpoint entry was planned with."""
+    payload = json.dumps(
+        {"versions": v5.FEATURE_VERSIONS, "extractors": v5.TASK_EXTRACTORS,
+         "keys": v5.EXTRACTOR_KEYS},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def stale_features(result, task_type):
+    """Feature keys of ``task_type`` missing from ``result`` or out of date.
+
+    Results written before ``feature_versions`` existed count as revision 1
+    for every feature they contain.  A stored null is a current value.
+    """
+    features = result.get("features") or {}
+    versions = result.get("feature_versions") or {}
+    return [
+        key for key in v5.task_feature_keys(task_type)
+        if key not in features or versions.get(key, 1) < v5.feature_version(key)
+    ]
+
+
+# ============================================================================
+# Results store
+# ============================================================================
+
+def result_path(results_dir, record_id):
+    """``<results_dir>/<id>.json``; ids may not leave the results directory."""
+    path = os.path.realpath(os.path.join(results_dir, record_id + ".json"))
+    if os.path.commonpath([path, results_dir]) != results_dir:
+        raise ValueError(f"Record id escapes the results directory: {record_id}")
+    return path
+
+
+def read_result(path):
+    """Stored result document, or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def write_result(path, result):
+    """Replace the result at ``path`` atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(result, fh)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# ============================================================================
+# Backfill
+# ============================================================================
+
+def backfill_record(job, results_dir, gpu=False, track_dir=None, dry_run=False,
+                    task_type=None, gender=None):
+    """Bring the stored result of one recording up to date.
+
+    The task type and gender come from the job, else the stored result,
+    else ``task_type`` / ``gender`` (gender finally defaults to female).
+
+    Returns
+    -------
+    dict -- checkpoint entry: ``id``, ``status`` ("current", "updated",
+            "extracted", "planned" or "error"), ``features`` recomputed
+            and ``error`` on failure.
+    """
+    entry = {"id": job["id"]}
+    try:
+        path = result_path(results_dir, job["id"])
+        stored = read_result(path)
+        if stored is not None and stored.get("status") != "ok":
+            stored = None
+        task_type = (
+            job.get("task_type") or (stored or {}).get("task_type") or task_type
+        )
+        gender = (
+            job.get("gender") or (stored or {}).get("gender") or gender or "female"
+        )
+        audio_path = v5.validate_job(job["audio_path"], task_type, gender)
+
+        keys = (
+            list(v5.task_feature_keys(task_type)) if stored is None
+            else stale_features(stored, task_type)
+        )
+        entry["features"] = keys
+        if not keys:
+            entry["status"] = "current"
+            return entry
+        if dry_run:
+            entry["status"] = "planned"
+            plan = v5.plan_features(task_type, keys)
+            entry["extractors"] = plan["extractors"]
+            entry["analyses"] = plan["analyses"]
+            return entry
+
+        tracks = v5.TrackStore.from_env(track_dir)
+        if stored is None:
+            result = v5.run_extraction(
+                audio_path, task_type, gender=gender, gpu=gpu, tracks=tracks,
+            )
+            entry["status"] = "extracted"
+        else:
+            fresh = v5.run_extraction(
+                audio_path, task_type, gender=gender, gpu=gpu, tracks=tracks,
+                only=keys,
+            )
+            result = stored
+            features = dict(result.get("features") or {})
+            versions = {
+                key: (result.get("feature_versions") or {}).get(key, 1)
+                for key in features
+            }
+            for key in keys:
+                features[key] = fresh["features"].get(key)
+                versions[key] = v5.feature_version(key)
+            # Task keys in extraction order, then any the engine no longer emits
+            order = [k for k in v5.task_feature_keys(task_type) if k in features]
+            result["features"] = {**{k: features[k] for k in order}, **features}
+            result["feature_versions"] = {k: versions[k] for k in result["features"]}
+            result["backfill"] = {
+                "engine_version": v5.ENGINE_VERSION, "features": keys,
+            }
+            entry["status"] = "updated"
+        write_result(path, result)
+    except v5.JobError as exc:
+        entry.update(status="error", error=str(exc))
+    except Exception as exc:
+        entry.update(status="error", error=f"Feature extraction failed: {exc}")
+    return entry
+
+
+def load_checkpoint(path, fingerprint, retry_errors=False):
+    """Ids already handled under ``fingerprint`` according to ``path``."""
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of an interrupted run
+                if entry.get("plan") != fingerprint:
+                    continue
+                if entry.get("status") == "error" and retry_errors:
+                    done.discard(entry.get("id"))
+                else:
+                    done.add(entry.get("id"))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def run_backfill(jobs, results_dir, checkpoint_path=None, gpu=False,
+                 track_dir=None, n_jobs=1, dry_run=False, retry_errors=False,
+                 task_type=None, gender=None, log=None):
+    """Backfill every job not yet in the checkpoint; returns status counts."""
+    results_dir = os.path.realpath(results_dir)
+    os.makedirs(results_dir, exist_ok=True)
+    checkpoint_path = checkpoint_path or os.path.join(results_dir, CHECKPOINT_NAME)
+    fingerprint = plan_fingerprint()
+    done = set() if dry_run else load_checkpoint(
+        checkpoint_path, fingerprint, retry_errors,
+    )
+    jobs = list(jobs)
+    pending = [job for job in jobs if job["id"] not in done]
+    counts = {"skipped": len(jobs) - len(pending)}
+
+    def record(entry, checkpoint):
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        if log is not None:
+            log.write(json.dumps(entry) + "\n")
+            log.flush()
+        if checkpoint is not None:
+            entry["plan"] = fingerprint
+            checkpoint.write(json.dumps(entry) + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+    checkpoint = None if dry_run else open(checkpoint_path, "a", encoding="utf-8")
+    try:
+        args = (results_dir, gpu, track_dir, dry_run, task_type, gender)
+        if n_jobs > 1 and not dry_run:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                futures = [pool.submit(backfill_record, job, *args) for job in pending]
+                for future in as_completed(futures):
+                    record(future.result(), checkpoint)
+        else:
+            for job in pending:
+                record(backfill_record(job, *args), checkpoint)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    return counts
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute missing or stale V5 features in a results archive"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--audio-dir", help="Directory of recordings (recursive)")
+    source.add_argument("--manifest", help="JSON-lines manifest of recordings")
+    parser.add_argument(
+        "--results-dir", required=True,
+        help="Results store: one <id>.json result document per recording",
+    )
+    parser.add_argument(
+        "--task-type", choices=list(v5.VALID_TASK_TYPES), default=None,
+        help="Task type for recordings whose manifest entry and stored result "
+             "do not name one",
+    )
+    parser.add_argument(
+        "--gender", choices=sorted(v5.F0_NORMS), default=None,
+        help="Gender for recordings without one (default: stored, else female)",
+    )
+    parser.add_argument(
+        "--checkpoint", default=None,
+        help=f"Progress file (default: <results-dir>/{CHECKPOINT_NAME})",
+    )
+    parser.add_argument(
+        "--retry-errors", action="store_true", default=False,
+        help="Retry recordings the checkpoint lists as failed",
+    )
+    parser.add_argument(
+        "--track-dir", default=None,
+        help=f"Analysis track store reused across runs (default: ${v5.TRACK_DIR_ENV})",
+    )
+    parser.add_argument("--gpu", action="store_true", default=False)
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes (default 1)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", default=False,
+        help="Only report which features each recording would recompute",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.audio_dir:
+        jobs = iter_audio_dir(args.audio_dir)
+    else:
+        jobs = iter_manifest(args.manifest)
+
+    started = time.time()
+    try:
+        counts = run_backfill(
+            jobs, args.results_dir, checkpoint_path=args.checkpoint,
+            gpu=args.gpu, track_dir=args.track_dir, n_jobs=args.jobs,
+            dry_run=args.dry_run, retry_errors=args.retry_errors,
+            task_type=args.task_type, gender=args.gender, log=sys.stderr,
+        )
+    except (OSError, ValueError) as exc:
+        print(json.dumps({"status": "error", "error": str(exc)}))
+        sys.exit(1)
+    print(json.dumps({
+        "status": "ok", "counts": counts,
+        "elapsed_s": round(time.time() - started, 3),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+benchmark_features.py -- timing benchmarks for the V5 extractors.
+
+Generates deterministic synthetic recordings, so no patient audio is needed
+and every run measures the same input:
+
+  - ``vowel``  : glottal pulse train through /a/ formants, with controlled
+                 jitter, shimmer and a 5 Hz tremor (sustained-vowel task)
+  - ``pataka`` : /pa/-/ta/-/ka/ syllables, i.e. a filtered noise burst followed
+                 by a short vowel, at ~6 Hz with jittered spacing (DDK task)
+  - ``speech`` : phrases of voiced syllables with moving formants, declining
+                 F0 and pauses, mixed with colored noise at 10 dB SNR
+
+at 5 s, 30 s, 2 min and 10 min.  Each ``extract_*`` function and the
+helpers behind them (Praat analyses, CPP, nolds measures, MFCC, HPSS, VAD,
+streaming) is timed separately with a fresh AnalysisContext, so a result is
+the full cost of that function on its own.  ``asr_whisper_int8`` runs the
+int8 Whisper backend with the ``tiny`` model on the speech signal, which
+doubles as a smoke test of the quantized model.  Every benchmark is warmed up
+once on a 1 s signal first (imports, numba compilation).
+
+Usage:
+    python benchmark_features.py --output baseline.json
+    python benchmark_features.py --durations 5s,30s --compare baseline.json
+
+With ``--compare`` each benchmark's median is divided by the baseline's;
+ratios above ``--threshold`` are regressions and make the exit status 1.
+The report is printed on stdout as JSON, progress on stderr.
+"""
+
+import argparse, fnmatch, gc, json, os, platform, statistics, sys, time
+
+import numpy as np
+
+import extract_features_v5 as v5
+
+SR = 16000
+DURATIONS = {"5s": 5.0, "30s": 30.0, "2min": 120.0, "10min": 600.0}
+NOISE_FLOOR_S = 0.005  # medians this close are never a regression
+
+# /a/, /i/, /u/ formant frequencies and bandwidths (Hz)
+VOWEL_FORMANTS = {
+    "a": ((730, 1090, 2440), (90, 110, 170)),
+    "i": ((270, 2290, 3010), (60, 100, 170)),
+    "u": ((300, 870, 2240), (60, 90, 150)),
+}
+
+
+# ============================================================================
+# Synthetic signals
+# ============================================================================
+
+def _resonate(x, formants, bandwidths, sr=SR):
+    """Cascade of two-pole resonators (a Klatt-style vocal tract)."""
+    from scipy.signal import lfilter
+    for freq, bw in zip(formants, bandwidths):
+        r = np.exp(-np.pi * bw / sr)
+        a = [1.0, -2.0 * r * np.cos(2 * np.pi * freq / sr), r * r]
+        x = lfilter([1.0 - r], a, x)
+    return x
+
+
+def _voiced(n, f0, rng, vowel="a", jitter=0.005, shimmer=0.03, sr=SR):
+    """``n`` samples of a vowel on the F0 contour ``f0`` (Hz, per sample).
+
+    Glottal closures are placed one period apart with Gaussian period
+    (``jitter``) and amplitude (``shimmer``) perturbation, smoothed by a
+    one-pole glottal low-pass and filtered through the vowel's formants.
+    """
+    from scipy.signal import lfilter
+    source = np.zeros(n)
+    t = 0.0
+    while True:
+        i = int(t * sr)
+        if i >= n:
+            break
+        source[i] = 1.0 + shimmer * rng.standard_normal()
+        t += (1.0 + jitter * rng.standard_normal()) / f0[i]
+    source = lfilter([1.0], [1.0, -0.97], source)
+    formants, bandwidths = VOWEL_FORMANTS[vowel]
+    return _resonate(source, formants, bandwidths, sr)
+
+
+def _colored_noise(n, rng):
+    from scipy.signal import lfilter
+    return lfilter([1.0], [1.0, -0.9], rng.standard_normal(n))
+
+
+def _mix_noise(y, snr_db, rng):
+    noise = _colored_noise(len(y), rng)
+    gain = np.sqrt(np.mean(y ** 2) / (np.mean(noise ** 2) * 10 ** (snr_db / 10)))
+    return y + gain * noise
+
+
+def _normalize(y):
+    return (0.5 * y / (np.max(np.abs(y)) or 1.0)).astype(np.float32)
+
+
+def synth_vowel(duration_s, f0=140.0, jitter=0.005, shimmer=0.03,
+                tremor_hz=5.0, tremor_depth=0.02, snr_db=30.0, seed=0):
+    """Sustained /a/ with jitter, shimmer and F0 tremor."""
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * SR)
+    t = np.arange(n) / SR
+    contour = f0 * (1.0 + tremor_depth * np.sin(2 * np.pi * tremor_hz * t))
+    y = _voiced(n, contour, rng, "a", jitter, shimmer)
+    return _normalize(_mix_noise(y, snr_db, rng))
+
+
+def synth_pataka(duration_s, rate_hz=6.0, seed=1):
+    """/pataka/ repetitions: burst + 100 ms vowel per syllable."""
+    from scipy.signal import butter, sosfilt
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * SR)
+    y = np.zeros(n)
+    # Burst spectra: labial low, alveolar high, velar mid
+    bursts = [
+        butter(2, (300, 1500), "bandpass", fs=SR, output="sos"),
+        butter(2, (3000, 7000), "bandpass", fs=SR, output="sos"),
+        butter(2, (1500, 3000), "bandpass", fs=SR, output="sos"),
+    ]
+    burst_n, vowel_n = int(0.008 * SR), int(0.1 * SR)
+    window = np.hanning(vowel_n)
+    t, k = 0.2, 0
+    while int(t * SR) + burst_n + vowel_n < n:
+        i = int(t * SR)
+        burst = sosfilt(bursts[k % 3], rng.standard_normal(burst_n))
+        y[i:i + burst_n] += 2.0 * burst * np.exp(-np.arange(burst_n) / (0.002 * SR))
+        f0 = np.full(vowel_n, 120.0 + 5.0 * rng.standard_normal())
+        y[i + burst_n:i + burst_n + vowel_n] += window * _voiced(vowel_n, f0, rng)
+        t += (1.0 + 0.05 * rng.standard_normal()) / rate_hz
+        k += 1
+    return _normalize(_mix_noise(y, 30.0, rng))
+
+
+def synth_speech(duration_s, snr_db=10.0, seed=2):
+    """Phrases of 3-8 syllables separated by pauses, in colored noise."""
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * SR)
+    y = np.zeros(n)
+    t = 0.3
+    while True:
+        n_syll = int(rng.integers(3, 9))
+        start_f0 = 170.0 + 15.0 * rng.standard_normal()
+        for s in range(n_syll):
+            syll_n = int(rng.uniform(0.15, 0.3) * SR)
+            i = int(t * SR)
+            if i + syll_n >= n:
+                return _normalize(_mix_noise(y, snr_db, rng))
+            # Declination across the phrase plus a rise-fall per syllable
+            f0 = start_f0 * (1.0 - 0.2 * s / n_syll) * (
+                1.0 + 0.05 * np.sin(np.linspace(0, np.pi, syll_n))
+            )
+            vowel = "aiu"[int(rng.integers(3))]
+            y[i:i + syll_n] += np.hanning(syll_n) * _voiced(syll_n, f0, rng, vowel)
+            t += syll_n / SR + rng.uniform(0.02, 0.08)
+        t += rng.uniform(0.3, 1.2)
+
+
+SIGNALS = {
+    "vowel": synth_vowel,
+    "pataka": synth_pataka,
+    "speech": synth_speech,
+}
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def _ctx(y, sr):
+    return v5.AnalysisContext(v5.sound_from_waveform(y, sr), y, sr)
+
+
+def _extractor(fn):
+    def run(y, sr):
+        ctx = _ctx(y, sr)
+        return fn(ctx.sound, y, sr, ctx=ctx)
+    return run
+
+
+def _analysis(method):
+    def run(y, sr):
+        return getattr(_ctx(y, sr), method)()
+    return run
+
+
+def _nolds(key):
+    def run(y, sr):
+        return v5._nonlinear_measure(_ctx(y, sr), key)
+    return run
+
+
+def _extract_ddk(y, sr):
+    return v5.extract_ddk(y, sr, ctx=_ctx(y, sr))
+
+
+def _extract_vowel_space(y, sr):
+    ctx = _ctx(y, sr)
+    return v5.extract_vowel_space(ctx.sound, ctx=ctx)
+
+
+def _streaming(y, sr, cls=v5.StreamingExtractor):
+    extractor = cls(sr=sr)
+    block = int(sr)
+    for start in range(0, len(y), block):
+        extractor.push(y[start:start + block])
+    return extractor.finish()
+
+
+def _asr(backend, model_name="tiny"):
+    def run(y, sr):
+        # Calls the backend directly, so a missing torch/whisper raises
+        # ImportError (skipped) instead of returning None.
+        result = v5.ASR_BACKENDS[backend].transcribe(y, model_name, "cpu")
+        if "segments" not in result:
+            raise RuntimeError(f"{backend} returned no segments")
+        return result
+    return run
+
+
+# name -> (signals it runs on, fn(y, sr))
+BENCHMARKS = {
+    "extract_tier1": (("vowel", "speech"), _extractor(v5.extract_tier1)),
+    "extract_tier2": (("vowel", "speech"), _extractor(v5.extract_tier2)),
+    "extract_sustained_vowel": (("vowel",), _extractor(v5.extract_sustained_vowel)),
+    "extract_v5_acoustic": (("vowel", "speech"), _extractor(v5.extract_v5_acoustic)),
+    "extract_vowel_space": (("vowel",), _extract_vowel_space),
+    "extract_ddk": (("pataka",), _extract_ddk),
+    "praat_pitch": (("vowel", "speech"), _analysis("pitch")),
+    "praat_point_process": (("vowel",), _analysis("point_process")),
+    "praat_harmonicity": (("vowel",), _analysis("harmonicity")),
+    "praat_formant": (("vowel", "speech"), _analysis("formant")),
+    "cpp": (("vowel", "speech"), lambda y, sr: v5._compute_cpp(y, sr)),
+    "nolds_rpde": (("vowel",), _nolds("rpde")),
+    "nolds_dfa": (("vowel",), _nolds("dfa")),
+    "nolds_d2": (("vowel",), _nolds("d2")),
+    "mfcc": (("speech",), lambda y, sr: v5.compute_mfcc(y, sr)),
+    "spectral_harmonicity": (
+        ("speech",), lambda y, sr: v5._compute_spectral_harmonicity(y, sr),
+    ),
+    "detect_speech_regions": (
+        ("speech",), lambda y, sr: v5.detect_speech_regions(_ctx(y, sr)),
+    ),
+    "streaming_extractor": (("speech",), _streaming),
+    "streaming_ddk": (("pataka",), lambda y, sr: _streaming(y, sr, v5.StreamingDDK)),
+    "asr_whisper_int8": (("speech",), _asr("whisper-int8")),
+}
+
+
+def select_cases(signals=None, durations=None, patterns=None):
+    """(case id, signal, duration label, benchmark) tuples to run, in order."""
+    cases = []
+    for label in durations or DURATIONS:
+        for signal in signals or SIGNALS:
+            for name, (targets, _) in BENCHMARKS.items():
+                if signal not in targets:
+                    continue
+                if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+                    continue
+                cases.append((f"{signal}/{label}/{name}", signal, label, name))
+    return cases
+
+
+def time_call(fn, y, sr, repeat):
+    """Wall times of ``repeat`` calls of ``fn(y, sr)``, each after a GC."""
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn(y, sr)
+        runs.append(time.perf_counter() - started)
+    return runs
+
+
+def run_benchmarks(cases, repeat=3, log=None):
+    """Time every case; returns the ``results`` map of a baseline file.
+
+    A benchmark whose optional dependency (e.g. torch for ``mfcc``) is not
+    installed is recorded as ``{"skipped": reason}``.
+    """
+    v5.warm_imports()
+    signals = {}
+    warmed = {}
+    results = {}
+    for case_id, signal, label, name in cases:
+        fn = BENCHMARKS[name][1]
+        if (signal, name) not in warmed:
+            try:
+                fn(SIGNALS[signal](1.0), SR)
+                warmed[signal, name] = None
+            except ImportError as exc:
+                warmed[signal, name] = str(exc)
+        if warmed[signal, name] is not None:
+            results[case_id] = {"skipped": warmed[signal, name]}
+            if log is not None:
+                print(f"{case_id:48s} skipped: {warmed[signal, name]}", file=log)
+            continue
+        key = (signal, label)
+        if key not in signals:
+            # One signal length alive at a time; 10 min of float32 is 38 MB
+            signals = {key: SIGNALS[signal](DURATIONS[label])}
+        runs = time_call(fn, signals[key], SR, repeat)
+        results[case_id] = {
+            "median_s": round(statistics.median(runs), 5),
+            "min_s": round(min(runs), 5),
+            "runs": [round(r, 5) for r in runs],
+        }
+        if log is not None:
+            print(f"{case_id:48s} {results[case_id]['median_s']:9.4f}s", file=log)
+    return results
+
+
+def compare(results, baseline, threshold=1.25):
+    """Per-case median ratios against a baseline ``results`` map.
+
+    A case is "slower" when its ratio exceeds ``threshold`` and "faster"
+    when below ``1 / threshold``, unless both medians are within
+    NOISE_FLOOR_S.  Cases missing or skipped on either side are left out.
+    """
+    rows = {}
+    for case_id, current in results.items():
+        base = baseline.get(case_id)
+        if base is None or "median_s" not in base or "median_s" not in current:
+            continue
+        old, new = base["median_s"], current["median_s"]
+        ratio = new / old if old > 0 else float("inf")
+        status = "same"
+        if abs(new - old) > NOISE_FLOOR_S:
+            if ratio > threshold:
+                status = "slower"
+            elif ratio < 1.0 / threshold:
+                status = "faster"
+        rows[case_id] = {
+            "baseline_s": old, "median_s": new,
+            "ratio": round(ratio, 3), "status": status,
+        }
+    return rows
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def _csv(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the V5 extractors on synthetic voice signals"
+    )
+    parser.add_argument(
+        "--durations", type=_csv, default=list(DURATIONS),
+        help=f"Comma-separated signal lengths (default: {','.join(DURATIONS)})",
+    )
+    parser.add_argument(
+        "--signals", type=_csv, default=list(SIGNALS),
+        help=f"Comma-separated signals (default: {','.join(SIGNALS)})",
+    )
+    parser.add_argument(
+        "--bench", type=_csv, default=None,
+        help="Comma-separated benchmark name patterns, e.g. 'extract_*,cpp'",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed calls per case (default 3)",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the results as a baseline file",
+    )
+    parser.add_argument(
+        "--compare", default=None, help="Baseline file to compare against",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="Median ratio above which a case is a regression (default 1.25)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", default=False,
+        help="Only list the selected cases",
+    )
+    args = parser.parse_args()
+    for label in args.durations:
+        if label not in DURATIONS:
+            parser.error(f"unknown duration {label!r} (choose from {', '.join(DURATIONS)})")
+    for signal in args.signals:
+        if signal not in SIGNALS:
+            parser.error(f"unknown signal {signal!r} (choose from {', '.join(SIGNALS)})")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.threshold <= 1.0:
+        parser.error("--threshold must be greater than 1")
+
+    cases = select_cases(args.signals, args.durations, args.bench)
+    if args.list:
+        for case_id, *_ in cases:
+            print(case_id)
+        return
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    report = {
+        "engine_version": v5.ENGINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "repeat": args.repeat,
+        "results": run_benchmarks(cases, args.repeat, log=sys.stderr),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    status = "ok"
+    if baseline is not None:
+        rows = compare(report["results"], baseline["results"], args.threshold)
+        report["comparison"] = {
+            "baseline": args.compare,
+            "baseline_engine_version": baseline.get("engine_version"),
+            "threshold": args.threshold,
+            "cases": rows,
+        }
+        for case_id, row in rows.items():
+            if row["status"] != "same":
+                print(f"{row['status']:6s} {case_id:48s} x{row['ratio']}", file=sys.stderr)
+        if any(row["status"] == "slower" for row in rows.values()):
+            status = "regression"
+    report["status"] = status
+    print(json.dumps(report))
+    if status != "ok":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
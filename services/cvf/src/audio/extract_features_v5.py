@@ -14,6 +14,10 @@ Usage:
         --audio-path rec.wav --task-type conversation --gender female \
         --gpu --whisper-model large-v3 --word-timestamps
 
+    ffmpeg -i rec.webm -ar 16000 -ac 1 -f s16le pipe:1 | \
+        python extract_features_v5.py --audio-path - --input-format s16le \
+        --sample-rate 16000 --task-type conversation
+
 References:
     Little et al. (2009) - PPE algorithm, IEEE TBME.
     Tsanas et al. (2011) - Nonlinear speech signal features for PD classification.
@@ -21,7 +25,7 @@ References:
                             Weak Supervision.
 """
 
-import argparse, json, sys, math, os, warnings
+import argparse, collections, contextlib, io, json, sys, math, os, time, warnings
 import numpy as np
 
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -55,41 +59,87 @@ _FUNCTION_WORDS = frozenset({
 # ============================================================================
 
 def get_device(prefer_gpu=True):
-    """Detect best available device: MPS (Apple Silicon) -> CUDA -> CPU."""
+    """Detect best available device: MPS (Apple Silicon) -> CUDA -> CPU.
+
+    The probe result is cached so that long-running workers (``--serve``)
+    only pay for the torch backend checks once.
+    """
     if not prefer_gpu:
         return "cpu"
+    if "device" in _WARM_CACHE:
+        return _WARM_CACHE["device"]
+    device = "cpu"
     try:
         import torch
         if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-            return "mps"
-        if torch.cuda.is_available():
-            return "cuda"
+            device = "mps"
+        elif torch.cuda.is_available():
+            device = "cuda"
     except Exception:
         pass
-    return "cpu"
+    _WARM_CACHE["device"] = device
+    return device
+
+
+# ============================================================================
+# Warm state (reused across jobs in --serve mode)
+# ============================================================================
+
+# Process-wide cache for expensive, job-independent objects: the selected
+# device, torchaudio transforms and loaded Whisper models.  A one-shot CLI run
+# fills it once; a --serve worker keeps it warm for every subsequent job.
+_WARM_CACHE = {}
+
+
+def _warm_get(key, factory):
+    """Return the cached object for ``key``, building it with ``factory``."""
+    try:
+        return _WARM_CACHE[key]
+    except KeyError:
+        obj = factory()
+        _WARM_CACHE[key] = obj
+        return obj
+
+
+def warm_imports():
+    """Import the heavy extraction dependencies up front.
+
+    Used by ``--serve`` so the first job does not absorb the import cost of
+    torch, torchaudio, parselmouth, librosa and nolds.  Missing optional
+    packages (torch, torchaudio, whisper) are skipped silently.
+    """
+    import parselmouth  # noqa: F401
+    import librosa  # noqa: F401
+    import scipy.signal  # noqa: F401
+    _get_nolds()
+    for optional in ("torch", "torchaudio", "whisper"):
+        try:
+            __import__(optional)
+        except Exception:
+            pass
 
 
 # ============================================================================
 # Audio loading with GPU-accelerated MFCC (torchaudio) or librosa fallback
 # ============================================================================
 
-def load_audio_and_mfcc(audio_path, sr=16000, n_mfcc=13, device="cpu"):
+def load_audio(audio_path, sr=16000):
     """
-    Load audio and compute MFCCs.
+    Decode ``audio_path`` once to a mono float32 waveform at ``sr``.
 
-    Attempts torchaudio on the requested device first; falls back to librosa
-    on CPU if torchaudio is unavailable or the GPU transfer fails.
+    ``audio_path`` may also be a binary file-like object (a WAV stream read
+    from stdin).  Attempts torchaudio first; falls back to librosa if torchaudio is
+    unavailable or cannot read the file.  On the torchaudio backend the
+    returned array is a view of the decoded tensor's storage, not a copy.
 
     Returns
     -------
     y : np.ndarray   -- mono float32 waveform at ``sr``
     sr : int          -- sample rate
-    mfccs : np.ndarray -- (n_mfcc, T) MFCC matrix
     backend : str     -- "torchaudio" or "librosa"
     """
-    # --- try torchaudio (GPU-capable) ---
+    # --- try torchaudio ---
     try:
-        import torch
         import torchaudio
 
         waveform, orig_sr = torchaudio.load(audio_path)
@@ -100,29 +150,14 @@ def load_audio_and_mfcc(audio_path, sr=16000, n_mfcc=13, device="cpu"):
 
         # Resample
         if orig_sr != sr:
-            resampler = torchaudio.transforms.Resample(orig_freq=orig_sr, new_freq=sr)
+            resampler = _warm_get(
+                ("resample", orig_sr, sr),
+                lambda: torchaudio.transforms.Resample(orig_freq=orig_sr, new_freq=sr),
+            )
             waveform = resampler(waveform)
 
-        # GPU-accelerated MFCC
-        mfcc_transform = torchaudio.transforms.MFCC(
-            sample_rate=sr, n_mfcc=n_mfcc,
-            melkwargs={"n_fft": 512, "hop_length": 160, "n_mels": 40},
-        )
-        try:
-            waveform_dev = waveform.to(device)
-            mfcc_transform = mfcc_transform.to(device)
-            mfcc_tensor = mfcc_transform(waveform_dev)  # (1, n_mfcc, T)
-            mfccs = mfcc_tensor.squeeze(0).cpu().numpy()
-        except Exception:
-            # GPU failed, run on CPU tensor
-            mfcc_tensor = torchaudio.transforms.MFCC(
-                sample_rate=sr, n_mfcc=n_mfcc,
-                melkwargs={"n_fft": 512, "hop_length": 160, "n_mels": 40},
-            )(waveform)
-            mfccs = mfcc_tensor.squeeze(0).numpy()
-
-        y = waveform.squeeze(0).numpy().astype(np.float32)
-        return y, sr, mfccs, "torchaudio"
+        y = np.asarray(waveform.squeeze(0).numpy(), dtype=np.float32)
+        return y, sr, "torchaudio"
 
     except ImportError:
         pass
@@ -133,8 +168,116 @@ def load_audio_and_mfcc(audio_path, sr=16000, n_mfcc=13, device="cpu"):
     import librosa
 
     y, sr = librosa.load(audio_path, sr=sr, mono=True)
-    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
-    return y, sr, mfccs, "librosa"
+    return y, sr, "librosa"
+
+
+def compute_mfcc(y, sr, n_mfcc=13, device="cpu"):
+    """
+    GPU-capable MFCCs of an already decoded waveform via torchaudio.
+
+    The tensor wraps ``y`` without copying; only the transfer to ``device``
+    allocates.  Falls back to the CPU transform if the device run fails.
+
+    Returns
+    -------
+    np.ndarray -- (n_mfcc, T) MFCC matrix
+    """
+    import torch
+    import torchaudio
+
+    waveform = torch.from_numpy(y).unsqueeze(0)
+
+    def _mfcc_transform():
+        return torchaudio.transforms.MFCC(
+            sample_rate=sr, n_mfcc=n_mfcc,
+            melkwargs={"n_fft": 512, "hop_length": 160, "n_mels": 40},
+        )
+
+    try:
+        waveform_dev = waveform.to(device)
+        mfcc_transform = _warm_get(
+            ("mfcc", sr, n_mfcc, device),
+            lambda: _mfcc_transform().to(device),
+        )
+        mfcc_tensor = mfcc_transform(waveform_dev)  # (1, n_mfcc, T)
+        return mfcc_tensor.squeeze(0).cpu().numpy()
+    except Exception:
+        # GPU failed, run on CPU tensor
+        mfcc_tensor = _warm_get(("mfcc", sr, n_mfcc, "cpu"), _mfcc_transform)(waveform)
+        return mfcc_tensor.squeeze(0).numpy()
+
+
+def load_audio_and_mfcc(audio_path, sr=16000, n_mfcc=13, device="cpu"):
+    """
+    Load audio and compute MFCCs.
+
+    Returns
+    -------
+    y : np.ndarray   -- mono float32 waveform at ``sr``
+    sr : int          -- sample rate
+    mfccs : np.ndarray or None -- (n_mfcc, T) MFCC matrix; None on the librosa
+                                  backend, where ``AnalysisContext.mfccs()``
+                                  derives them from the shared STFT instead
+    backend : str     -- "torchaudio" or "librosa"
+    """
+    y, sr, backend = load_audio(audio_path, sr=sr)
+    mfccs = None
+    if backend == "torchaudio":
+        try:
+            mfccs = compute_mfcc(y, sr, n_mfcc=n_mfcc, device=device)
+        except Exception:
+            mfccs = None
+    return y, sr, mfccs, backend
+
+
+def decode_pcm(data, input_format, sample_rate, sr=16000):
+    """
+    Convert headerless little-endian mono PCM bytes to a float32 waveform.
+
+    ``s16le`` is scaled by 1/32768, as torchaudio does for 16-bit WAV, so
+    features match those computed from the equivalent WAV file.  A trailing
+    partial sample is dropped.
+
+    Returns
+    -------
+    y : np.ndarray -- mono float32 waveform at ``sr``
+    sr : int        -- sample rate
+    """
+    dtype, scale = PCM_FORMATS[input_format]
+    itemsize = np.dtype(dtype).itemsize
+    y = np.frombuffer(data, dtype=dtype, count=len(data) // itemsize)
+    y = y.astype(np.float32)  # writable copy; torch.from_numpy needs one
+    if scale != 1.0:
+        y *= np.float32(1.0 / scale)
+
+    if sample_rate != sr:
+        try:
+            import torch
+            import torchaudio
+
+            resampler = _warm_get(
+                ("resample", sample_rate, sr),
+                lambda: torchaudio.transforms.Resample(orig_freq=sample_rate, new_freq=sr),
+            )
+            y = np.asarray(resampler(torch.from_numpy(y)).numpy(), dtype=np.float32)
+        except ImportError:
+            import librosa
+            y = librosa.resample(y, orig_sr=sample_rate, target_sr=sr)
+    return y, sr
+
+
+def sound_from_waveform(y, sr):
+    """
+    Build the parselmouth ``Sound`` from the decoded waveform.
+
+    Replaces a second decode of the file by ``parselmouth.Sound(path)``.
+    Praat keeps samples in its own float64 buffer, so that one copy is
+    unavoidable; ``y`` itself is not duplicated on the NumPy side.
+    """
+    import parselmouth
+    return parselmouth.Sound(
+        values=np.asarray(y, dtype=np.float64), sampling_frequency=sr,
+    )
 
 
 # ============================================================================
@@ -176,11 +319,706 @@ def _get_nolds():
     return nolds
 
 
+# ============================================================================
+# Nonlinear dynamics (RPDE proxy, DFA, D2) with bounded memory
+# ============================================================================
+
+# Maximum number of samples each measure sees after decimation.
+NOLDS_POINT_BUDGET = {"rpde": 5000, "dfa": 5000, "d2": 3000}
+
+# Pairwise distances evaluated per block (~8 MB of float64), which caps the
+# working set of the pair counters independently of the point budget.
+_PAIR_BLOCK_ELEMS = 1 << 20
+
+
+def _pair_block_rows(n_points):
+    """Rows per block so one block holds about ``_PAIR_BLOCK_ELEMS`` pairs."""
+    return max(1, _PAIR_BLOCK_ELEMS // max(1, n_points))
+
+
+NOLDS_DECIMATION = ("stride", "antialias")
+
+
+def _nolds_series(y, max_points, method="stride"):
+    """Decimate ``y`` for the nonlinear measures.
+
+    ``stride`` (default) is the ``y[::len(y) // budget]`` subsampling the
+    measures have always been computed on.  ``antialias`` keeps at most
+    ``max_points`` samples and runs ``resample_poly``'s Kaiser-windowed
+    low-pass first, so nothing is folded back into the analysed band; at
+    the point budgets that cutoff is the new Nyquist frequency (~500 Hz
+    for 5 s at 16 kHz, lower for longer recordings), which removes most of
+    the voice, so it is opt-in and not comparable with ``stride`` values.
+    """
+    x = np.asarray(y, dtype=np.float64)
+    max_points = max(1, int(max_points))
+    if method == "stride":
+        return x[::max(1, len(x) // max_points)]
+
+    from scipy.signal import resample_poly
+    q = -(-len(x) // max_points)  # ceil division
+    if q <= 1:
+        return x
+    return resample_poly(x, 1, q)
+
+
+def _sample_entropy(x, emb_dim=2, tolerance=None, block_rows=None):
+    """Sample entropy, pair-counted in row blocks.
+
+    Same definition and counts as ``nolds.sampen`` (Chebyshev distance,
+    tolerance 0.2 * SD, templates of length ``emb_dim`` and ``emb_dim + 1``)
+    but vectorized: each block compares ``block_rows`` templates with every
+    later template, so peak memory is ``block_rows * len(x)`` floats (about
+    ``_PAIR_BLOCK_ELEMS`` by default).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if tolerance is None:
+        tolerance = 0.2 * np.std(x)
+    n_templates = len(x) - emb_dim
+    if n_templates < 2:
+        return np.inf
+    block_rows = block_rows or _pair_block_rows(n_templates)
+    # Columns 0..emb_dim of the delay embedding, as views into x
+    cols = [x[k:k + n_templates] for k in range(emb_dim + 1)]
+
+    count_m = count_m1 = 0
+    for start in range(0, n_templates - 1, block_rows):
+        stop = min(start + block_rows, n_templates - 1)
+        # Pairs (i, j) with start <= i < stop and j > i
+        dist = np.zeros((stop - start, n_templates - start - 1))
+        for col in cols[:emb_dim]:
+            diff = np.abs(col[start + 1:][None, :] - col[start:stop, None])
+            np.maximum(dist, diff, out=dist)
+        upper = np.arange(dist.shape[1])[None, :] >= np.arange(stop - start)[:, None]
+        match_m = (dist < tolerance) & upper
+        count_m += int(np.count_nonzero(match_m))
+        diff = np.abs(cols[emb_dim][start + 1:][None, :] - cols[emb_dim][start:stop, None])
+        count_m1 += int(np.count_nonzero(match_m & (diff < tolerance)))
+
+    if count_m1 == 0:
+        return np.inf
+    return float(-np.log(count_m1 / count_m))
+
+
+def _correlation_dimension(x, emb_dim=10, rvals=None, fit="RANSAC", block_rows=None):
+    """Correlation dimension (D2), pair-counted in row blocks.
+
+    Same estimator as ``nolds.corr_dim`` (Euclidean distance, radii from
+    0.1 to 0.5 SD in 3% steps, line fit of log C(r) against log r), but the
+    full pairwise distance matrix is never built: each block of
+    ``block_rows`` embedded points is compared with the remaining points
+    and its distances are binned against the sorted radii.  Peak memory is
+    ``block_rows * len(x)`` floats (about ``_PAIR_BLOCK_ELEMS`` by default)
+    instead of ``len(x) ** 2``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if rvals is None:
+        sd = np.std(x)
+        if not sd > 0:
+            return np.nan
+        factor = 1.03
+        max_i = int(np.floor(np.log(5.0) / np.log(factor)))
+        rvals = [0.1 * sd * (factor ** i) for i in range(max_i + 1)]
+    rvals = np.asarray(rvals, dtype=np.float64)
+
+    n_points = n - emb_dim + 1
+    if n_points < 2:
+        return np.nan
+    block_rows = block_rows or _pair_block_rows(n_points)
+    orbit = np.lib.stride_tricks.sliding_window_view(x, emb_dim)
+    sq_norms = np.einsum("ij,ij->i", orbit, orbit)
+
+    # counts[k] = ordered pairs (including i == j) with distance < rvals[k]
+    order = np.argsort(rvals)
+    sorted_r = rvals[order]
+    hist = np.zeros(len(rvals) + 1, dtype=np.int64)
+    for start in range(0, n_points, block_rows):
+        stop = min(start + block_rows, n_points)
+        # Upper triangle only: this block against itself and later points
+        sq = (sq_norms[start:stop, None] + sq_norms[None, start:]
+              - 2.0 * orbit[start:stop] @ orbit[start:].T)
+        np.maximum(sq, 0.0, out=sq)
+        dist = np.sqrt(sq, out=sq)
+        upper = np.arange(dist.shape[1])[None, :] > np.arange(stop - start)[:, None]
+        # Index of the first radius strictly greater than each distance
+        bins = np.searchsorted(sorted_r, dist[upper], side="right")
+        hist += np.bincount(bins, minlength=len(rvals) + 1)
+    below = np.cumsum(hist)[:-1]  # pairs i < j with distance < sorted_r[k]
+    counts_sorted = 2 * below + n_points  # symmetric pairs + zero self-distances
+    counts = np.empty(len(rvals), dtype=np.int64)
+    counts[order] = counts_sorted
+
+    csums = counts / (n * (n - 1.0))
+    nonzero = csums != 0
+    if not np.any(nonzero):
+        return np.nan
+    try:
+        from nolds.measures import poly_fit  # type: ignore
+        poly = poly_fit(np.log(rvals[nonzero]), np.log(csums[nonzero]), 1, fit=fit)
+    except ImportError:
+        poly = np.polyfit(np.log(rvals[nonzero]), np.log(csums[nonzero]), 1)
+    return float(poly[0])
+
+
+def _nonlinear_measure(ctx, key):
+    """RPDE proxy (sample entropy), DFA or D2 for ``ctx.y``; None if undefined.
+
+    The waveform is decimated (``ctx.nolds_decimation``) to the measure's
+    point budget (``ctx.nolds_points`` overrides ``NOLDS_POINT_BUDGET``).  When
+    ``_get_nolds()`` resolves to ``nolds_rs`` its native implementations are
+    used; otherwise sample entropy and D2 use the block-wise counters above.
+    """
+    nolds = _get_nolds()
+    budget = ctx.nolds_points or NOLDS_POINT_BUDGET[key]
+    method = ctx.nolds_decimation
+    x = ctx.memo(
+        ("nolds_series", budget, method),
+        lambda: _readonly(_nolds_series(ctx.y, budget, method)),
+    )
+    native = getattr(nolds, "__name__", "") == "nolds_rs"
+
+    if key == "rpde":
+        value = nolds.sampen(x, emb_dim=2) if native else _sample_entropy(x, emb_dim=2)
+    elif key == "dfa":
+        value = nolds.dfa(x)
+    elif key == "d2":
+        value = nolds.corr_dim(x, emb_dim=10) if native else _correlation_dimension(x, emb_dim=10)
+    else:
+        raise KeyError(key)
+    return float(value) if np.isfinite(value) else None
+
+
+# ============================================================================
+# Stage profiling (--profile)
+# ============================================================================
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+class StageProfiler:
+    """Wall time, CPU time and peak memory of named extraction stages.
+
+    :meth:`stage` is a context manager; a stage opened inside another one is
+    recorded as ``parent/name``, and a stage entered several times adds up.
+    A stage's ``peak_mb`` is its memory high-water mark above the level at
+    stage entry.  On Linux that is resident memory (VmHWM, reset per stage
+    through ``/proc/self/clear_refs``), which covers Praat's and PyTorch's
+    native heaps at the cost of one small file read per stage.  Elsewhere
+    tracemalloc is used; it only sees Python objects and NumPy buffers and
+    slows allocation-heavy code, so wall times are less faithful there.
+    ``memory`` in :meth:`report` names the source.
+
+    CPU time is process time and both memory sources are process-wide.
+    The high-water mark is only reset while a single thread has stages
+    open: while the concurrent ASR thread is inside a stage, other threads'
+    stages neither reset it nor get a fresh one, so their ``peak_mb`` is
+    the process peak since the last reset and includes the other thread's
+    allocations (and CPU time includes its work).  Use ``--sequential-asr``
+    for a clean per-stage split.
+    """
+
+    def __init__(self):
+        import threading
+        self.stages = {}
+        self._local = threading.local()
+        self._thread_id = threading.get_ident
+        self._lock = threading.Lock()
+        self._open = {}   # thread id -> number of open stages
+        self._owns_tracing = False
+        self.memory = "rss"
+        try:
+            self._reset_peak()
+        except OSError:
+            import tracemalloc
+            self.memory = "tracemalloc"
+            self._owns_tracing = not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                tracemalloc.start()
+        self._max_peak = self._read_memory()[1]
+        self._start = (time.perf_counter(), time.process_time())
+
+    def _read_memory(self):
+        """(current, high-water mark) in bytes."""
+        if self.memory == "rss":
+            with open("/proc/self/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+            return (int(status["VmRSS"].split()[0]) * 1024,
+                    int(status["VmHWM"].split()[0]) * 1024)
+        import tracemalloc
+        return tracemalloc.get_traced_memory()
+
+    def _reset_peak(self):
+        """Reset the high-water mark (for the whole process)."""
+        if self.memory == "rss":
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        else:
+            import tracemalloc
+            tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Measure the enclosed block as stage ``name``."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        current, peak = self._read_memory()
+        self._max_peak = max(self._max_peak, peak)
+        if stack:
+            stack[-1][2] = max(stack[-1][2], peak)
+        thread = self._thread_id()
+        with self._lock:
+            self._open[thread] = self._open.get(thread, 0) + 1
+            if not self._open.keys() - {thread}:
+                self._reset_peak()
+        # [path, bytes at entry, highest bytes seen]
+        frame = [f"{stack[-1][0]}/{name}" if stack else name, current, current]
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            peak = self._read_memory()[1]
+            self._max_peak = max(self._max_peak, peak)
+            frame[2] = max(frame[2], peak)
+            stack.pop()
+            if stack:
+                stack[-1][2] = max(stack[-1][2], frame[2])
+            with self._lock:
+                self._open[thread] -= 1
+                if not self._open[thread]:
+                    del self._open[thread]
+                if not self._open.keys() - {thread}:
+                    self._reset_peak()
+            entry = self.stages.setdefault(
+                frame[0], {"wall_s": 0.0, "cpu_s": 0.0, "peak_mb": 0.0, "calls": 0},
+            )
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            entry["peak_mb"] = max(entry["peak_mb"], (frame[2] - frame[1]) / 2**20)
+            entry["calls"] += 1
+
+    def report(self):
+        """The ``timings`` result section; stops tracemalloc if it started it."""
+        self._max_peak = max(self._max_peak, self._read_memory()[1])
+        if self._owns_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+        return {
+            "wall_s": round(time.perf_counter() - self._start[0], 4),
+            "cpu_s": round(time.process_time() - self._start[1], 4),
+            "memory": self.memory,
+            "peak_mb": round(self._max_peak / 2**20, 1),
+            "stages": {
+                path: {
+                    key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in entry.items()
+                }
+                for path, entry in self.stages.items()
+            },
+        }
+
+
+def _stage(profiler, name):
+    """``profiler.stage(name)``, or a shared no-op context without profiler."""
+    return profiler.stage(name) if profiler is not None else _NO_STAGE
+
+
+# ============================================================================
+# Per-recording analysis context (shared Praat objects)
+# ============================================================================
+
+def _readonly(arr):
+    """Mark a shared array read-only so no consumer can corrupt the cache."""
+    arr.setflags(write=False)
+    return arr
+
+
+class SpectralCache:
+    """Per-recording framing and STFT shared by every spectral feature.
+
+    MFCCs (librosa backend), HPSS harmonicity and DDK onset strength all use
+    the same centred 2048/512 STFT, which is computed once here; loudness
+    RMS, CPP and H1-H2 read frames from strided views of the waveform instead
+    of slicing it in Python loops.  Everything returned is read-only and may
+    be shared freely between feature functions.
+    """
+
+    def __init__(self, y, sr):
+        self.y = y
+        self.sr = sr
+        self._memo = {}
+
+    def _get(self, key, factory):
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = factory()
+            return value
+
+    def frames(self, frame_len, hop):
+        """(n_frames, frame_len) strided view; frame i starts at ``i * hop``."""
+        from numpy.lib.stride_tricks import sliding_window_view
+        if len(self.y) < frame_len:
+            return np.empty((0, frame_len), dtype=self.y.dtype)
+        return sliding_window_view(self.y, frame_len)[::hop]
+
+    def frame_rms(self, frame_len, hop, block_frames=4096):
+        """RMS of every ``frames(frame_len, hop)`` row, reduced block-wise."""
+        def build():
+            frames = self.frames(frame_len, hop)
+            rms = np.empty(len(frames))
+            for start in range(0, len(frames), block_frames):
+                blk = frames[start:start + block_frames].astype(np.float64)
+                np.square(blk, out=blk)
+                rms[start:start + len(blk)] = np.sqrt(blk.mean(axis=1))
+            return _readonly(rms)
+        return self._get(("rms", frame_len, hop), build)
+
+    def stft(self, n_fft=2048, hop_length=512):
+        """Complex centred STFT (librosa defaults), shape (1 + n_fft/2, T)."""
+        import librosa
+        return self._get(
+            ("stft", n_fft, hop_length),
+            lambda: _readonly(
+                librosa.stft(self.y, n_fft=n_fft, hop_length=hop_length)
+            ),
+        )
+
+    def magnitude(self, n_fft=2048, hop_length=512):
+        """|STFT| for the given framing."""
+        return self._get(
+            ("magnitude", n_fft, hop_length),
+            lambda: _readonly(np.abs(self.stft(n_fft, hop_length))),
+        )
+
+    def mel_power(self, n_fft=2048, hop_length=512, n_mels=128):
+        """Mel power spectrogram built from the shared STFT magnitude."""
+        import librosa
+        return self._get(
+            ("mel", n_fft, hop_length, n_mels),
+            lambda: _readonly(librosa.feature.melspectrogram(
+                S=self.magnitude(n_fft, hop_length) ** 2, sr=self.sr,
+                n_fft=n_fft, hop_length=hop_length, n_mels=n_mels,
+            )),
+        )
+
+    def log_mel(self, n_fft=2048, hop_length=512, n_mels=128):
+        """``power_to_db`` of :meth:`mel_power` (input of MFCC and onsets)."""
+        import librosa
+        return self._get(
+            ("log_mel", n_fft, hop_length, n_mels),
+            lambda: _readonly(librosa.power_to_db(
+                self.mel_power(n_fft, hop_length, n_mels)
+            )),
+        )
+
+    def mfcc(self, n_mfcc=13):
+        """Same values as ``librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)``."""
+        import librosa
+        return self._get(
+            ("mfcc", n_mfcc),
+            lambda: _readonly(librosa.feature.mfcc(S=self.log_mel(), n_mfcc=n_mfcc)),
+        )
+
+    def head_spectrum(self, n_samples):
+        """|rfft| of the first ``n_samples`` under a Hann (``np.hanning``) window."""
+        def build():
+            segment = self.y[:n_samples]
+            return _readonly(np.abs(np.fft.rfft(segment * np.hanning(len(segment)))))
+        return self._get(("head_spectrum", n_samples), build)
+
+
+def _formant_tracks(formant, n_formants=3):
+    """Frame-level formant frequencies and bandwidths in one bulk Praat call.
+
+    Replaces per-frame ``Get value at time`` / ``Get bandwidth at time``
+    round trips (three or four per frame) with a single ``Down to Table``
+    listing parsed by NumPy.  Values agree with the per-frame queries at the
+    frame centres to ~1e-9 Hz (10 printed decimals).
+
+    Returns
+    -------
+    freqs, bandwidths : np.ndarray
+        float64 arrays of shape (frames, n_formants), NaN where Praat found
+        fewer formants in a frame.
+    """
+    from parselmouth.praat import call
+
+    table = call(formant, "Down to Table", "no", "no", 6, "no", 3, "no", 10, "yes")
+    lines = call(table, "List", "no").strip().split("\n")
+    header = lines[0].split("\t")
+    if len(lines) < 2:
+        empty = np.empty((0, n_formants))
+        return empty, empty.copy()
+
+    data = np.genfromtxt(
+        io.StringIO("\n".join(lines[1:])), delimiter="\t",
+        missing_values="--undefined--", filling_values=np.nan, ndmin=2,
+    )
+    freqs = np.full((data.shape[0], n_formants), np.nan)
+    bandwidths = np.full((data.shape[0], n_formants), np.nan)
+    for k in range(n_formants):
+        label = f"F{k + 1}(Hz)"
+        if label in header:
+            freqs[:, k] = data[:, header.index(label)]
+        label = f"B{k + 1}(Hz)"
+        if label in header:
+            bandwidths[:, k] = data[:, header.index(label)]
+    return freqs, bandwidths
+
+
+def _masked_mean(values):
+    """Mean over strictly positive entries (NaN never qualifies), else None."""
+    with np.errstate(invalid="ignore"):
+        valid = values[values > 0]
+    return float(np.mean(valid)) if len(valid) else None
+
+
+def _hnr_mean(values):
+    """Mean HNR (dB) of harmonicity frames, as Praat's ``Get mean``.
+
+    Praat marks silent frames with -200 dB and leaves them out of the mean.
+    """
+    valid = values[values != -200]
+    return float(np.mean(valid)) if len(valid) else None
+
+
+# Praat settings of the shared analyses.  Part of every TrackStore key, so
+# stored tracks are only reused with the parameters that produced them.
+PRAAT_SETTINGS = {
+    "pitch": (0.0, 75, 500),
+    "point_process": (75, 500),
+    "harmonicity": (0.01, 75, 0.1, 1.0),
+    "formant": (0.0, 5, 5500, 0.025, 50),
+}
+# Arrays AnalysisContext can export to / load from a TrackStore.
+TRACK_NAMES = (
+    "f0", "pitch_times", "pitch_step", "pulse_times", "hnr_frames",
+    "formant_freqs", "formant_bandwidths", "mfccs", "mfccs_stft",
+)
+
+
+class AnalysisContext:
+    """Lazily computed Praat analyses shared by every ``extract_*`` call.
+
+    Pitch tracking, the periodic point process, harmonicity and Burg formants
+    used to be recomputed by each tier (pitch up to seven times for one
+    conversation).  The context builds each object on first request, with the
+    parameters the extractors have always used, and hands back the same
+    object afterwards.  A failed analysis is cached as well, so every caller
+    sees the same exception without paying for the attempt again.
+
+    Spectral framing of the waveform lives in ``self.spectral``
+    (a :class:`SpectralCache`).
+
+    Parameters
+    ----------
+    sound : parselmouth.Sound
+    y : np.ndarray or None
+    sr : int or None
+    mfccs : np.ndarray or None
+        (n_mfcc, T) matrix already computed by the loader, if any.
+    harmonicity_mode : str
+        ``spectral_harmonicity`` implementation, one of HARMONICITY_MODES.
+    nolds_points : int or None
+        Point budget for RPDE/DFA/D2; None uses ``NOLDS_POINT_BUDGET``.
+    nolds_decimation : str
+        How the waveform is reduced to that budget, one of NOLDS_DECIMATION.
+    tracks : dict or None
+        Arrays from a :class:`TrackStore` (names in TRACK_NAMES).  Accessors
+        return a stored track instead of running its Praat analysis;
+        :meth:`export_tracks` collects what this context computed.
+    only : iterable of str or None
+        Feature keys the caller wants.  Extractors skip every other feature
+        (see :meth:`wants`), so analyses only those need are never built.
+    profiler : StageProfiler or None
+        Receives the extractors' sub-feature blocks (see :meth:`stage`).
+
+    Extractors may record non-feature measurements (e.g. the harmonicity
+    agreement check) in ``self.diagnostics``; ``run_extraction`` reports
+    them under ``diagnostics`` in the result.
+    """
+
+    def __init__(self, sound, y, sr, mfccs=None, harmonicity_mode="hpss",
+                 nolds_points=None, nolds_decimation="stride", tracks=None,
+                 only=None, profiler=None):
+        self.sound = sound
+        self.y = y
+        self.sr = sr
+        self.spectral = SpectralCache(y, sr)
+        self.harmonicity_mode = harmonicity_mode
+        self.nolds_points = nolds_points
+        self.nolds_decimation = nolds_decimation
+        self.diagnostics = {}
+        self._mfccs = mfccs
+        self._tracks = dict(tracks or {})
+        self._memo = {}
+        self.only = frozenset(only) if only is not None else None
+        self.profiler = profiler
+
+    def wants(self, *keys):
+        """True if any of the feature ``keys`` was requested (or all were)."""
+        return self.only is None or not self.only.isdisjoint(keys)
+
+    def stage(self, name):
+        """Context manager timing one feature block (a no-op unless profiling)."""
+        return _stage(self.profiler, name)
+
+    def memo(self, key, factory):
+        """Compute ``factory()`` once per context under ``key``."""
+        try:
+            ok, value = self._memo[key]
+        except KeyError:
+            try:
+                ok, value = True, factory()
+            except Exception as exc:
+                ok, value = False, exc
+            self._memo[key] = (ok, value)
+        if not ok:
+            raise value
+        return value
+
+    def _track(self, name, factory):
+        """Stored array ``name`` if the context was given one, else memoized."""
+        if name in self._tracks:
+            return self._tracks[name]
+        return self.memo(name, factory)
+
+    def export_tracks(self):
+        """Every track in TRACK_NAMES this context holds, as a dict of arrays."""
+        # Arrays of Praat objects that were built but only queried directly
+        derived = {
+            "pitch": (self.pitch_step, self.pitch_times),
+            "point_process": (self.pulse_times,),
+        }
+        for source, accessors in derived.items():
+            if self._memo.get(source, (False,))[0]:
+                for accessor in accessors:
+                    try:
+                        accessor()
+                    except Exception:
+                        pass
+        tracks = dict(self._tracks)
+        if self._mfccs is not None:
+            tracks["mfccs"] = self._mfccs
+        for name in TRACK_NAMES:
+            entry = self._memo.get(name)
+            if entry is not None and entry[0]:
+                tracks[name] = entry[1]
+        if "formant_tracks" in self._memo and self._memo["formant_tracks"][0]:
+            tracks["formant_freqs"], tracks["formant_bandwidths"] = (
+                self._memo["formant_tracks"][1]
+            )
+        if "f0" in tracks:
+            # Convenience for offline consumers; the extractors use f0 > 0.
+            tracks["voiced"] = tracks["f0"] > 0
+        return tracks
+
+    def mfccs(self):
+        """(13, T) MFCC matrix: the loader's if given, else from the STFT."""
+        if self._mfccs is not None:
+            return self._mfccs
+        return self._track("mfccs_stft", lambda: self.spectral.mfcc(n_mfcc=13))
+
+    def pitch(self):
+        """Praat Pitch object (autocorrelation, 75-500 Hz)."""
+        from parselmouth.praat import call
+        return self.memo(
+            "pitch", lambda: call(self.sound, "To Pitch", *PRAAT_SETTINGS["pitch"]),
+        )
+
+    def f0(self):
+        """Frame-level F0 track in Hz (0 for unvoiced frames)."""
+        return self._track(
+            "f0", lambda: _readonly(self.pitch().selected_array["frequency"]),
+        )
+
+    def pitch_step(self):
+        """Time step (s) between pitch frames."""
+        return float(self._track("pitch_step", lambda: np.float64(self.pitch().dt)))
+
+    def pitch_times(self):
+        """Centre time (s) of every pitch frame, aligned with :meth:`f0`."""
+        def build():
+            pitch = self.pitch()
+            return _readonly(np.arange(len(self.f0())) * pitch.dt + pitch.t1)
+        return self._track("pitch_times", build)
+
+    def point_process(self):
+        """Periodic (cross-correlation) glottal pulse PointProcess.
+
+        With stored :meth:`pulse_times` the PointProcess is rebuilt from them
+        (jitter and shimmer are unchanged) rather than re-tracked.
+        """
+        from parselmouth.praat import call
+
+        def build():
+            if "pulse_times" not in self._tracks:
+                return call(
+                    self.sound, "To PointProcess (periodic, cc)",
+                    *PRAAT_SETTINGS["point_process"],
+                )
+            pp = call(
+                "Create empty PointProcess", "pulses",
+                self.sound.xmin, self.sound.xmax,
+            )
+            if len(self._tracks["pulse_times"]):
+                call(pp, "Add points", np.array(self._tracks["pulse_times"]))
+            return pp
+        return self.memo("point_process", build)
+
+    def pulse_times(self):
+        """Glottal pulse times (s) of :meth:`point_process`."""
+        from parselmouth.praat import call
+
+        def build():
+            pp = self.point_process()
+            if call(pp, "Get number of points") == 0:
+                return _readonly(np.empty(0))
+            return _readonly(call(pp, "To Matrix").values[0].copy())
+        return self._track("pulse_times", build)
+
+    def harmonicity(self):
+        """Cross-correlation Harmonicity object (10 ms step)."""
+        from parselmouth.praat import call
+        return self.memo(
+            "harmonicity",
+            lambda: call(
+                self.sound, "To Harmonicity (cc)", *PRAAT_SETTINGS["harmonicity"],
+            ),
+        )
+
+    def hnr_frames(self):
+        """Frame-level HNR in dB of :meth:`harmonicity` (-200 when silent)."""
+        return self._track(
+            "hnr_frames", lambda: _readonly(self.harmonicity().values[0].copy()),
+        )
+
+    def formant(self):
+        """Burg Formant object (5 formants up to 5500 Hz)."""
+        from parselmouth.praat import call
+        return self.memo(
+            "formant",
+            lambda: call(self.sound, "To Formant (burg)", *PRAAT_SETTINGS["formant"]),
+        )
+
+    def formant_tracks(self):
+        """F1-F3 ``(frequencies, bandwidths)``, each of shape (frames, 3)."""
+        if "formant_freqs" in self._tracks and "formant_bandwidths" in self._tracks:
+            return self._tracks["formant_freqs"], self._tracks["formant_bandwidths"]
+        return self.memo(
+            "formant_tracks",
+            lambda: tuple(_readonly(a) for a in _formant_tracks(self.formant())),
+        )
+
+
 # ============================================================================
 # Tier 1: Core acoustic features (F0, jitter, shimmer, HNR, MFCC)
 # ============================================================================
 
-def extract_tier1(sound, y, sr, mfccs=None):
+def extract_tier1(sound, y, sr, mfccs=None, ctx=None):
     """Core features using parselmouth Sound + librosa/torchaudio arrays.
 
     Parameters
@@ -189,60 +1027,69 @@ def extract_tier1(sound, y, sr, mfccs=None):
     y : np.ndarray
     sr : int
     mfccs : np.ndarray or None
-        Pre-computed (n_mfcc, T) matrix.  If None, computed via librosa.
+        Pre-computed (n_mfcc, T) matrix.  If None, taken from ``ctx``.
+    ctx : AnalysisContext or None
+        Shared per-recording analyses.  A private one is created if None.
     """
     from parselmouth.praat import call
+    ctx = ctx or AnalysisContext(sound, y, sr)
     features = {}
 
     # F0 via Praat pitch tracking (75-500 Hz)
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0 = pitch.selected_array["frequency"]
-        f0v = f0[f0 > 0]
-        if len(f0v) > 0:
-            features["f0_mean"] = float(np.mean(f0v))
-            features["f0_sd"] = float(np.std(f0v))
-            features["f0_range"] = float(np.max(f0v) - np.min(f0v))
-        else:
-            features["f0_mean"] = features["f0_sd"] = features["f0_range"] = None
-    except Exception:
-        features["f0_mean"] = features["f0_sd"] = features["f0_range"] = None
+    if ctx.wants("f0_mean", "f0_sd", "f0_range"):
+        with ctx.stage("f0"):
+            try:
+                f0 = ctx.f0()
+                f0v = f0[f0 > 0]
+                if len(f0v) > 0:
+                    features["f0_mean"] = float(np.mean(f0v))
+                    features["f0_sd"] = float(np.std(f0v))
+                    features["f0_range"] = float(np.max(f0v) - np.min(f0v))
+                else:
+                    features["f0_mean"] = features["f0_sd"] = features["f0_range"] = None
+            except Exception:
+                features["f0_mean"] = features["f0_sd"] = features["f0_range"] = None
 
     # Jitter local
-    try:
-        pp = call(sound, "To PointProcess (periodic, cc)", 75, 500)
-        features["jitter_local"] = float(
-            call(pp, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3)
-        )
-    except Exception:
-        features["jitter_local"] = None
+    if ctx.wants("jitter_local"):
+        with ctx.stage("jitter_local"):
+            try:
+                pp = ctx.point_process()
+                features["jitter_local"] = float(
+                    call(pp, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3)
+                )
+            except Exception:
+                features["jitter_local"] = None
 
     # Shimmer local
-    try:
-        pp = call(sound, "To PointProcess (periodic, cc)", 75, 500)
-        features["shimmer_local"] = float(
-            call([sound, pp], "Get shimmer (local)", 0, 0, 0.0001, 0.02, 1.3, 1.6)
-        )
-    except Exception:
-        features["shimmer_local"] = None
+    if ctx.wants("shimmer_local"):
+        with ctx.stage("shimmer_local"):
+            try:
+                pp = ctx.point_process()
+                features["shimmer_local"] = float(
+                    call([sound, pp], "Get shimmer (local)",
+                         0, 0, 0.0001, 0.02, 1.3, 1.6)
+                )
+            except Exception:
+                features["shimmer_local"] = None
 
     # HNR
-    try:
-        harm = call(sound, "To Harmonicity (cc)", 0.01, 75, 0.1, 1.0)
-        features["hnr"] = float(call(harm, "Get mean", 0, 0))
-    except Exception:
-        features["hnr"] = None
+    if ctx.wants("hnr"):
+        with ctx.stage("hnr"):
+            try:
+                features["hnr"] = _hnr_mean(ctx.hnr_frames())
+            except Exception:
+                features["hnr"] = None
 
     # MFCC coefficient 2 mean
-    try:
-        if mfccs is not None:
-            features["mfcc2_mean"] = float(np.mean(mfccs[1]))
-        else:
-            import librosa
-            computed = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            features["mfcc2_mean"] = float(np.mean(computed[1]))
-    except Exception:
-        features["mfcc2_mean"] = None
+    if ctx.wants("mfcc2_mean"):
+        with ctx.stage("mfcc2_mean"):
+            try:
+                if mfccs is None:
+                    mfccs = ctx.mfccs()
+                features["mfcc2_mean"] = float(np.mean(mfccs[1]))
+            except Exception:
+                features["mfcc2_mean"] = None
 
     return features
 
@@ -251,84 +1098,88 @@ def extract_tier1(sound, y, sr, mfccs=None):
 # Tier 2: Advanced features (nonlinear dynamics, cepstral, formants)
 # ============================================================================
 
-def extract_tier2(sound, y, sr):
+def extract_tier2(sound, y, sr, ctx=None):
     """Advanced features: RPDE, DFA, PPE, CPP, articulation rate, formants,
     spectral harmonicity."""
-    from parselmouth.praat import call
-    nolds = _get_nolds()
+    ctx = ctx or AnalysisContext(sound, y, sr)
     features = {}
 
     # RPDE (Recurrence Period Density Entropy) via sample entropy proxy
-    try:
-        step = max(1, len(y) // 5000)
-        rpde = nolds.sampen(y[::step].astype(np.float64), emb_dim=2)
-        features["rpde"] = float(rpde) if np.isfinite(rpde) else None
-    except Exception:
-        features["rpde"] = None
+    if ctx.wants("rpde"):
+        with ctx.stage("rpde"):
+            try:
+                features["rpde"] = _nonlinear_measure(ctx, "rpde")
+            except Exception:
+                features["rpde"] = None
 
     # DFA (Detrended Fluctuation Analysis)
-    try:
-        step = max(1, len(y) // 5000)
-        dfa_val = nolds.dfa(y[::step].astype(np.float64))
-        features["dfa"] = float(dfa_val) if np.isfinite(dfa_val) else None
-    except Exception:
-        features["dfa"] = None
+    if ctx.wants("dfa"):
+        with ctx.stage("dfa"):
+            try:
+                features["dfa"] = _nonlinear_measure(ctx, "dfa")
+            except Exception:
+                features["dfa"] = None
 
     # PPE (Pitch Period Entropy) -- Little 2009 algorithm
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0v = pitch.selected_array["frequency"]
-        f0v = f0v[f0v > 0]
-        if len(f0v) > 2:
-            st_diffs = 12.0 * np.log2(f0v[1:] / f0v[:-1])
-            hist, _ = np.histogram(st_diffs, bins=30, density=True)
-            hist = hist[hist > 0]
-            hist = hist / hist.sum()
-            features["ppe"] = float(-np.sum(hist * np.log2(hist)))
-        else:
-            features["ppe"] = None
-    except Exception:
-        features["ppe"] = None
+    if ctx.wants("ppe"):
+        with ctx.stage("ppe"):
+            try:
+                f0v = ctx.f0()
+                f0v = f0v[f0v > 0]
+                if len(f0v) > 2:
+                    st_diffs = 12.0 * np.log2(f0v[1:] / f0v[:-1])
+                    hist, _ = np.histogram(st_diffs, bins=30, density=True)
+                    hist = hist[hist > 0]
+                    hist = hist / hist.sum()
+                    features["ppe"] = float(-np.sum(hist * np.log2(hist)))
+                else:
+                    features["ppe"] = None
+            except Exception:
+                features["ppe"] = None
 
     # CPP (Cepstral Peak Prominence)
-    try:
-        features["cpp"] = _compute_cpp(y, sr)
-    except Exception:
-        features["cpp"] = None
+    if ctx.wants("cpp"):
+        with ctx.stage("cpp"):
+            try:
+                features["cpp"] = _compute_cpp(y, sr)
+            except Exception:
+                features["cpp"] = None
 
     # Articulation rate (voiced frames / total as proxy)
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0 = pitch.selected_array["frequency"]
-        features["articulation_rate"] = (
-            float(np.sum(f0 > 0) / len(f0)) if len(f0) > 0 else None
-        )
-    except Exception:
-        features["articulation_rate"] = None
+    if ctx.wants("articulation_rate"):
+        with ctx.stage("articulation_rate"):
+            try:
+                f0 = ctx.f0()
+                features["articulation_rate"] = (
+                    float(np.sum(f0 > 0) / len(f0)) if len(f0) > 0 else None
+                )
+            except Exception:
+                features["articulation_rate"] = None
 
     # Formants F1, F2 mean via Praat
-    try:
-        formant = call(sound, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
-        n = call(formant, "Get number of frames")
-        f1s, f2s = [], []
-        for i in range(1, n + 1):
-            t = call(formant, "Get time from frame number", i)
-            f1 = call(formant, "Get value at time", 1, t, "Hertz", "Linear")
-            f2 = call(formant, "Get value at time", 2, t, "Hertz", "Linear")
-            if not math.isnan(f1) and f1 > 0:
-                f1s.append(f1)
-            if not math.isnan(f2) and f2 > 0:
-                f2s.append(f2)
-        features["f1_mean"] = float(np.mean(f1s)) if f1s else None
-        features["f2_mean"] = float(np.mean(f2s)) if f2s else None
-    except Exception:
-        features["f1_mean"] = features["f2_mean"] = None
+    if ctx.wants("f1_mean", "f2_mean"):
+        with ctx.stage("formants"):
+            try:
+                freqs, _ = ctx.formant_tracks()
+                features["f1_mean"] = _masked_mean(freqs[:, 0])
+                features["f2_mean"] = _masked_mean(freqs[:, 1])
+            except Exception:
+                features["f1_mean"] = features["f2_mean"] = None
 
     # Spectral harmonicity (harmonic-to-total energy ratio)
-    try:
-        features["spectral_harmonicity"] = _compute_spectral_harmonicity(y, sr)
-    except Exception:
-        features["spectral_harmonicity"] = None
+    if ctx.wants("spectral_harmonicity"):
+        with ctx.stage("spectral_harmonicity"):
+            try:
+                if ctx.harmonicity_mode == "compare":
+                    check = harmonicity_agreement(y, sr, spectral=ctx.spectral)
+                    ctx.diagnostics["harmonicity"] = check
+                    features["spectral_harmonicity"] = check["hpss"]
+                else:
+                    features["spectral_harmonicity"] = _compute_spectral_harmonicity(
+                        y, sr, spectral=ctx.spectral, mode=ctx.harmonicity_mode,
+                    )
+            except Exception:
+                features["spectral_harmonicity"] = None
 
     return features
 
@@ -337,17 +1188,27 @@ def extract_tier2(sound, y, sr):
 # Sustained vowel (/aaa/ micro-task)
 # ============================================================================
 
-def extract_sustained_vowel(sound, y, sr):
+# Sustained-vowel measures read from the glottal pulse PointProcess
+_SV_PULSE_KEYS = (
+    "jitter_local", "jitter_local_abs", "jitter_rap", "jitter_ppq5",
+    "jitter_ddp", "shimmer_local", "shimmer_local_db", "shimmer_apq3",
+    "shimmer_apq5", "shimmer_apq11", "shimmer_dda",
+)
+
+def extract_sustained_vowel(sound, y, sr, ctx=None):
     """Full jitter, shimmer, HNR, NHR, CPP, F0 stats, RPDE, DFA, PPE, D2."""
     from parselmouth.praat import call
-    nolds = _get_nolds()
+    ctx = ctx or AnalysisContext(sound, y, sr)
     features = {}
 
     # Point process (shared for jitter + shimmer)
-    try:
-        pp = call(sound, "To PointProcess (periodic, cc)", 75, 500)
-    except Exception:
-        pp = None
+    pp = None
+    if ctx.wants(*_SV_PULSE_KEYS):
+        with ctx.stage("point_process"):
+            try:
+                pp = ctx.point_process()
+            except Exception:
+                pp = None
 
     # Full jitter suite
     jitter_defs = {
@@ -357,14 +1218,17 @@ def extract_sustained_vowel(sound, y, sr):
         "jitter_ppq5": "Get jitter (ppq5)",
         "jitter_ddp": "Get jitter (ddp)",
     }
-    for key, cmd in jitter_defs.items():
-        try:
-            val = call(pp, cmd, 0, 0, 0.0001, 0.02, 1.3) if pp else None
-            features[key] = (
-                float(val) if val is not None and np.isfinite(val) else None
-            )
-        except Exception:
-            features[key] = None
+    with ctx.stage("jitter"):
+        for key, cmd in jitter_defs.items():
+            if not ctx.wants(key):
+                continue
+            try:
+                val = call(pp, cmd, 0, 0, 0.0001, 0.02, 1.3) if pp else None
+                features[key] = (
+                    float(val) if val is not None and np.isfinite(val) else None
+                )
+            except Exception:
+                features[key] = None
 
     # Full shimmer suite
     shimmer_defs = {
@@ -375,99 +1239,110 @@ def extract_sustained_vowel(sound, y, sr):
         "shimmer_apq11": "Get shimmer (apq11)",
         "shimmer_dda": "Get shimmer (dda)",
     }
-    for key, cmd in shimmer_defs.items():
-        try:
-            val = (
-                call([sound, pp], cmd, 0, 0, 0.0001, 0.02, 1.3, 1.6)
-                if pp
-                else None
-            )
-            features[key] = (
-                float(val) if val is not None and np.isfinite(val) else None
-            )
-        except Exception:
-            features[key] = None
+    with ctx.stage("shimmer"):
+        for key, cmd in shimmer_defs.items():
+            if not ctx.wants(key):
+                continue
+            try:
+                val = (
+                    call([sound, pp], cmd, 0, 0, 0.0001, 0.02, 1.3, 1.6)
+                    if pp
+                    else None
+                )
+                features[key] = (
+                    float(val) if val is not None and np.isfinite(val) else None
+                )
+            except Exception:
+                features[key] = None
 
     # HNR
-    try:
-        harm = call(sound, "To Harmonicity (cc)", 0.01, 75, 0.1, 1.0)
-        features["hnr"] = float(call(harm, "Get mean", 0, 0))
-    except Exception:
-        features["hnr"] = None
+    if ctx.wants("hnr", "nhr"):
+        with ctx.stage("hnr"):
+            try:
+                features["hnr"] = _hnr_mean(ctx.hnr_frames())
+            except Exception:
+                features["hnr"] = None
 
     # NHR (noise-to-harmonics = 1 / HNR_linear)
-    try:
-        if features.get("hnr") is not None and features["hnr"] != 0:
-            features["nhr"] = float(1.0 / (10 ** (features["hnr"] / 10)))
-        else:
-            features["nhr"] = None
-    except Exception:
-        features["nhr"] = None
+    if ctx.wants("nhr"):
+        with ctx.stage("nhr"):
+            try:
+                if features.get("hnr") is not None and features["hnr"] != 0:
+                    features["nhr"] = float(1.0 / (10 ** (features["hnr"] / 10)))
+                else:
+                    features["nhr"] = None
+            except Exception:
+                features["nhr"] = None
 
     # CPP
-    try:
-        features["cpp"] = _compute_cpp(y, sr)
-    except Exception:
-        features["cpp"] = None
+    if ctx.wants("cpp"):
+        with ctx.stage("cpp"):
+            try:
+                features["cpp"] = _compute_cpp(y, sr)
+            except Exception:
+                features["cpp"] = None
 
     # F0 statistics
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0v = pitch.selected_array["frequency"]
-        f0v = f0v[f0v > 0]
-        if len(f0v) > 0:
-            features.update({
-                "f0_mean": float(np.mean(f0v)),
-                "f0_sd": float(np.std(f0v)),
-                "f0_min": float(np.min(f0v)),
-                "f0_max": float(np.max(f0v)),
-                "f0_range": float(np.max(f0v) - np.min(f0v)),
-            })
-        else:
-            for k in ("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range"):
-                features[k] = None
-    except Exception:
-        for k in ("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range"):
-            features[k] = None
+    if ctx.wants("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range"):
+        with ctx.stage("f0"):
+            try:
+                f0v = ctx.f0()
+                f0v = f0v[f0v > 0]
+                if len(f0v) > 0:
+                    features.update({
+                        "f0_mean": float(np.mean(f0v)),
+                        "f0_sd": float(np.std(f0v)),
+                        "f0_min": float(np.min(f0v)),
+                        "f0_max": float(np.max(f0v)),
+                        "f0_range": float(np.max(f0v) - np.min(f0v)),
+                    })
+                else:
+                    for k in ("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range"):
+                        features[k] = None
+            except Exception:
+                for k in ("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range"):
+                    features[k] = None
 
     # RPDE
-    try:
-        step = max(1, len(y) // 5000)
-        rpde = nolds.sampen(y[::step].astype(np.float64), emb_dim=2)
-        features["rpde"] = float(rpde) if np.isfinite(rpde) else None
-    except Exception:
-        features["rpde"] = None
+    if ctx.wants("rpde"):
+        with ctx.stage("rpde"):
+            try:
+                features["rpde"] = _nonlinear_measure(ctx, "rpde")
+            except Exception:
+                features["rpde"] = None
 
     # DFA
-    try:
-        step = max(1, len(y) // 5000)
-        features["dfa"] = float(nolds.dfa(y[::step].astype(np.float64)))
-    except Exception:
-        features["dfa"] = None
+    if ctx.wants("dfa"):
+        with ctx.stage("dfa"):
+            try:
+                features["dfa"] = _nonlinear_measure(ctx, "dfa")
+            except Exception:
+                features["dfa"] = None
 
     # PPE (Pitch Period Entropy)
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0v = pitch.selected_array["frequency"]
-        f0v = f0v[f0v > 0]
-        if len(f0v) > 2:
-            st = 12.0 * np.log2(f0v[1:] / f0v[:-1])
-            h, _ = np.histogram(st, bins=30, density=True)
-            h = h[h > 0]
-            h = h / h.sum()
-            features["ppe"] = float(-np.sum(h * np.log2(h)))
-        else:
-            features["ppe"] = None
-    except Exception:
-        features["ppe"] = None
+    if ctx.wants("ppe"):
+        with ctx.stage("ppe"):
+            try:
+                f0v = ctx.f0()
+                f0v = f0v[f0v > 0]
+                if len(f0v) > 2:
+                    st = 12.0 * np.log2(f0v[1:] / f0v[:-1])
+                    h, _ = np.histogram(st, bins=30, density=True)
+                    h = h[h > 0]
+                    h = h / h.sum()
+                    features["ppe"] = float(-np.sum(h * np.log2(h)))
+                else:
+                    features["ppe"] = None
+            except Exception:
+                features["ppe"] = None
 
     # D2 (correlation dimension)
-    try:
-        step = max(1, len(y) // 3000)
-        d2 = nolds.corr_dim(y[::step].astype(np.float64), emb_dim=10)
-        features["d2"] = float(d2) if np.isfinite(d2) else None
-    except Exception:
-        features["d2"] = None
+    if ctx.wants("d2"):
+        with ctx.stage("d2"):
+            try:
+                features["d2"] = _nonlinear_measure(ctx, "d2")
+            except Exception:
+                features["d2"] = None
 
     return features
 
@@ -476,100 +1351,174 @@ def extract_sustained_vowel(sound, y, sr):
 # DDK (/pataka/ micro-task)
 # ============================================================================
 
-def extract_ddk(y, sr):
-    """DDK rate, regularity (CV of IOIs), festination detection."""
-    import librosa
-    features = {}
+_DDK_KEYS = (
+    "onset_count", "ddk_rate", "ddk_mean_ioi", "ddk_sd_ioi",
+    "ddk_regularity_cv", "festination",
+)
+DDK_HOP = 512
+# peak_pick windows (frames) and threshold of the syllable-onset detector
+DDK_PEAK_PICK = {
+    "pre_max": 3, "post_max": 3, "pre_avg": 3, "post_avg": 5,
+    "delta": 0.07, "wait": 4,
+}
+
+
+class OnsetPicker:
+    """Onsets of an onset-strength envelope that arrives frame by frame.
+
+    Applies the rule of ``librosa.onset.onset_detect(backtrack=True)``
+    with :data:`DDK_PEAK_PICK` semantics: frame ``n`` is a peak when it is
+    the maximum of ``x[n - pre_max:n + post_max]``, is at least ``delta``
+    above the mean of ``x[n - pre_avg:n + post_avg]`` (windows truncated at
+    the ends), and comes more than ``wait`` frames after the previous
+    peak; each peak is then moved back to the preceding local minimum of
+    the envelope.  A frame is decided as soon as its windows are complete.
+
+    librosa scales the envelope to [0, 1] before applying ``delta``, so the
+    threshold depends on the whole envelope.  Candidates therefore keep
+    their margin over the local mean, which is compared with ``delta``
+    times the running range; the range only grows, so a candidate that
+    falls below it is dropped for good.  ``wait`` is resolved over the
+    surviving candidates.  Only the last few frames and the live
+    candidates are kept.
+    """
 
-    # Detect syllable onsets
-    try:
-        frames = librosa.onset.onset_detect(
-            y=y, sr=sr, units="frames", hop_length=512, backtrack=True,
-            pre_max=3, post_max=3, pre_avg=3, post_avg=5, delta=0.07, wait=4,
-        )
-        times = librosa.frames_to_time(frames, sr=sr, hop_length=512)
-        features["onset_count"] = int(len(times))
-    except Exception:
-        for k in (
-            "onset_count", "ddk_rate", "ddk_regularity_cv",
-            "ddk_mean_ioi", "ddk_sd_ioi", "festination",
-        ):
-            features[k] = None
-        return features
+    def __init__(self, pre_max=3, post_max=3, pre_avg=3, post_avg=5, delta=0.07, wait=4):
+        self.pre_max, self.post_max = pre_max, post_max
+        self.pre_avg, self.post_avg = pre_avg, post_avg
+        self.delta, self.wait = np.float32(delta), wait
+        self.n_frames = 0
+        self._lead = max(post_max, post_avg) - 1     # frames after a decision
+        self._recent = collections.deque(maxlen=max(pre_max, pre_avg) + self._lead + 1)
+        self._minima = collections.deque(maxlen=self._lead + 2)
+        self.n_decided = 0
+        self._lo, self._hi = np.inf, -np.inf
+        self._finite = True
+        self._candidates = []    # (frame, margin over local mean, backtracked frame)
+
+    def push(self, values):
+        """Append envelope values; frames with complete windows are decided."""
+        for value in np.asarray(values, dtype=np.float64).ravel():
+            if not math.isfinite(value):
+                self._finite = False
+            self._lo, self._hi = min(self._lo, value), max(self._hi, value)
+            recent = self._recent
+            recent.append(value)
+            self.n_frames += 1
+            # Local minimum (backtracking target) at the frame before this one
+            if len(recent) >= 3 and self.n_frames >= 3 and (
+                recent[-2] <= recent[-3] and recent[-2] < recent[-1]
+            ):
+                self._minima.append(self.n_frames - 2)
+            if self.n_frames - self.n_decided > self._lead:
+                self._decide(self.n_decided, self.n_frames)
+                self.n_decided += 1
+
+    def finish(self):
+        """Decide the last frames (truncated windows) and return the onsets."""
+        while self.n_decided < self.n_frames:
+            self._decide(self.n_decided, self.n_frames)
+            self.n_decided += 1
+        return self.onsets()
+
+    def _threshold(self):
+        return self.delta * (self._hi - self._lo + np.finfo(np.float32).tiny)
+
+    def _decide(self, n, end):
+        first = self.n_frames - len(self._recent)
+        recent = self._recent
+        value = recent[n - first]
+        for i in range(max(0, n - self.pre_max), min(n + self.post_max, end)):
+            if recent[i - first] > value:
+                return
+        lo, hi = max(0, n - self.pre_avg), min(n + self.post_avg, end)
+        margin = value - sum(recent[i - first] for i in range(lo, hi)) / (hi - lo)
+        threshold = self._threshold()
+        if margin < threshold:
+            return
+        start = next((m for m in reversed(self._minima) if m <= n), 0)
+        self._candidates.append((n, margin, start))
+        if len(self._candidates) % 64 == 0:
+            self._candidates = [c for c in self._candidates if c[1] >= threshold]
+
+    def onsets(self):
+        """Backtracked onset frames decided so far (final after :meth:`finish`)."""
+        if not self._finite or not self._hi > self._lo:
+            return np.empty(0, dtype=np.int64)
+        threshold = self._threshold()
+        frames, last = [], -np.inf
+        for n, margin, start in self._candidates:
+            if margin >= threshold and n > last + self.wait:
+                frames.append(start)
+                last = n
+        return np.asarray(frames, dtype=np.int64)
+
+
+def ddk_rhythm(onset_times):
+    """DDK rate, inter-onset-interval statistics and festination.
+
+    All measures come from one array of the positive inter-onset
+    intervals.  The rate is onsets per second between the first and last
+    onset; mean/SD/CV of the intervals need 3 onsets; festination (later
+    intervals at least 15% shorter than earlier ones, a PD marker) needs 6
+    onsets and 4 intervals.
+    """
+    times = np.asarray(onset_times, dtype=np.float64)
+    features = dict.fromkeys(_DDK_KEYS)
+    features["onset_count"] = int(len(times))
+    if len(times) >= 2 and times[-1] > times[0]:
+        features["ddk_rate"] = float(len(times) / (times[-1] - times[0]))
+    ioi = np.diff(times)
+    ioi = ioi[ioi > 0]
+    if len(times) >= 3 and len(ioi):
+        mean, sd = float(np.mean(ioi)), float(np.std(ioi))
+        features["ddk_mean_ioi"] = mean
+        features["ddk_sd_ioi"] = sd
+        features["ddk_regularity_cv"] = sd / mean
+    if len(times) >= 6 and len(ioi) >= 4:
+        mid = len(ioi) // 2
+        early, late = np.mean(ioi[:mid]), np.mean(ioi[mid:])
+        features["festination"] = bool(late / early < 0.85)
+    return features
 
-    # DDK rate (syllables/second)
-    try:
-        dur = times[-1] - times[0] if len(times) >= 2 else 0
-        features["ddk_rate"] = float(len(times) / dur) if dur > 0 else None
-    except Exception:
-        features["ddk_rate"] = None
 
-    # Inter-onset intervals + regularity CV
-    try:
-        if len(times) >= 3:
-            ioi = np.diff(times)
-            ioi = ioi[ioi > 0]
-            features["ddk_mean_ioi"] = float(np.mean(ioi))
-            features["ddk_sd_ioi"] = float(np.std(ioi))
-            features["ddk_regularity_cv"] = (
-                float(np.std(ioi) / np.mean(ioi)) if np.mean(ioi) > 0 else None
-            )
-        else:
-            features["ddk_mean_ioi"] = None
-            features["ddk_sd_ioi"] = None
-            features["ddk_regularity_cv"] = None
-    except Exception:
-        features["ddk_mean_ioi"] = None
-        features["ddk_sd_ioi"] = None
-        features["ddk_regularity_cv"] = None
+def extract_ddk(y, sr, ctx=None):
+    """DDK rate, regularity (CV of IOIs), festination detection.
 
-    # Festination: later intervals systematically shorter (PD marker)
+    Onset strength is computed from the log-mel spectrogram in
+    ``ctx.spectral`` (the same 2048/512 STFT used by MFCC and HPSS) and
+    picked by an :class:`OnsetPicker`, the engine :class:`StreamingDDK`
+    runs on live audio.
+    """
+    import librosa
+    ctx = ctx or AnalysisContext(None, y, sr)
+
+    # Detect syllable onsets
     try:
-        if len(times) >= 6:
-            ioi = np.diff(times)
-            ioi = ioi[ioi > 0]
-            if len(ioi) >= 4:
-                mid = len(ioi) // 2
-                ratio = (
-                    np.mean(ioi[mid:]) / np.mean(ioi[:mid])
-                    if np.mean(ioi[:mid]) > 0
-                    else 1.0
-                )
-                features["festination"] = bool(ratio < 0.85)  # >=15% acceleration
-            else:
-                features["festination"] = None
-        else:
-            features["festination"] = None
+        onset_env = librosa.onset.onset_strength(
+            S=ctx.spectral.log_mel(2048, DDK_HOP), sr=sr, hop_length=DDK_HOP,
+        )
+        picker = OnsetPicker(**DDK_PEAK_PICK)
+        picker.push(onset_env)
+        frames = picker.finish()
     except Exception:
-        features["festination"] = None
-
-    return features
+        return dict.fromkeys(_DDK_KEYS)
+    return ddk_rhythm(frames * DDK_HOP / sr)
 
 
 # ============================================================================
 # Vowel space: formant-based articulation metrics
 # ============================================================================
 
-def extract_vowel_space(sound):
+def extract_vowel_space(sound, ctx=None):
     """F1/F2 tracking, VSA (if multiple vowels), VAI proxy."""
-    from parselmouth.praat import call
+    ctx = ctx or AnalysisContext(sound, None, None)
     features = {}
 
     try:
-        formant = call(sound, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
-        n = call(formant, "Get number of frames")
-        f1s, f2s = [], []
-        for i in range(1, n + 1):
-            t = call(formant, "Get time from frame number", i)
-            f1 = call(formant, "Get value at time", 1, t, "Hertz", "Linear")
-            f2 = call(formant, "Get value at time", 2, t, "Hertz", "Linear")
-            if not math.isnan(f1) and f1 > 0:
-                f1s.append(f1)
-            if not math.isnan(f2) and f2 > 0:
-                f2s.append(f2)
-
-        features["f1_mean"] = float(np.mean(f1s)) if f1s else None
-        features["f2_mean"] = float(np.mean(f2s)) if f2s else None
+        freqs, _ = ctx.formant_tracks()
+        features["f1_mean"] = _masked_mean(freqs[:, 0])
+        features["f2_mean"] = _masked_mean(freqs[:, 1])
         # VSA requires corner vowels /a/, /i/, /u/ -- not computable from single vowel
         features["vsa"] = None
         # VAI single-vowel proxy: F2/F1 ratio as articulatory spread
@@ -590,46 +1539,335 @@ def extract_vowel_space(sound):
 # Helpers (V4)
 # ============================================================================
 
-def _compute_cpp(y, sr):
-    """Cepstral Peak Prominence: peak-to-regression difference in cepstrum."""
+_CPP_BLOCK_FRAMES = 1024  # frames per batched FFT block (~5 MB at 16 kHz)
+
+
+def _cpp_frames(y, sr, block_frames=_CPP_BLOCK_FRAMES):
+    """Per-frame Cepstral Peak Prominence (40 ms Hann frames, 10 ms hop).
+
+    Frames are taken as a strided view of ``y`` and processed in fixed-size
+    blocks: one batched rfft/irfft per block, the regression line over the
+    75-500 Hz quefrency band solved in closed form for every frame at once,
+    and vectorized peak picking.  Scratch buffers are allocated once per
+    call, so memory stays bounded regardless of recording length.
+
+    Matches the former per-frame loop (``np.polyfit`` on each frame) to
+    within 1e-9 dB per frame; the differences are float round-off only.
+
+    Returns
+    -------
+    np.ndarray -- float64 CPP value per frame (empty if ``y`` is too short).
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
     from scipy.signal import get_window
+
     frame_len = int(0.04 * sr)  # 40ms
     hop = int(0.01 * sr)        # 10ms
-    cpp_vals = []
+    n_frames = len(range(0, len(y) - frame_len, hop))
+    n_cep = 2 * (frame_len // 2)  # irfft output length
+    lo, hi = int(sr / 500), min(int(sr / 75), n_cep - 1)  # 75-500 Hz
+    if n_frames <= 0 or lo >= hi:
+        return np.empty(0)
+
+    # Least-squares line over quefrency bins lo..hi-1 (same x for all frames)
+    x = np.arange(lo, hi, dtype=np.float64)
+    x_mean = x.mean()
+    x_centered = x - x_mean
+    sxx = float(x_centered @ x_centered)
+
+    window = get_window("hann", frame_len)
+    frames = sliding_window_view(y, frame_len)[::hop][:n_frames]
+    block_frames = max(1, min(block_frames, n_frames))
+    buf = np.empty((block_frames, frame_len))
+    cpp = np.empty(n_frames)
+
+    for start in range(0, n_frames, block_frames):
+        stop = min(start + block_frames, n_frames)
+        blk = buf[:stop - start]
+        np.multiply(frames[start:stop], window, out=blk)
+
+        power = np.abs(np.fft.rfft(blk, axis=1))
+        np.square(power, out=power)
+        np.maximum(power, 1e-12, out=power)
+        np.log10(power, out=power)
+        power *= 10.0
+        region = np.fft.irfft(power, axis=1)[:, lo:hi]
+
+        slope = (region @ x_centered) / sxx
+        intercept = region.mean(axis=1) - slope * x_mean
+        peak = np.argmax(region, axis=1)
+        peak_val = region[np.arange(len(region)), peak]
+        cpp[start:stop] = peak_val - (intercept + slope * x[peak])
+
+    return cpp
 
-    for start in range(0, len(y) - frame_len, hop):
-        w = y[start:start + frame_len] * get_window("hann", frame_len)
-        power = np.maximum(np.abs(np.fft.rfft(w)) ** 2, 1e-12)
-        cep = np.fft.irfft(10 * np.log10(power))
 
-        lo, hi = int(sr / 500), min(int(sr / 75), len(cep) - 1)  # 75-500 Hz
-        if lo >= hi:
-            continue
-        region = cep[lo:hi]
-        if len(region) == 0:
-            continue
+def _compute_cpp(y, sr):
+    """Cepstral Peak Prominence: peak-to-regression difference in cepstrum."""
+    cpp_vals = _cpp_frames(y, sr)
+    return float(np.mean(cpp_vals)) if len(cpp_vals) else None
+
+
+def _tremor_powers(f0, hop_time):
+    """(4-7 Hz band power, total power) of the F0 contour's periodogram.
+
+    Unvoiced gaps are bridged by linear interpolation and the mean is
+    removed first.  Returns None with 10 or fewer voiced frames or when the
+    contour is too short to have a bin in the tremor band.
+    """
+    voiced_idx = np.where(f0 > 0)[0]
+    if len(voiced_idx) <= 10:
+        return None
+    # Interpolate F0 over unvoiced gaps for continuous contour
+    f0_interp = np.interp(np.arange(len(f0)), voiced_idx, f0[voiced_idx])
+    # Remove DC
+    f0_centered = f0_interp - np.mean(f0_interp)
+    power = np.abs(np.fft.rfft(f0_centered)) ** 2
+    freqs = np.fft.rfftfreq(len(f0_interp), d=hop_time)
+    tremor_band = (freqs >= 4.0) & (freqs <= 7.0)
+    if not np.any(tremor_band):
+        return None
+    return float(np.sum(power[tremor_band])), float(np.sum(power))
+
 
-        x = np.arange(lo, lo + len(region))
-        reg = np.polyval(np.polyfit(x, region, 1), x)
-        peak = np.argmax(region)
-        cpp_vals.append(region[peak] - reg[peak])
+def _spectral_tilt(spectrum, sr):
+    """Slope (dB/Hz) of the log magnitude ``spectrum`` over 50-8000 Hz."""
+    log_spectrum = 20.0 * np.log10(np.maximum(spectrum, 1e-10))
+    freqs = np.linspace(0, sr / 2, len(log_spectrum))
+    # Fit only within speech-relevant range (50-8000 Hz)
+    mask = (freqs >= 50) & (freqs <= 8000)
+    if np.sum(mask) > 2:
+        slope, _ = np.polyfit(freqs[mask], log_spectrum[mask], 1)
+        return float(slope)
+    return None
 
-    return float(np.mean(cpp_vals)) if cpp_vals else None
 
+def _h1h2_frames(y, sr, f0, times, block_frames=_CPP_BLOCK_FRAMES, offset=0):
+    """H1-H2 (dB) for every voiced pitch frame, in batched FFTs.
+
+    Parameters
+    ----------
+    y : np.ndarray
+    sr : int
+    f0 : np.ndarray
+        Pitch track in Hz (0 = unvoiced), e.g. ``AnalysisContext.f0()``.
+    times : np.ndarray
+        Frame centre times in seconds, aligned with ``f0``.
+    offset : int
+        Sample index of ``y[0]`` when ``y`` is a segment of the recording
+        and ``times`` are recording times.
+
+    A 40 ms Hann window is centred on each voiced frame; windows that would
+    run past either end of ``y`` are skipped.  All windows are gathered from
+    a strided view of ``y`` into fixed-size blocks, transformed with one
+    rfft per block, and H1/H2 are read at the bins nearest F0 and 2*F0
+    (ties resolve to the lower bin, as the former per-frame ``argmin`` did).
+
+    Returns
+    -------
+    np.ndarray -- H1-H2 in dB for frames where both harmonics are non-zero.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    frame_len = int(0.04 * sr)  # 40ms
+    voiced = np.flatnonzero(f0 > 0)
+    if len(voiced) == 0 or len(y) < frame_len:
+        return np.empty(0)
+
+    starts = (times[voiced] * sr).astype(np.int64) - frame_len // 2 - offset
+    in_bounds = (starts >= 0) & (starts + frame_len <= len(y))
+    starts = starts[in_bounds]
+    f0v = f0[voiced][in_bounds]
+    if len(starts) == 0:
+        return np.empty(0)
+
+    n_bins = frame_len // 2 + 1
+    bin_hz = sr / frame_len
+    h1_bin = np.clip(np.ceil(f0v / bin_hz - 0.5), 0, n_bins - 1).astype(np.int64)
+    h2_bin = np.clip(np.ceil(2 * f0v / bin_hz - 0.5), 0, n_bins - 1).astype(np.int64)
+
+    window = np.hanning(frame_len)
+    frames = sliding_window_view(y, frame_len)
+    block_frames = max(1, min(block_frames, len(starts)))
+    buf = np.empty((block_frames, frame_len))
+    h1 = np.empty(len(starts))
+    h2 = np.empty(len(starts))
+
+    for start in range(0, len(starts), block_frames):
+        stop = min(start + block_frames, len(starts))
+        blk = buf[:stop - start]
+        np.multiply(frames[starts[start:stop]], window, out=blk)
+        spectrum = np.abs(np.fft.rfft(blk, axis=1))
+        rows = np.arange(stop - start)
+        h1[start:stop] = spectrum[rows, h1_bin[start:stop]]
+        h2[start:stop] = spectrum[rows, h2_bin[start:stop]]
+
+    valid = (h1 > 0) & (h2 > 0)
+    return 20.0 * np.log10(h1[valid] / h2[valid])
+
+
+HARMONICITY_MODES = ("hpss", "fast", "compare")
+
+
+def _compute_spectral_harmonicity(y, sr, spectral=None, mode="hpss"):
+    """Harmonic-to-total energy ratio.
+
+    ``mode="hpss"`` (default) is the reference: librosa HPSS followed by an
+    inverse STFT, equivalent to ``librosa.effects.hpss(y)`` but starting from
+    the shared 2048/512 STFT in ``spectral`` when one is given.
+    ``mode="fast"`` uses :func:`_spectral_harmonicity_streaming`, which never
+    reconstructs a waveform and gives systematically higher values, so the
+    two modes' results are not interchangeable.
+    """
+    if mode == "fast":
+        return _spectral_harmonicity_streaming(y, sr)
 
-def _compute_spectral_harmonicity(y, sr):
-    """Harmonic-to-total energy ratio via librosa HPSS."""
     import librosa
-    y_h, _ = librosa.effects.hpss(y)
+    spectral = spectral or SpectralCache(y, sr)
+    stft_h, _ = librosa.decompose.hpss(spectral.stft(2048, 512))
+    y_h = librosa.istft(stft_h, hop_length=512, dtype=y.dtype, length=len(y))
     total = np.sum(y ** 2)
     return float(np.sum(y_h ** 2) / total) if total > 0 else None
 
 
+def _running_median(x, kernel, axis):
+    """Median filter of odd width ``kernel`` along ``axis`` of a 2-D array.
+
+    ``x`` must already carry ``kernel // 2`` samples of context (or
+    reflection) on both ends of ``axis``; the result is that much shorter.
+    A partial sort of a strided window view is several times faster than
+    ``scipy.ndimage.median_filter`` for the 31-wide HPSS kernels.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+    windows = sliding_window_view(x, kernel, axis=axis)
+    return np.partition(windows, kernel // 2, axis=-1)[..., kernel // 2]
+
+
+def _spectral_harmonicity_streaming(y, sr, n_fft=2048, hop=512, kernel=31,
+                                    chunk_frames=256):
+    """HPSS harmonic energy ratio on magnitude spectra, in bounded memory.
+
+    Applies the same soft masks as librosa HPSS (31-frame horizontal and
+    31-bin vertical medians, power 2, margin 1) but measures the harmonic
+    energy directly on the masked magnitude spectrogram, skipping the inverse
+    STFT.  The centred STFT is built ``chunk_frames`` columns at a time with
+    ``kernel // 2`` frames of context on each side, so peak memory depends
+    on the chunk size, not the recording length.
+
+    This is not a drop-in substitute for the ``hpss`` value: masking an
+    inconsistent STFT without resynthesis keeps more energy in the harmonic
+    part.  On the benchmark signals (5-90 s) ``fast`` is higher by
+    ~0.004 (0.4%) on a sustained vowel, 0.02-0.037 (3-6.5%) on noisy
+    speech and ~55% relative on /pataka/, whose ratio is near zero.
+    :func:`harmonicity_agreement` reports the difference per recording.
+    """
+    total_frames = 1 + len(y) // hop
+    harm_energy, total_energy = _harmonicity_energies(
+        y, 0, total_frames, total_frames,
+        n_fft=n_fft, hop=hop, kernel=kernel, chunk_frames=chunk_frames,
+    )
+    return harm_energy / total_energy if total_energy > 0 else None
+
+
+def _harmonicity_energies(y, start_frame, stop_frame, total_frames, offset=0,
+                          n_fft=2048, hop=512, kernel=31, chunk_frames=256):
+    """Harmonic and total energy of centred frames ``start_frame..stop_frame-1``.
+
+    ``y`` holds the recording's samples from index ``offset`` on, and must
+    cover the frames plus ``kernel // 2`` frames of context; samples before
+    the recording start read as zero (centred STFT padding).  Pass
+    ``total_frames`` once the recording length is known so the last frames
+    get the reflected context the full-signal version uses; while streaming
+    it is None.  Sums over consecutive frame ranges add up to the sums of
+    :func:`_spectral_harmonicity_streaming`.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+    from scipy.signal import get_window
+
+    half = kernel // 2
+    window = get_window("hann", n_fft).astype(np.float32)
+    pad = n_fft // 2
+    end = offset + len(y)
+    last_frame = total_frames if total_frames is not None else stop_frame + half
+
+    def magnitude(first, last):
+        # |STFT| rows (frame-major) for centred frames first..last-1
+        seg_start = first * hop - pad
+        seg_stop = (last - 1) * hop - pad + n_fft
+        segment = np.zeros(seg_stop - seg_start, dtype=np.float32)
+        lo, hi = max(seg_start, offset, 0), min(seg_stop, end)
+        if hi > lo:
+            segment[lo - seg_start:hi - seg_start] = y[lo - offset:hi - offset]
+        frames = sliding_window_view(segment, n_fft)[::hop] * window
+        return np.abs(np.fft.rfft(frames, axis=1)).astype(np.float32)
+
+    harm_energy = 0.0
+    total_energy = 0.0
+    for start in range(start_frame, stop_frame, chunk_frames):
+        stop = min(start + chunk_frames, stop_frame)
+        first, last = max(start - half, 0), min(stop + half, last_frame)
+        mag = magnitude(first, last)
+
+        # Time context: real neighbours inside the recording, reflection at
+        # its ends (scipy "reflect" == numpy "symmetric").
+        left = half - (start - first)
+        right = half - (last - stop)
+        timed = np.pad(mag, ((left, right), (0, 0)), mode="symmetric")
+        harm = _running_median(timed, kernel, axis=0)
+
+        core = mag[start - first:start - first + (stop - start)]
+        perc = _running_median(
+            np.pad(core, ((0, 0), (half, half)), mode="symmetric"), kernel, axis=1,
+        )
+
+        h2 = harm.astype(np.float64) ** 2
+        p2 = perc.astype(np.float64) ** 2
+        denom = h2 + p2
+        mask = np.full_like(denom, 0.5)
+        np.divide(h2, denom, out=mask, where=denom > 0)
+
+        core2 = core.astype(np.float64) ** 2
+        harm_energy += float(np.sum(core2 * mask ** 2))
+        total_energy += float(np.sum(core2))
+
+    return harm_energy, total_energy
+
+
+def harmonicity_agreement(y, sr, spectral=None):
+    """Run both harmonicity modes and report how closely they agree.
+
+    Returns
+    -------
+    dict with ``hpss`` and ``fast`` values, their ``abs_diff`` and
+    ``rel_diff`` (relative to ``hpss``), and per-mode wall time in seconds.
+    """
+    t0 = time.perf_counter()
+    ref = _compute_spectral_harmonicity(y, sr, spectral=spectral, mode="hpss")
+    t1 = time.perf_counter()
+    fast = _compute_spectral_harmonicity(y, sr, mode="fast")
+    t2 = time.perf_counter()
+
+    ref = ref if ref is not None and math.isfinite(ref) else None
+    fast = fast if fast is not None and math.isfinite(fast) else None
+    abs_diff = rel_diff = None
+    if ref is not None and fast is not None:
+        abs_diff = abs(fast - ref)
+        rel_diff = abs_diff / abs(ref) if ref != 0 else None
+    return {
+        "hpss": ref,
+        "fast": fast,
+        "abs_diff": abs_diff,
+        "rel_diff": rel_diff,
+        "hpss_s": round(t1 - t0, 4),
+        "fast_s": round(t2 - t1, 4),
+    }
+
+
 # ============================================================================
 # NEW V5: 6 acoustic features
 # ============================================================================
 
-def extract_v5_acoustic(sound, y, sr):
+def extract_v5_acoustic(sound, y, sr, ctx=None):
     """
     New V5 acoustic features:
       - formant_bandwidth : mean F1 bandwidth (Hz)
@@ -639,205 +1877,386 @@ def extract_v5_acoustic(sound, y, sr):
       - breathiness_h1h2  : mean H1-H2 (dB), correlate of breathiness
       - loudness_decay    : linear slope of RMS energy across utterance
     """
-    from parselmouth.praat import call
+    ctx = ctx or AnalysisContext(sound, y, sr)
     features = {}
 
     # --- Formant bandwidth (mean F1 bandwidth) ---
-    try:
-        formant = call(sound, "To Formant (burg)", 0.0, 5, 5500, 0.025, 50)
-        n_frames = call(formant, "Get number of frames")
-        bw_vals = []
-        for i in range(1, n_frames + 1):
-            t = call(formant, "Get time from frame number", i)
-            bw = call(formant, "Get bandwidth at time", 1, t, "Hertz", "Linear")
-            if not math.isnan(bw) and bw > 0:
-                bw_vals.append(bw)
-        features["formant_bandwidth"] = (
-            float(np.mean(bw_vals)) if bw_vals else None
-        )
-    except Exception:
-        features["formant_bandwidth"] = None
+    if ctx.wants("formant_bandwidth"):
+        with ctx.stage("formant_bandwidth"):
+            try:
+                _, bandwidths = ctx.formant_tracks()
+                features["formant_bandwidth"] = _masked_mean(bandwidths[:, 0])
+            except Exception:
+                features["formant_bandwidth"] = None
 
     # --- Spectral tilt (linear regression slope of log power spectrum) ---
-    try:
-        # Use windowed FFT of the full signal
-        n_fft = min(len(y), 2 * sr)  # up to 2s window
-        segment = y[:n_fft]
-        window = np.hanning(len(segment))
-        spectrum = np.abs(np.fft.rfft(segment * window))
-        log_spectrum = 20.0 * np.log10(np.maximum(spectrum, 1e-10))
-        freqs = np.linspace(0, sr / 2, len(log_spectrum))
-        # Fit only within speech-relevant range (50-8000 Hz)
-        mask = (freqs >= 50) & (freqs <= 8000)
-        if np.sum(mask) > 2:
-            slope, _ = np.polyfit(freqs[mask], log_spectrum[mask], 1)
-            features["spectral_tilt"] = float(slope)
-        else:
-            features["spectral_tilt"] = None
-    except Exception:
-        features["spectral_tilt"] = None
+    if ctx.wants("spectral_tilt"):
+        with ctx.stage("spectral_tilt"):
+            try:
+                # Use windowed FFT of the full signal
+                n_fft = min(len(y), 2 * sr)  # up to 2s window
+                features["spectral_tilt"] = _spectral_tilt(
+                    ctx.spectral.head_spectrum(n_fft), sr,
+                )
+            except Exception:
+                features["spectral_tilt"] = None
 
     # --- Voice breaks (voiced-to-unvoiced transition rate) ---
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0 = pitch.selected_array["frequency"]
-        if len(f0) > 1:
-            voiced = f0 > 0
-            # Count transitions from voiced to unvoiced within voiced regions
-            # A voice break = a gap of unvoiced frames surrounded by voiced frames
-            transitions = np.diff(voiced.astype(int))
-            # voiced->unvoiced = -1 in diff
-            n_breaks = int(np.sum(transitions == -1))
-            duration = float(len(y) / sr)
-            features["voice_breaks"] = (
-                float(n_breaks / duration) if duration > 0 else None
-            )
-        else:
-            features["voice_breaks"] = None
-    except Exception:
-        features["voice_breaks"] = None
+    if ctx.wants("voice_breaks"):
+        with ctx.stage("voice_breaks"):
+            try:
+                f0 = ctx.f0()
+                if len(f0) > 1:
+                    voiced = f0 > 0
+                    # Count transitions from voiced to unvoiced within voiced regions
+                    # A voice break = a gap of unvoiced frames surrounded by
+                    # voiced frames
+                    transitions = np.diff(voiced.astype(int))
+                    # voiced->unvoiced = -1 in diff
+                    n_breaks = int(np.sum(transitions == -1))
+                    duration = float(len(y) / sr)
+                    features["voice_breaks"] = (
+                        float(n_breaks / duration) if duration > 0 else None
+                    )
+                else:
+                    features["voice_breaks"] = None
+            except Exception:
+                features["voice_breaks"] = None
 
     # --- Tremor frequency (power in 4-7 Hz band of F0 contour) ---
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0 = pitch.selected_array["frequency"]
-        voiced_idx = np.where(f0 > 0)[0]
-        if len(voiced_idx) > 10:
-            # Interpolate F0 over unvoiced gaps for continuous contour
-            f0_interp = np.interp(
-                np.arange(len(f0)), voiced_idx, f0[voiced_idx]
-            )
-            # Remove DC
-            f0_centered = f0_interp - np.mean(f0_interp)
-            # FFT of F0 contour
-            fft_f0 = np.abs(np.fft.rfft(f0_centered))
-            # Pitch time step in Praat default: 0.0 => auto = 0.75 / floor
-            # With floor=75 Hz, step ~= 0.01s
-            hop_time = call(pitch, "Get time step")
-            freqs = np.fft.rfftfreq(len(f0_interp), d=hop_time)
-            tremor_band = (freqs >= 4.0) & (freqs <= 7.0)
-            if np.any(tremor_band):
-                total_power = np.sum(fft_f0 ** 2) + 1e-12
-                tremor_power = np.sum(fft_f0[tremor_band] ** 2)
-                # Normalized tremor power (ratio)
-                features["tremor_freq_power"] = float(tremor_power / total_power)
-            else:
+    if ctx.wants("tremor_freq_power"):
+        with ctx.stage("tremor_freq_power"):
+            try:
+                # Pitch time step in Praat default: 0.0 => auto = 0.75 / floor
+                # With floor=75 Hz, step ~= 0.01s
+                hop_time = ctx.pitch_step()
+                powers = _tremor_powers(ctx.f0(), hop_time)
+                features["tremor_freq_power"] = (
+                    # Normalized tremor power (ratio)
+                    float(powers[0] / (powers[1] + 1e-12)) if powers else None
+                )
+            except Exception:
                 features["tremor_freq_power"] = None
-        else:
-            features["tremor_freq_power"] = None
-    except Exception:
-        features["tremor_freq_power"] = None
 
     # --- Breathiness H1-H2 (difference between first two harmonics, dB) ---
-    try:
-        pitch = call(sound, "To Pitch", 0.0, 75, 500)
-        f0_arr = pitch.selected_array["frequency"]
-        voiced_idx = np.where(f0_arr > 0)[0]
-        if len(voiced_idx) > 0:
-            h1h2_vals = []
-            # Compute H1-H2 at each voiced frame using short-time spectra
-            frame_len = int(0.04 * sr)  # 40ms
-            hop_samples = int(0.01 * sr)  # 10ms
-            for vi in voiced_idx[::3]:  # subsample for speed
-                f0_hz = f0_arr[vi]
-                # Map pitch frame index to sample index
-                hop_time = call(pitch, "Get time step")
-                t_sec = vi * hop_time + call(pitch, "Get time from frame number", 1)
-                center = int(t_sec * sr)
-                start_idx = center - frame_len // 2
-                end_idx = start_idx + frame_len
-                if start_idx < 0 or end_idx > len(y):
-                    continue
-                frame = y[start_idx:end_idx] * np.hanning(frame_len)
-                spectrum = np.abs(np.fft.rfft(frame))
-                freqs = np.fft.rfftfreq(frame_len, d=1.0 / sr)
-                # Find H1 (amplitude at F0) and H2 (amplitude at 2*F0)
-                h1_idx = np.argmin(np.abs(freqs - f0_hz))
-                h2_idx = np.argmin(np.abs(freqs - 2 * f0_hz))
-                h1_amp = spectrum[h1_idx]
-                h2_amp = spectrum[h2_idx]
-                if h1_amp > 0 and h2_amp > 0:
-                    h1h2_db = 20.0 * np.log10(h1_amp / h2_amp)
-                    h1h2_vals.append(h1h2_db)
-            features["breathiness_h1h2"] = (
-                float(np.mean(h1h2_vals)) if h1h2_vals else None
-            )
-        else:
-            features["breathiness_h1h2"] = None
-    except Exception:
-        features["breathiness_h1h2"] = None
+    if ctx.wants("breathiness_h1h2"):
+        with ctx.stage("breathiness_h1h2"):
+            try:
+                h1h2_vals = _h1h2_frames(y, sr, ctx.f0(), ctx.pitch_times())
+                features["breathiness_h1h2"] = (
+                    float(np.mean(h1h2_vals)) if len(h1h2_vals) else None
+                )
+            except Exception:
+                features["breathiness_h1h2"] = None
 
     # --- Loudness decay (slope of RMS energy across utterance) ---
-    try:
-        # Compute RMS energy in short frames
-        frame_len_ld = int(0.025 * sr)  # 25ms
-        hop_ld = int(0.010 * sr)        # 10ms
-        n_frames_ld = 1 + (len(y) - frame_len_ld) // hop_ld
-        if n_frames_ld > 2:
-            frame_energies = np.zeros(n_frames_ld)
-            for i in range(n_frames_ld):
-                s = i * hop_ld
-                frame_energies[i] = np.sqrt(np.mean(y[s:s + frame_len_ld] ** 2))
-            # Normalize time axis to seconds
-            time_axis = np.arange(n_frames_ld) * (hop_ld / sr)
-            slope, _ = np.polyfit(time_axis, frame_energies, 1)
-            features["loudness_decay"] = float(slope)
-        else:
-            features["loudness_decay"] = None
-    except Exception:
-        features["loudness_decay"] = None
+    if ctx.wants("loudness_decay"):
+        with ctx.stage("loudness_decay"):
+            try:
+                # Compute RMS energy in short frames
+                frame_len_ld = int(0.025 * sr)  # 25ms
+                hop_ld = int(0.010 * sr)        # 10ms
+                frame_energies = ctx.spectral.frame_rms(frame_len_ld, hop_ld)
+                n_frames_ld = len(frame_energies)
+                if n_frames_ld > 2:
+                    # Normalize time axis to seconds
+                    time_axis = np.arange(n_frames_ld) * (hop_ld / sr)
+                    slope, _ = np.polyfit(time_axis, frame_energies, 1)
+                    features["loudness_decay"] = float(slope)
+                else:
+                    features["loudness_decay"] = None
+            except Exception:
+                features["loudness_decay"] = None
 
     return features
 
 
+# ============================================================================
+# Voice activity detection (ASR input trimming)
+# ============================================================================
+
+VAD_FRAME_S = 0.025      # same 25/10 ms RMS framing as loudness_decay
+VAD_HOP_S = 0.010
+VAD_MARGIN_DB = 10.0     # active: this far above the 10th-percentile level
+VAD_MIN_SILENCE_S = 1.0  # shorter pauses stay in the ASR input untouched
+VAD_PAD_S = 0.25         # audio kept on each side of a speech region
+VAD_MODE = "energy"      # reported in whisper.vad; regions never depend on the plan
+
+
+def detect_speech_regions(ctx, min_silence_s=VAD_MIN_SILENCE_S, pad_s=VAD_PAD_S):
+    """Speech regions of ``ctx.y`` from frame energy.
+
+    A 25 ms frame is active when its RMS level is ``VAD_MARGIN_DB`` above
+    the recording's 10th-percentile level (the noise floor).  Gaps shorter
+    than ``min_silence_s`` are bridged, and every region is widened by
+    ``pad_s``, so a removed silence always leaves ``2 * pad_s`` of pause
+    behind.  The RMS frames are the ones ``loudness_decay`` uses.  Praat
+    voicing is deliberately not used: the regions (and so the remapped word
+    times) must not depend on which features a job requested, and pitch
+    tracking here would hold back the ASR thread.
+
+    Returns
+    -------
+    np.ndarray -- (n, 2) int64 ``[start, end)`` sample ranges, in order.  A
+                  recording with no detectable activity is one region.
+    """
+    y, sr = ctx.y, ctx.sr
+    n = len(y)
+    frame_len, hop = int(VAD_FRAME_S * sr), int(VAD_HOP_S * sr)
+    rms = ctx.spectral.frame_rms(frame_len, hop)
+    if len(rms) == 0:
+        return np.array([[0, n]], dtype=np.int64)
+
+    level = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    active = level > np.percentile(level, 10) + VAD_MARGIN_DB
+    if not active.any():
+        return np.array([[0, n]], dtype=np.int64)
+
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) * hop
+    ends = (np.flatnonzero(edges == -1) - 1) * hop + frame_len
+    # Bridge short pauses, then pad and merge what now overlaps
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_silence_s * sr))
+    starts, ends = starts[keep], np.append(ends[np.flatnonzero(keep)[1:] - 1], ends[-1])
+    pad = int(pad_s * sr)
+    starts, ends = np.maximum(starts - pad, 0), np.minimum(ends + pad, n)
+    keep = np.concatenate(([True], starts[1:] > ends[:-1]))
+    starts, ends = starts[keep], np.append(ends[np.flatnonzero(keep)[1:] - 1], ends[-1])
+    return np.stack([starts, ends], axis=1).astype(np.int64)
+
+
+def _remap_times(times, regions, sr, side):
+    """Map times on the concatenated-regions timeline back to the recording.
+
+    ``side`` is "start" or "end": a time exactly on a joint belongs to the
+    following region for a start and to the preceding one for an end.
+    """
+    lengths = (regions[:, 1] - regions[:, 0]) / sr
+    offsets = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+    times = np.asarray(times, dtype=np.float64)
+    idx = np.searchsorted(offsets, times, side="right" if side == "start" else "left") - 1
+    idx = np.clip(idx, 0, len(regions) - 1)
+    mapped = regions[idx, 0] / sr + (times - offsets[idx])
+    return np.minimum(mapped, regions[idx, 1] / sr)
+
+
 # ============================================================================
 # NEW V5: Whisper transcription with word-level timestamps
 # ============================================================================
 
-def extract_whisper_timestamps(audio_path, model_name="large-v3", device="cpu"):
+WHISPER_SR = 16000  # Whisper's fixed input rate for array audio
+
+
+def _load_whisper_model(whisper, model_name, device):
+    """Load (or reuse) a Whisper model for ``device``."""
+    # Whisper device handling: 'mps' not yet fully supported by whisper;
+    # fall back to cpu for mps.
+    whisper_device = device if device in ("cpu", "cuda") else "cpu"
+    return _warm_get(
+        ("whisper", model_name, whisper_device),
+        lambda: whisper.load_model(model_name, device=whisper_device),
+    )
+
+
+class WhisperBackend:
+    """ASR backend interface, implemented with openai-whisper.
+
+    ``transcribe`` returns Whisper's own result layout (``text`` plus
+    ``segments`` carrying ``words`` with ``word``/``start``/``end``), which
+    :func:`extract_whisper_timestamps` turns into the ``words`` contract.
+    This backend runs the model in its native precision: fp16 on CUDA, fp32
+    on CPU.
+    """
+
+    name = "whisper"
+
+    def available(self):
+        """True if the backend's dependencies can be imported."""
+        try:
+            import whisper  # type: ignore  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def load(self, model_name, device):
+        """Load (or reuse) the model; also used to warm the --serve worker."""
+        import whisper  # type: ignore
+        return _load_whisper_model(whisper, model_name, device)
+
+    def transcribe(self, audio, model_name, device):
+        """Whisper-layout result for a file path or a 16 kHz float32 array."""
+        model = self.load(model_name, device)
+        return model.transcribe(audio, word_timestamps=True, language="en")
+
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """The same Whisper model with int8 dynamic quantization, on CPU.
+
+    Every Linear layer, meaning the attention projections and MLPs that
+    dominate decoding time, gets int8 weights and dynamically quantized
+    activations (``torch.ao.quantization.quantize_dynamic``).  The convolutional
+    front end and the embeddings stay fp32.  Runs on CPU whatever ``device``
+    is, since PyTorch only has int8 kernels there.
+    """
+
+    name = "whisper-int8"
+
+    def load(self, model_name, device):
+        def build():
+            import torch
+            import whisper  # type: ignore
+            model = whisper.load_model(model_name, device="cpu")
+            # whisper's Linear subclass only adds dtype casting, a no-op in
+            # fp32; quantize_dynamic matches exact module types, so swap in
+            # plain nn.Linear layers sharing the same parameters.
+            for parent in list(model.modules()):
+                for child_name, child in list(parent.named_children()):
+                    if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                        plain = torch.nn.Linear(
+                            child.in_features, child.out_features, bias=child.bias is not None,
+                        )
+                        plain.weight, plain.bias = child.weight, child.bias
+                        setattr(parent, child_name, plain)
+            quantized = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8,
+            )
+            dynamic_linear = torch.ao.nn.quantized.dynamic.Linear
+            if not any(isinstance(m, dynamic_linear) for m in quantized.modules()):
+                raise RuntimeError(f"quantize_dynamic left Whisper {model_name} unquantized")
+            return quantized
+        return _warm_get(("whisper-int8", model_name), build)
+
+    def transcribe(self, audio, model_name, device):
+        model = self.load(model_name, "cpu")
+        return model.transcribe(
+            audio, word_timestamps=True, language="en", fp16=False,
+        )
+
+
+class StubAsrBackend(WhisperBackend):
+    """Deterministic ASR stand-in for tests; needs neither torch nor Whisper.
+
+    Every run of >= 100 ms of 20 ms frames louder than -30 dB relative to
+    the loudest frame becomes one word, ``w1``, ``w2``, ... in order, so
+    pauses and word timing follow the audio.
+    """
+
+    name = "stub"
+    _FRAME_S = 0.02
+    _MIN_WORD_S = 0.1
+    _REL_DB = -30.0
+
+    def available(self):
+        return True
+
+    def load(self, model_name, device):
+        return None
+
+    def transcribe(self, audio, model_name, device):
+        if isinstance(audio, np.ndarray):
+            y = audio
+        else:
+            y, _, _ = load_audio(audio, sr=WHISPER_SR)
+        hop = int(self._FRAME_S * WHISPER_SR)
+        n_frames = len(y) // hop
+        words = []
+        if n_frames:
+            frames = y[:n_frames * hop].reshape(n_frames, hop).astype(np.float64)
+            level = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-20)
+            active = level > level.max() + self._REL_DB
+            edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+            for start, stop in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+                if (stop - start) * self._FRAME_S >= self._MIN_WORD_S:
+                    words.append({
+                        "word": f" w{len(words) + 1}",
+                        "start": start * self._FRAME_S,
+                        "end": stop * self._FRAME_S,
+                    })
+        return {
+            "text": "".join(w["word"] for w in words),
+            "segments": [{"words": words}] if words else [],
+        }
+
+
+ASR_BACKENDS = {
+    backend.name: backend
+    for backend in (WhisperBackend(), QuantizedWhisperBackend(), StubAsrBackend())
+}
+
+
+def extract_whisper_timestamps(audio_path, model_name="large-v3", device="cpu",
+                               speech_regions=None, backend="whisper",
+                               profiler=None):
     """
     Run Whisper with word-level timestamps.
 
+    ``audio_path`` may also be a 16 kHz mono float32 array, which Whisper
+    uses directly instead of decoding a file.  With ``speech_regions`` (from
+    :func:`detect_speech_regions`, array input only) Whisper transcribes just
+    those sample ranges, concatenated, and word times are mapped back to the
+    original timeline; the result then also has a ``vad`` summary.
+    ``backend`` names the ASR implementation in ASR_BACKENDS.  A
+    ``profiler`` (:class:`StageProfiler`) gets model loading and
+    transcription as separate stages.
+
     Returns
     -------
     dict with keys:
       - transcript : str
       - model      : str
+      - backend    : str
       - words      : list of {word: str, start: float, end: float}
 
-    Returns None if Whisper is unavailable.
+    Returns None if the backend is unavailable.
     """
-    try:
-        import whisper  # type: ignore
-    except ImportError:
+    asr = ASR_BACKENDS[backend]
+    if not asr.available():
         return None
 
     try:
-        # Whisper device handling: 'mps' not yet fully supported by whisper;
-        # fall back to cpu for mps.
-        whisper_device = device if device in ("cpu", "cuda") else "cpu"
-        model = whisper.load_model(model_name, device=whisper_device)
-        result = model.transcribe(
-            audio_path,
-            word_timestamps=True,
-            language="en",
-        )
+        audio = audio_path
+        if speech_regions is not None:
+            audio = np.concatenate([audio_path[a:b] for a, b in speech_regions])
+        if profiler is not None:
+            with profiler.stage("load"):
+                asr.load(model_name, device)
+        with _stage(profiler, "transcribe"):
+            result = asr.transcribe(audio, model_name, device)
 
         transcript = result.get("text", "").strip()
-        words = []
-        for segment in result.get("segments", []):
-            for word_info in segment.get("words", []):
-                words.append({
-                    "word": word_info["word"].strip(),
-                    "start": round(word_info["start"], 3),
-                    "end": round(word_info["end"], 3),
-                })
+        word_infos = [
+            word_info
+            for segment in result.get("segments", [])
+            for word_info in segment.get("words", [])
+        ]
+        starts = [w["start"] for w in word_infos]
+        ends = [w["end"] for w in word_infos]
+        if speech_regions is not None and word_infos:
+            starts = _remap_times(starts, speech_regions, WHISPER_SR, "start")
+            ends = _remap_times(ends, speech_regions, WHISPER_SR, "end")
+        words = [
+            {
+                "word": word_info["word"].strip(),
+                "start": round(float(start), 3),
+                "end": round(float(end), 3),
+            }
+            for word_info, start, end in zip(word_infos, starts, ends)
+        ]
 
-        return {
+        whisper_result = {
             "transcript": transcript,
             "model": model_name,
+            "backend": backend,
             "words": words,
         }
+        if speech_regions is not None:
+            whisper_result["vad"] = {
+                "mode": VAD_MODE,
+                "regions": len(speech_regions),
+                "speech_s": round(len(audio) / WHISPER_SR, 3),
+                "duration_s": round(len(audio_path) / WHISPER_SR, 3),
+            }
+        return whisper_result
     except Exception:
         return None
 
@@ -996,174 +2415,1967 @@ def compute_temporal_from_whisper(words, total_duration_s):
 
 
 # ============================================================================
-# Main
+# Streaming extraction (bounded memory for long recordings)
 # ============================================================================
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="MemoVoice CVF V5 GPU-accelerated acoustic feature extraction"
-    )
-    parser.add_argument(
-        "--audio-path", required=True, help="Path to input WAV file"
-    )
-    parser.add_argument(
-        "--task-type", required=True,
-        choices=["conversation", "sustained_vowel", "ddk", "fluency"],
-        help="Micro-task type",
-    )
-    parser.add_argument(
-        "--gender", default="female", choices=["male", "female"],
-        help="Speaker gender for F0 normalization",
-    )
-    parser.add_argument(
-        "--gpu", action="store_true", default=False,
-        help="Prefer GPU acceleration (MPS/CUDA) when available",
-    )
-    ALLOWED_WHISPER_MODELS = {"tiny", "base", "small", "medium", "large", "large-v2", "large-v3"}
-    parser.add_argument(
-        "--whisper-model", default="large-v3",
-        choices=sorted(ALLOWED_WHISPER_MODELS),
-        help="Whisper model name (default: large-v3)",
-    )
-    parser.add_argument(
-        "--word-timestamps", action="store_true", default=False,
-        help="Enable Whisper word-level timestamp extraction",
-    )
-    args = parser.parse_args()
+STREAM_BLOCK_S = 30.0    # core block handed to Praat / librosa at a time
+STREAM_CONTEXT_S = 1.0   # extra audio analysed on each side of a block
+# Fast harmonicity reads 15 frames (hop 512) plus half a 2048 window past
+# each side of a block; shorter context would silently read zeros.
+_STREAM_MIN_CONTEXT = 15 * 512 + 2048
+_TREMOR_SEGMENT = 8192   # min pitch frames per tremor periodogram (~80 s)
+_PPE_BIN_ST = 0.001      # semitone resolution of the streaming PPE histogram
+_PPE_SPAN_ST = 48.0      # +-4 octaves; wider than any 75-500 Hz pitch step
+
+_TIER1_KEYS = (
+    "f0_mean", "f0_sd", "f0_range", "jitter_local", "shimmer_local", "hnr",
+    "mfcc2_mean",
+)
+_TIER2_KEYS = (
+    "rpde", "dfa", "ppe", "cpp", "articulation_rate", "f1_mean", "f2_mean",
+    "spectral_harmonicity",
+)
+_V5_KEYS = (
+    "formant_bandwidth", "spectral_tilt", "voice_breaks", "tremor_freq_power",
+    "breathiness_h1h2", "loudness_decay",
+)
+STREAMING_TASK_KEYS = {
+    "conversation": _TIER1_KEYS + _TIER2_KEYS + _V5_KEYS,
+    "fluency": _TIER1_KEYS + _V5_KEYS,
+    "ddk": _DDK_KEYS,
+}
+
+
+class _PulseJitter:
+    """Praat ``Get jitter (local)`` over glottal pulses arriving in order.
+
+    Implements Praat's definition (mean absolute difference of consecutive
+    periods over the mean period, with the period floor/ceiling and maximum
+    period factor checks) on running sums, keeping only the last few pulse
+    times.  Gives the same value as the Praat query on the concatenated
+    pulses.
+    """
+
+    def __init__(self, pmin=0.0001, pmax=0.02, max_factor=1.3):
+        self.pmin, self.pmax, self.max_factor = pmin, pmax, max_factor
+        self.n_points = 0
+        self._t = np.empty(0)
+        self._first = 0        # pulse index of self._t[0]
+        self._next_period = 0  # next period (by left pulse index) to score
+        self._next_triple = 1  # next period pair (by middle pulse) to score
+        self._abs_diff = 0.0
+        self._n_triples = 0
+        self._period_sum = 0.0
+        self._n_periods = 0
+
+    def push(self, times, final=False):
+        """Add pulse times (s, increasing); ``final`` closes the sequence."""
+        t = np.concatenate([self._t, np.asarray(times, dtype=np.float64)])
+        self.n_points += len(t) - len(self._t)
+        n, first = len(t), self._first
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Mean period: a period is scored once the one after it is known
+            i = np.arange(self._next_period - first, n - 1 if final else n - 2)
+            if len(i):
+                interval = t[i + 1] - t[i]
+                ok = (interval > 0) & (interval >= self.pmin) & (interval <= self.pmax)
+                prev = np.full(len(i), np.nan)
+                has_prev = i + first >= 1
+                prev[has_prev] = t[i[has_prev]] - t[i[has_prev] - 1]
+                nxt = np.full(len(i), np.nan)
+                has_next = i + 2 < n
+                nxt[has_next] = t[i[has_next] + 2] - t[i[has_next] + 1]
+                prev_factor = np.where(prev > 0, interval / prev, np.nan)
+                next_factor = np.where(nxt > 0, interval / nxt, np.nan)
+                prev_factor = np.where(prev_factor < 1, 1 / prev_factor, prev_factor)
+                next_factor = np.where(next_factor < 1, 1 / next_factor, next_factor)
+                ok &= ~((prev_factor > self.max_factor) & (next_factor > self.max_factor))
+                self._period_sum += float(np.sum(interval[ok]))
+                self._n_periods += int(np.sum(ok))
+                self._next_period = int(i[-1]) + 1 + first
+
+            # Absolute differences of consecutive periods
+            c = np.arange(self._next_triple - first, n - 1)
+            if len(c):
+                p1 = t[c] - t[c - 1]
+                p2 = t[c + 1] - t[c]
+                factor = np.maximum(p1, p2) / np.minimum(p1, p2)
+                ok = ((p1 >= self.pmin) & (p1 <= self.pmax)
+                      & (p2 >= self.pmin) & (p2 <= self.pmax)
+                      & (factor <= self.max_factor))
+                self._abs_diff += float(np.sum(np.abs(p1 - p2)[ok]))
+                self._n_triples += int(np.sum(ok))
+                self._next_triple = int(c[-1]) + 1 + first
+
+        keep = max(min(self._next_period, self._next_triple) - 1 - first, 0)
+        self._t = t[keep:].copy()
+        self._first = first + keep
+
+    def value(self):
+        """Local jitter (ratio), or None where Praat reports undefined."""
+        if self.n_points < 3 or self._n_triples < 1 or self._n_periods < 1:
+            return None
+        return self._abs_diff / self._n_triples / (self._period_sum / self._n_periods)
+
+
+def _frame_range(core_start, core_end, hop, n_frames=None):
+    """Indices ``[k0, k1)`` of frames at ``k * hop`` owned by a core block.
+
+    For the last block pass ``n_frames``, the number of frames the
+    full-signal computation produces; the range then runs to its end (a
+    centred frame may sit exactly on the last sample).
+    """
+    k0 = -(-core_start // hop)
+    k1 = -(-core_end // hop) if n_frames is None else n_frames
+    return k0, max(k0, k1)
+
+
+def _praat_grids():
+    """Frame (time step, window, resampling rate) of the Praat analyses.
 
-    # --- Validate audio path ---
-    audio_path = os.path.realpath(args.audio_path)
+    Derived from PRAAT_SETTINGS the way Praat does: ``To Pitch`` (also
+    behind ``To PointProcess (periodic, cc)``) uses 3-period windows and a
+    quarter-window step, ``To Harmonicity (cc)`` one period plus
+    ``periods per window`` periods, and ``To Formant (burg)`` twice the
+    effective window length on the sound resampled to twice the ceiling.
+    """
+    floor = PRAAT_SETTINGS["pitch"][1]
+    h_step, h_floor, _, h_periods = PRAAT_SETTINGS["harmonicity"]
+    _, _, ceiling, length, _ = PRAAT_SETTINGS["formant"]
+    return {
+        "pitch": (3.0 / floor / 4.0, 3.0 / floor, None),
+        "harmonicity": (h_step, 1.0 / h_floor + h_periods / h_floor, None),
+        "formant": (length / 4.0, 2.0 * length, 2.0 * ceiling),
+    }
+
+
+_PRAAT_GRIDS = _praat_grids()
+
+
+def _praat_frame_count(n_samples, sr, grid):
+    """Number of frames Praat's short-term analysis fits in ``n_samples``."""
+    step, window, rate = grid
+    n_samples = np.asarray(n_samples)
+    duration = (1.0 / sr) * n_samples
+    if rate is not None:
+        duration = (1.0 / rate) * np.floor(n_samples / sr * rate + 0.5)
+    return np.floor((duration - window) / step) + 1
+
+
+def _praat_first_frame(start, n_samples, sr, grid):
+    """Centre of the first frame Praat places in ``n_samples`` from ``start``.
+
+    Praat centres its frames in the sound, so the grid depends on the
+    sound's length; ``n_samples`` may be an array.
+    """
+    frames = _praat_frame_count(n_samples, sr, grid)
+    return start + np.asarray(n_samples) / (2 * sr) - (frames - 1) * grid[0] / 2
+
+
+def _praat_resampled_first(start, n_samples, sr, rate):
+    """Time of the first sample of Praat's ``Resample`` of a sound to ``rate``."""
+    n_samples = np.asarray(n_samples)
+    nx = np.floor(n_samples / sr * rate + 0.5)
+    return start + 0.5 * (n_samples / sr - (nx - 1) / rate)
+
+
+def _praat_grid_padding(start, n_samples, sr, grid, target, resampled=None,
+                        front_min=0, back_min=0):
+    """Zero padding ``(front, back)`` that puts a segment's frames on a grid.
+
+    The segment starts at sample ``start``; after padding, the first frame
+    of the analysis ``grid`` lands a whole number of steps from ``target``
+    and, for analyses that resample, the resampled samples fall on the
+    grid whose first sample is at ``resampled``.  Returns the smallest
+    total padding (at least ``front_min`` / ``back_min``) with the least
+    misalignment.
+    """
+    step, _, rate = grid
+    span = int(math.ceil(2 * step * sr)) + 1
+    if rate is not None:
+        span *= 2
+    front = np.arange(front_min, front_min + span)[:, None]
+    back = np.arange(back_min, back_min + span)[None, :]
+    begin, length = (start - front) / sr, n_samples + front + back
+
+    def misalignment(times, period):
+        steps = times / period
+        return np.round(np.abs(steps - np.round(steps)) * 1e6)
+
+    miss = misalignment(_praat_first_frame(begin, length, sr, grid) - target, step)
+    if rate is not None and resampled is not None:
+        miss += misalignment(
+            _praat_resampled_first(begin, length, sr, rate) - resampled, 1.0 / rate,
+        )
+    cost = miss * 4 * span + front + back
+    i, j = np.unravel_index(np.argmin(cost), cost.shape)
+    return int(front[i, 0]), int(back[0, j])
+
+
+def stream_peak(blocks):
+    """Sample count and peak ``max |x - mean|`` of a block stream.
+
+    The peak is the "global peak" Praat's pitch and harmonicity analyses
+    scale their silence and voicing thresholds by; pass both to
+    :class:`StreamingExtractor` so every block uses the recording's values.
+    """
+    n, total, lo, hi = 0, 0.0, math.inf, -math.inf
+    for block in blocks:
+        if len(block):
+            n += len(block)
+            total += float(np.sum(block, dtype=np.float64))
+            lo, hi = min(lo, float(np.min(block))), max(hi, float(np.max(block)))
+    if not n:
+        return 0, 0.0
+    mean = total / n
+    return n, max(hi - mean, mean - lo)
+
+
+class StreamingExtractor:
+    """Conversation/fluency features from a waveform delivered in chunks.
+
+    :meth:`push` takes mono float32 samples at ``sr`` in chunks of any size.
+    Audio is analysed in ``block_s`` core blocks, each with ``context_s`` of
+    neighbouring audio on both sides, and only running sums are kept, so
+    memory does not grow with the recording length.  :meth:`finish`
+    returns the feature dict.
+
+    Framewise measures on a fixed sample grid are the same as the
+    full-signal ones: CPP, loudness decay (regression sums of the RMS
+    track), spectral tilt and ``fast`` spectral harmonicity.  Praat analyses
+    (pitch, pulses, harmonicity, formants) run per block and keep the
+    frames/pulses that fall inside the core.  With ``total_samples`` and
+    ``global_peak`` given (:func:`stream_peak`), each block is padded so
+    its Praat frames sit on the full recording's frame grid and its
+    thresholds use the recording's peak (see :meth:`_praat_sound`).  On
+    75-120 s of speech, F0 statistics, HNR, voice breaks, tremor and
+    articulation rate then match the full-signal values; formants,
+    shimmer, H1-H2 and PPE (a fine fixed-bin histogram re-binned to 30
+    bins) are within 0.2%.  Praat places glottal pulses relative to each
+    voiced stretch, so sustained phonation that runs across block edges
+    gets shifted pulses: jitter differs by ~1-1.5% and shimmer (the
+    period-weighted mean of per-block values) by ~3-4% on a 75-120 s
+    vowel.  Without the length and peak (stdin, live input) the frame
+    grid and thresholds are set per block and every Praat measure is
+    approximate.  MFCC-2 is averaged over the librosa MFCC frames with the
+    80 dB floor taken per block.  Tremor power is a Welch-style average
+    over F0 segments of at least ``_TREMOR_SEGMENT`` frames.  ``rpde`` and
+    ``dfa`` need the whole signal and are None.
+    """
+
+    def __init__(self, sr=16000, block_s=STREAM_BLOCK_S, context_s=STREAM_CONTEXT_S,
+                 total_samples=None, global_peak=None):
+        self.sr = sr
+        self.block = int(block_s * sr)
+        self.context = max(int(context_s * sr), _STREAM_MIN_CONTEXT)
+        self.total_samples = total_samples
+        self.global_peak = global_peak
+        self.n_samples = 0
+        self._stats = [0.0, math.inf, -math.inf]   # sum, min, max (running peak)
+        self._grid_targets = None
+        self._pending = []
+        self._buf = np.empty(0, dtype=np.float32)
+        self._buf_start = 0    # sample index of self._buf[0]
+        self._core_start = 0   # first sample not yet inside a processed core
+        self._head = np.empty(0, dtype=np.float32)  # first 2 s (spectral tilt)
+
+        # F0 (Chan et al. merge of per-block mean / M2)
+        self._f0_n = 0
+        self._f0_mean = 0.0
+        self._f0_m2 = 0.0
+        self._f0_min = math.inf
+        self._f0_max = -math.inf
+        self._pitch_frames = 0
+        self._pitch_dt = None
+        self._last_voiced = None   # voicing of the last pitch frame seen
+        self._last_f0 = None       # last voiced F0 (PPE step across blocks)
+        self._breaks = 0
+        self._ppe_hist = np.zeros(int(2 * _PPE_SPAN_ST / _PPE_BIN_ST), dtype=np.int64)
+        self._ppe_min = math.inf
+        self._ppe_max = -math.inf
+        self._tremor_f0 = np.empty(0)
+        self._tremor_band = 0.0
+        self._tremor_total = 0.0
+        self._tremor_segments = 0
+
+        self._jitter = _PulseJitter()
+        self._sums = {
+            key: [0.0, 0] for key in (
+                "shimmer", "hnr", "cpp", "h1h2", "f1", "f2", "b1",
+            )
+        }
+        self._mfcc_sum = np.zeros(13)
+        self._mfcc_frames = 0
+        self._rms = np.zeros(5)    # n, sum t, sum e, sum t^2, sum t*e
+        self._harm = [0.0, 0.0]    # harmonic, total energy
+
+    # -- input -------------------------------------------------------------
+
+    def push(self, samples):
+        """Append mono float32 samples; full blocks are analysed right away."""
+        samples = np.asarray(samples, dtype=np.float32).ravel()
+        if not samples.size:
+            return
+        head_room = 2 * self.sr - len(self._head)
+        if head_room > 0:
+            self._head = np.concatenate([self._head, samples[:head_room]])
+        self._pending.append(samples)
+        self.n_samples += len(samples)
+        stats = self._stats
+        stats[0] += float(np.sum(samples, dtype=np.float64))
+        stats[1] = min(stats[1], float(np.min(samples)))
+        stats[2] = max(stats[2], float(np.max(samples)))
+        while self.n_samples >= self._core_start + self.block + self.context:
+            self._process(self._core_start + self.block, final=False)
+
+    def finish(self):
+        """Analyse the remaining audio and return the feature dict."""
+        if self.n_samples == 0:
+            raise ValueError("No audio was streamed")
+        self._process(self.n_samples, final=True)
+        return self._features()
+
+    @property
+    def analysed_samples(self):
+        """Samples covered by the blocks analysed so far."""
+        return self._core_start
+
+    def snapshot(self):
+        """Provisional features over the audio analysed so far.
+
+        Reads the running sums without changing them; the F0 frames not yet
+        in a tremor segment are included for this call only.
+        """
+        return self._features(provisional=True)
+
+    # -- block analysis ----------------------------------------------------
+
+    def _process(self, core_end, final):
+        if self._pending:
+            self._buf = np.concatenate([self._buf] + self._pending)
+            self._pending = []
+        core_start = self._core_start
+        seg_start = self._buf_start
+        seg = self._buf[:(self.n_samples if final else core_end + self.context) - seg_start]
+
+        if core_end > core_start:
+            self._praat_block(seg, seg_start, core_start, core_end, final)
+            self._frame_block(seg, seg_start, core_start, core_end, final)
+        if final:
+            self._jitter.push([], final=True)
+            self._flush_tremor(final=True)
+
+        self._core_start = core_end
+        drop = max(core_end - self.context, seg_start) - seg_start
+        self._buf = self._buf[drop:].copy()
+        self._buf_start = seg_start + drop
+
+    def _add(self, key, values):
+        acc = self._sums[key]
+        acc[0] += float(np.sum(values))
+        acc[1] += len(values)
+
+    def _praat_sound(self, seg, seg_start, kind, final):
+        """Praat ``Sound`` for ``seg`` with ``kind`` frames on the full-signal grid.
+
+        Returns ``(sound, (target, frames, resampled))``.  Praat centres
+        frames in each sound, so the segment is zero padded at both ends
+        until its first frame is a whole number of steps from ``target``,
+        the full recording's first frame (``frames`` is the recording's
+        frame count, None while the length is unknown); for formants the
+        11 kHz resampled samples are also kept on the recording's
+        ``resampled`` grid.  The sample at the outer end of the padding
+        (after the context, before it for the last block) is set so that
+        the sound's peak ``max |x - mean|`` is the recording's, which
+        Praat's silence and voicing thresholds are relative to.  A segment
+        holding the whole recording is used as is.
+        """
+        import parselmouth
+
+        sr, grid = self.sr, _PRAAT_GRIDS[kind]
+        whole = final and seg_start == 0
+        if self._grid_targets is None:
+            # Fixed at the first block; without the length up front, frames
+            # stay on one grid whose phase may differ from the batch one.
+            total = self.total_samples or (self.n_samples if whole else None)
+            self._grid_targets = {
+                name: (
+                    float(_praat_first_frame(0.0, total, sr, g)),
+                    int(_praat_frame_count(total, sr, g)),
+                    float(_praat_resampled_first(0.0, total, sr, g[2])) if g[2] else None,
+                ) if total else (g[1] / 2, None, None)
+                for name, g in _PRAAT_GRIDS.items()
+            }
+        target = self._grid_targets[kind]
+        values = seg.astype(np.float64)
+        if whole and self.total_samples in (None, len(seg)):
+            return parselmouth.Sound(values=values, sampling_frequency=sr), target
+
+        front, back = _praat_grid_padding(
+            seg_start, len(seg), sr, grid, target[0], target[2],
+            front_min=1 if final else 0, back_min=0 if final else 1,
+        )
+        values = np.concatenate([np.zeros(front), values, np.zeros(back)])
+        peak = self.global_peak
+        if peak is None:
+            total, lo, hi = self._stats
+            mean = total / self.n_samples
+            peak = max(hi - mean, mean - lo)
+        # x_spike - mean(values) == peak, the mean including the spike itself
+        m = len(values)
+        values[0 if final else -1] = (peak + values.sum() / m) / (1.0 - 1.0 / m)
+        sound = parselmouth.Sound(
+            values=values, sampling_frequency=sr, start_time=(seg_start - front) / sr,
+        )
+        return sound, target
+
+    def _praat_block(self, seg, seg_start, core_start, core_end, final):
+        from parselmouth.praat import call
+
+        sr = self.sr
+        t0, t1 = core_start / sr, core_end / sr
+
+        def in_core(times):
+            return (times >= t0) & (times < t1)
+
+        def frames_in_core(times, kind, grid):
+            # Snap to the shared grid so a frame on a block boundary is
+            # owned by exactly one block; frames in the padding beyond the
+            # recording's own first/last frame are dropped.
+            (first, frames, _), (step, window, _) = grid, _PRAAT_GRIDS[kind]
+            k = np.round((times - first) / step)
+            keep = in_core(first + k * step) & (k >= 0)
+            if frames is not None:
+                keep &= k < frames
+            elif final:
+                keep &= first + k * step + window / 2 <= self.n_samples / sr
+            return keep
+
+        try:
+            sound, target = self._praat_sound(seg, seg_start, "pitch", final)
+            pitch = call(sound, "To Pitch", *PRAAT_SETTINGS["pitch"])
+            times = pitch.xs()
+            core = frames_in_core(times, "pitch", target)
+            f0, times = pitch.selected_array["frequency"][core], times[core]
+            self._pitch_dt = pitch.dt
+            self._update_pitch(f0)
+            self._add("h1h2", _h1h2_frames(seg, sr, f0, times, offset=seg_start))
+        except Exception:
+            sound = None
+
+        try:
+            pp = call(sound, "To PointProcess (periodic, cc)", *PRAAT_SETTINGS["point_process"])
+            pulses = np.empty(0)
+            if call(pp, "Get number of points") > 0:
+                pulses = call(pp, "To Matrix").values[0]
+            pulses = pulses[in_core(pulses)]
+            self._jitter.push(pulses)
+            if len(pulses) > 2:
+                shimmer = call(
+                    [sound, pp], "Get shimmer (local)", t0, t1, 0.0001, 0.02, 1.3, 1.6,
+                )
+                if math.isfinite(shimmer):
+                    acc = self._sums["shimmer"]
+                    acc[0] += shimmer * (len(pulses) - 1)
+                    acc[1] += len(pulses) - 1
+        except Exception:
+            pass
+
+        try:
+            sound, target = self._praat_sound(seg, seg_start, "harmonicity", final)
+            harm = call(sound, "To Harmonicity (cc)", *PRAAT_SETTINGS["harmonicity"])
+            values = harm.values[0][frames_in_core(harm.xs(), "harmonicity", target)]
+            self._add("hnr", values[values != -200])
+        except Exception:
+            pass
+
+        try:
+            sound, target = self._praat_sound(seg, seg_start, "formant", final)
+            formant = call(sound, "To Formant (burg)", *PRAAT_SETTINGS["formant"])
+            freqs, bandwidths = _formant_tracks(formant)
+            core = frames_in_core(formant.xs(), "formant", target)
+            with np.errstate(invalid="ignore"):
+                for key, column in (("f1", freqs[core, 0]), ("f2", freqs[core, 1]),
+                                    ("b1", bandwidths[core, 0])):
+                    self._add(key, column[column > 0])
+        except Exception:
+            pass
+
+    def _update_pitch(self, f0):
+        self._pitch_frames += len(f0)
+        voiced = f0 > 0
+        f0v = f0[voiced]
+
+        if len(voiced):
+            flags = voiced if self._last_voiced is None else np.r_[self._last_voiced, voiced]
+            self._breaks += int(np.sum(np.diff(flags.astype(int)) == -1))
+            self._last_voiced = bool(voiced[-1])
+
+        if len(f0v):
+            n_b, mean_b = len(f0v), float(np.mean(f0v))
+            m2_b = float(np.sum((f0v - mean_b) ** 2))
+            n = self._f0_n + n_b
+            delta = mean_b - self._f0_mean
+            self._f0_mean += delta * n_b / n
+            self._f0_m2 += m2_b + delta ** 2 * self._f0_n * n_b / n
+            self._f0_n = n
+            self._f0_min = min(self._f0_min, float(np.min(f0v)))
+            self._f0_max = max(self._f0_max, float(np.max(f0v)))
+
+            seq = f0v if self._last_f0 is None else np.r_[self._last_f0, f0v]
+            if len(seq) > 1:
+                steps = 12.0 * np.log2(seq[1:] / seq[:-1])
+                self._ppe_min = min(self._ppe_min, float(np.min(steps)))
+                self._ppe_max = max(self._ppe_max, float(np.max(steps)))
+                idx = np.floor((steps + _PPE_SPAN_ST) / _PPE_BIN_ST).astype(np.int64)
+                np.clip(idx, 0, len(self._ppe_hist) - 1, out=idx)
+                self._ppe_hist += np.bincount(idx, minlength=len(self._ppe_hist))
+            self._last_f0 = float(f0v[-1])
+
+        self._tremor_f0 = np.concatenate([self._tremor_f0, f0])
+        self._flush_tremor(final=False)
+
+    def _flush_tremor(self, final):
+        # Periodograms over >= _TREMOR_SEGMENT frames; the tail joins the
+        # last segment instead of forming a short one of its own.
+        while len(self._tremor_f0) >= 2 * _TREMOR_SEGMENT or (
+            final and len(self._tremor_f0)
+        ):
+            size = len(self._tremor_f0) if final else _TREMOR_SEGMENT
+            segment, self._tremor_f0 = self._tremor_f0[:size], self._tremor_f0[size:]
+            powers = _tremor_powers(segment, self._pitch_dt)
+            if powers:
+                self._tremor_band += powers[0]
+                self._tremor_total += powers[1]
+                self._tremor_segments += 1
+
+    def _frame_block(self, seg, seg_start, core_start, core_end, final):
+        import librosa
+
+        sr, n = self.sr, self.n_samples
+
+        def window(k0, k1, hop, frame_len, extra=0):
+            # samples of frames k0..k1-1 (+ ``extra``) relative to ``seg``
+            return seg[k0 * hop - seg_start:(k1 - 1) * hop + frame_len + extra - seg_start]
+
+        # CPP: 40 ms frames every 10 ms, starts < n - frame_len
+        frame_len, hop = int(0.04 * sr), int(0.01 * sr)
+        total = len(range(0, n - frame_len, hop)) if final else None
+        k0, k1 = _frame_range(core_start, core_end, hop, total)
+        if k1 > k0:
+            self._add("cpp", _cpp_frames(window(k0, k1, hop, frame_len, extra=1), sr))
+
+        # Loudness decay: RMS of 25 ms frames every 10 ms, regression sums
+        frame_len, hop = int(0.025 * sr), int(0.010 * sr)
+        total = max(0, (n - frame_len) // hop + 1) if final else None
+        k0, k1 = _frame_range(core_start, core_end, hop, total)
+        if k1 > k0:
+            energy = SpectralCache(window(k0, k1, hop, frame_len), sr).frame_rms(frame_len, hop)
+            t = np.arange(k0, k0 + len(energy)) * (hop / sr)
+            self._rms += (len(t), t.sum(), energy.sum(), t @ t, t @ energy)
+
+        # MFCCs and harmonicity: centred 2048/512 frames (zero padded ends)
+        n_fft, hop = 2048, 512
+        total = 1 + n // hop if final else None
+        k0, k1 = _frame_range(core_start, core_end, hop, total)
+        if k1 > k0:
+            lo, hi = k0 * hop - n_fft // 2, (k1 - 1) * hop + n_fft // 2
+            segment = np.zeros(hi - lo, dtype=np.float32)
+            a, b = max(lo, seg_start), min(hi, seg_start + len(seg))
+            segment[a - lo:b - lo] = seg[a - seg_start:b - seg_start]
+            mfcc = librosa.feature.mfcc(y=segment, sr=sr, n_mfcc=13, center=False)
+            self._mfcc_sum += mfcc.sum(axis=1)
+            self._mfcc_frames += mfcc.shape[1]
+
+            harm, tot = _harmonicity_energies(seg, k0, k1, total, offset=seg_start)
+            self._harm[0] += harm
+            self._harm[1] += tot
+
+    # -- results -----------------------------------------------------------
+
+    def _mean(self, key):
+        total, count = self._sums[key]
+        return total / count if count else None
+
+    def _ppe(self):
+        if self._f0_n <= 2:
+            return None
+        lo, hi = self._ppe_min, self._ppe_max
+        if hi <= lo:
+            return 0.0
+        centres = (np.arange(len(self._ppe_hist)) + 0.5) * _PPE_BIN_ST - _PPE_SPAN_ST
+        used = self._ppe_hist > 0
+        coarse = np.clip(((centres[used] - lo) / (hi - lo) * 30).astype(np.int64), 0, 29)
+        hist = np.bincount(coarse, weights=self._ppe_hist[used], minlength=30)
+        hist = hist[hist > 0]
+        hist = hist / hist.sum()
+        return float(-np.sum(hist * np.log2(hist)))
+
+    def _features(self, provisional=False):
+        sr, duration = self.sr, self._core_start / self.sr
+        features = dict.fromkeys(STREAMING_TASK_KEYS["conversation"])
+
+        if self._f0_n:
+            features["f0_mean"] = self._f0_mean
+            features["f0_sd"] = math.sqrt(self._f0_m2 / self._f0_n)
+            features["f0_range"] = self._f0_max - self._f0_min
+        features["jitter_local"] = self._jitter.value()
+        features["shimmer_local"] = self._mean("shimmer")
+        features["hnr"] = self._mean("hnr")
+        if self._mfcc_frames:
+            features["mfcc2_mean"] = float(self._mfcc_sum[1] / self._mfcc_frames)
+
+        features["ppe"] = self._ppe()
+        features["cpp"] = self._mean("cpp")
+        if self._pitch_frames:
+            features["articulation_rate"] = self._f0_n / self._pitch_frames
+        features["f1_mean"] = self._mean("f1")
+        features["f2_mean"] = self._mean("f2")
+        harm, total = self._harm
+        features["spectral_harmonicity"] = harm / total if total > 0 else None
+
+        features["formant_bandwidth"] = self._mean("b1")
+        try:
+            features["spectral_tilt"] = _spectral_tilt(
+                SpectralCache(self._head, sr).head_spectrum(len(self._head)), sr,
+            )
+        except Exception:
+            pass
+        if self._pitch_frames > 1 and duration > 0:
+            features["voice_breaks"] = self._breaks / duration
+        band, total, segments = self._tremor_band, self._tremor_total, self._tremor_segments
+        pending = (
+            _tremor_powers(self._tremor_f0, self._pitch_dt)
+            if provisional and len(self._tremor_f0) else None
+        )
+        if pending:
+            band, total, segments = band + pending[0], total + pending[1], segments + 1
+        if segments:
+            features["tremor_freq_power"] = band / (total + 1e-12)
+        features["breathiness_h1h2"] = self._mean("h1h2")
+        count, st, se, stt, ste = self._rms
+        if count > 2:
+            features["loudness_decay"] = float(
+                (count * ste - st * se) / (count * stt - st * st)
+            )
+        return features
+
+
+class StreamingDDK:
+    """DDK features from a waveform delivered in chunks, in constant memory.
+
+    Frames the audio like the centred 2048/512 STFT of
+    :meth:`SpectralCache.stft` (zero padding at both ends), turns every
+    frame into the 128-band log-mel spectrum of :meth:`SpectralCache.log_mel`
+    and feeds its spectral flux, aligned as in
+    ``librosa.onset.onset_strength``, to an :class:`OnsetPicker`; the
+    rhythm measures come from :func:`ddk_rhythm`.  Onsets match
+    :func:`extract_ddk` except that the 80 dB floor of ``power_to_db``
+    follows the loudest frame so far instead of the loudest frame of the
+    recording, which only matters for frames more than 80 dB below it.
+    Memory is one analysis window of samples plus the live onset
+    candidates.
+    """
+
+    FRAME = 2048
+    BLOCK_FRAMES = 256       # STFT frames transformed per batch
+    TOP_DB = 80.0
+
+    def __init__(self, sr=16000):
+        import librosa
+        from scipy.signal import get_window
+        self.sr = sr
+        self.n_samples = 0
+        self.n_frames = 0
+        self._window = get_window("hann", self.FRAME).astype(np.float32)
+        self._mel_basis = librosa.filters.mel(
+            sr=sr, n_fft=self.FRAME, n_mels=128, dtype=np.float32,
+        ).T
+        self._buf = np.zeros(self.FRAME // 2, dtype=np.float32)
+        self._db_max = -np.inf
+        self._prev = None              # unclipped log-mel of the last frame
+        self._held = np.zeros(2)       # flux trails the envelope by two frames
+        self._picker = OnsetPicker(**DDK_PEAK_PICK)
+
+    def push(self, samples):
+        """Append mono float32 samples; complete frames are analysed right away."""
+        samples = np.asarray(samples, dtype=np.float32).ravel()
+        if not samples.size:
+            return
+        self.n_samples += len(samples)
+        self._buf = np.concatenate([self._buf, samples])
+        self._frames()
+
+    def finish(self):
+        """Analyse the zero-padded tail and return the feature dict."""
+        if self.n_samples == 0:
+            raise ValueError("No audio was streamed")
+        self._buf = np.concatenate([self._buf, np.zeros(self.FRAME // 2, np.float32)])
+        self._frames()
+        # onset_strength drops the flux of the last two frames
+        return self._features(self._picker.finish())
+
+    @property
+    def analysed_samples(self):
+        """Samples up to the last frame whose onset decision is final."""
+        return min(self._picker.n_decided * DDK_HOP, self.n_samples)
+
+    def snapshot(self):
+        """Provisional features from the onsets decided so far."""
+        return self._features(self._picker.onsets())
+
+    def _features(self, frames):
+        return ddk_rhythm(frames * DDK_HOP / self.sr)
+
+    def _frames(self):
+        from numpy.lib.stride_tricks import sliding_window_view
+        count = (len(self._buf) - self.FRAME) // DDK_HOP + 1
+        for start in range(0, max(count, 0), self.BLOCK_FRAMES):
+            stop = min(start + self.BLOCK_FRAMES, count)
+            segment = self._buf[start * DDK_HOP:(stop - 1) * DDK_HOP + self.FRAME]
+            frames = sliding_window_view(segment, self.FRAME)[::DDK_HOP] * self._window
+            power = np.abs(np.fft.rfft(frames, axis=1)).astype(np.float32) ** 2
+            self._flux(10.0 * np.log10(np.maximum(power @ self._mel_basis, 1e-10)))
+        if count > 0:
+            self._buf = self._buf[count * DDK_HOP:]
+            self.n_frames += count
+
+    def _flux(self, log_mel):
+        # Per-frame 80 dB floor from the running maximum; the previous frame
+        # is re-clipped with the current floor, as a whole-signal floor would.
+        floor = np.maximum.accumulate(
+            np.maximum(log_mel.max(axis=1), self._db_max)
+        ) - self.TOP_DB
+        self._db_max = floor[-1] + self.TOP_DB
+        previous = np.vstack([log_mel[:1] if self._prev is None else self._prev, log_mel[:-1]])
+        self._prev = log_mel[-1:]
+        rise = np.maximum(log_mel, floor[:, None]) - np.maximum(previous, floor[:, None])
+        flux = np.concatenate([self._held, np.maximum(rise, 0.0).mean(axis=1)])
+        self._picker.push(flux[:-2])
+        self._held = flux[-2:]
+
+
+ONLINE_UPDATE_S = 1.0    # block length, i.e. how often features refresh
+ONLINE_CONTEXT_S = 0.6   # look-ahead each update waits for
+
+
+class OnlineSession:
+    """Provisional features while a fluency or ddk recording is in progress.
+
+    Wraps a :class:`StreamingExtractor` with ``update_s`` blocks: every
+    pushed chunk is analysed once, as soon as the block it completes plus
+    ``context_s`` of look-ahead has arrived, so an update costs time
+    proportional to the new audio and the features trail the live signal
+    by about ``update_s + context_s``.  :meth:`finish` only analyses the
+    remaining tail.
+
+    All values, including those from :meth:`finish`, are provisional and
+    not equivalent to a batch run of the same recording.  A live stream
+    has no known length or peak, so Praat's frame grid and thresholds
+    cannot be matched to the full-signal ones (see
+    :class:`StreamingExtractor`), and 1 s blocks put many block edges in
+    sustained phonation.  On 75 s of speech in 1 s blocks, F0 mean, HNR,
+    jitter and formant bandwidth are within 0.5% of ``run_extraction``,
+    F0 SD, shimmer and voice breaks within ~3%, and tremor power and
+    H1-H2 differ by ~18%; on a 75 s vowel jitter and shimmer differ by
+    3-7%.  Re-run the saved recording through :func:`run_extraction` when
+    batch values are needed.
+
+    With ``task_type="ddk"`` it wraps a :class:`StreamingDDK` instead and
+    the DDK features follow every onset once its peak-picking windows are
+    complete (~150 ms after the onset); ``update_s`` and ``context_s`` are
+    not used.
+
+    Usage::
+
+        session = OnlineSession(input_format="s16le")
+        for chunk in pcm_chunks:          # bytes or float32 arrays
+            live = session.push(chunk)    # {feature: value or None}
+        final = session.finish()
+    """
+
+    TASK_TYPES = ("fluency", "ddk")
+
+    def __init__(self, sr=16000, input_format="f32le", update_s=ONLINE_UPDATE_S,
+                 context_s=ONLINE_CONTEXT_S, task_type="fluency"):
+        if input_format not in PCM_FORMATS:
+            raise ValueError(f"input_format must be one of {sorted(PCM_FORMATS)}")
+        if task_type not in self.TASK_TYPES:
+            raise ValueError(f"task_type must be one of {list(self.TASK_TYPES)}")
+        self.sr = sr
+        self.input_format = input_format
+        self.feature_keys = STREAMING_TASK_KEYS[task_type]
+        if task_type == "ddk":
+            self._extractor = StreamingDDK(sr)
+        else:
+            self._extractor = StreamingExtractor(sr, block_s=update_s, context_s=context_s)
+        self._rest = b""
+        self._analysed = -1
+        self._features = None
+
+    @property
+    def analysed_s(self):
+        """Seconds of audio reflected in the current features."""
+        return self._extractor.analysed_samples / self.sr
+
+    def push(self, pcm):
+        """Add a chunk of mono PCM at ``sr`` and return the current features.
+
+        ``pcm`` is raw little-endian bytes in ``input_format`` (a trailing
+        partial sample is kept for the next chunk) or a float array.
+        """
+        if isinstance(pcm, (bytes, bytearray, memoryview)):
+            dtype, scale = PCM_FORMATS[self.input_format]
+            data = self._rest + bytes(pcm)
+            usable = len(data) - len(data) % np.dtype(dtype).itemsize
+            self._rest = data[usable:]
+            pcm = np.frombuffer(data[:usable], dtype=dtype).astype(np.float32)
+            if scale != 1.0:
+                pcm *= np.float32(1.0 / scale)
+        self._extractor.push(pcm)
+        return self.features()
+
+    def features(self):
+        """Provisional features; recomputed only after a new block."""
+        if self._extractor.analysed_samples != self._analysed:
+            self._analysed = self._extractor.analysed_samples
+            snapshot = self._extractor.snapshot()
+            self._features = sanitize_features(
+                {key: snapshot[key] for key in self.feature_keys}
+            )
+        return dict(self._features)
+
+    def finish(self):
+        """Analyse the remaining audio and return the session's features.
+
+        These cover the whole recording but are still streaming estimates,
+        not batch values (see the class docstring).
+        """
+        final = self._extractor.finish()
+        self._analysed = self._extractor.analysed_samples
+        self._features = sanitize_features({key: final[key] for key in self.feature_keys})
+        return dict(self._features)
+
+
+def iter_audio_file_blocks(audio_path, sr=16000, block_s=STREAM_BLOCK_S):
+    """Yield a file's audio as mono float32 blocks at ``sr``, never whole.
+
+    Reads with soundfile and resamples with a streaming soxr resampler when
+    the file rate differs from ``sr``.
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(audio_path) as f:
+        resampler = None
+        if f.samplerate != sr:
+            import soxr
+            resampler = soxr.ResampleStream(f.samplerate, sr, 1, dtype="float32")
+        for block in f.blocks(blocksize=int(block_s * f.samplerate), dtype="float32",
+                              always_2d=True):
+            y = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+            yield resampler.resample_chunk(y) if resampler else y
+        if resampler:
+            yield resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True)
+
+
+def iter_pcm_blocks(stream, input_format, sample_rate, sr=16000, block_s=STREAM_BLOCK_S):
+    """Yield raw PCM from a binary stream as mono float32 blocks at ``sr``.
+
+    Raises
+    ------
+    JobError
+        If the stream is empty or longer than MAX_AUDIO_SIZE bytes.
+    """
+    dtype, scale = PCM_FORMATS[input_format]
+    itemsize = np.dtype(dtype).itemsize
+    chunk_bytes = int(block_s * sample_rate) * itemsize
+    resampler = None
+    if sample_rate != sr:
+        import soxr
+        resampler = soxr.ResampleStream(sample_rate, sr, 1, dtype="float32")
+
+    total, rest = 0, b""
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        total += len(data)
+        if total > MAX_AUDIO_SIZE:
+            raise JobError(f"Audio stream too large (max {MAX_AUDIO_SIZE} bytes)")
+        data = rest + data
+        usable = len(data) - len(data) % itemsize
+        rest = data[usable:]
+        y = np.frombuffer(data, dtype=dtype, count=usable // itemsize).astype(np.float32)
+        if scale != 1.0:
+            y *= np.float32(1.0 / scale)
+        yield resampler.resample_chunk(y) if resampler else y
+    if total == 0:
+        raise JobError("Audio stream is empty")
+    if resampler:
+        yield resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True)
+
+
+# ============================================================================
+# Result cache (content-addressed, on disk)
+# ============================================================================
+
+# Part of every cache key: bump whenever feature values or the result schema
+# change, so results from an older engine are never served.
+ENGINE_VERSION = "5.3.0"
+CACHE_DIR_ENV = "CVF_FEATURE_CACHE_DIR"
+CACHE_MAX_MB_ENV = "CVF_FEATURE_CACHE_MAX_MB"
+DEFAULT_CACHE_MAX_MB = 512
+
+
+def audio_digest(y, sr):
+    """SHA-256 of a decoded waveform (float32 samples and sample rate)."""
+    import hashlib
+    digest = hashlib.sha256(f"pcm:{sr}:1:".encode())
+    digest.update(np.ascontiguousarray(y, dtype=np.float32).data)
+    return digest.hexdigest()
+
+
+def file_audio_digest(audio_path, block_frames=1 << 20):
+    """SHA-256 of a file's decoded samples, read block-wise with soundfile.
+
+    Files that differ only in headers or metadata get the same digest.
+    Files soundfile cannot decode are hashed by their raw bytes.
+    """
+    import hashlib
+    try:
+        import soundfile as sf
+        with sf.SoundFile(audio_path) as f:
+            digest = hashlib.sha256(f"file:{f.samplerate}:{f.channels}:".encode())
+            for block in f.blocks(blocksize=block_frames, dtype="float32"):
+                digest.update(np.ascontiguousarray(block).data)
+        return digest.hexdigest()
+    except Exception:
+        digest = hashlib.sha256(b"bytes:")
+        with open(audio_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of result documents keyed by audio and parameters.
+
+    Entries are JSON files named by the SHA-256 of the audio digest, the
+    extraction parameters and ENGINE_VERSION.  They are written atomically
+    (temp file + rename) and readable by the owner only, since results can
+    carry transcripts.  A read refreshes the entry's mtime; a write that
+    takes the cache over ``max_bytes`` removes the least recently used
+    entries.
+    """
+
+    SUFFIX = ".json"
+    DIR_ENV = CACHE_DIR_ENV
+    MAX_MB_ENV = CACHE_MAX_MB_ENV
+    DEFAULT_MAX_MB = DEFAULT_CACHE_MAX_MB
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = os.path.realpath(directory)
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else self.DEFAULT_MAX_MB * 1024 * 1024
+        )
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, directory=None, max_mb=None):
+        """Store at ``directory`` or ``$DIR_ENV``; None if neither is set."""
+        directory = directory or os.environ.get(cls.DIR_ENV)
+        if not directory:
+            return None
+        if max_mb is None:
+            max_mb = float(os.environ.get(cls.MAX_MB_ENV, cls.DEFAULT_MAX_MB))
+        return cls(directory, int(max_mb * 1024 * 1024))
+
+    @staticmethod
+    def key(digest, params):
+        """Entry key for an audio digest and a dict of extraction parameters."""
+        import hashlib
+        payload = json.dumps(
+            {"audio": digest, "engine": ENGINE_VERSION, "params": params},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def get(self, key):
+        """Stored result for ``key``, or None.  Unreadable entries are dropped."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                result = json.load(fh)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return result
+
+    def put(self, key, result):
+        """Store ``result`` under ``key``, then evict down to ``max_bytes``."""
+        self._write(key, lambda fh: fh.write(json.dumps(result).encode()))
+
+    def _write(self, key, dump):
+        """Atomically write an entry with ``dump(binary_file)``, then evict."""
+        import tempfile
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                dump(fh)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits."""
+        entries, total = [], 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+# Part of every TrackStore key together with PRAAT_SETTINGS: bump when the
+# way a stored track is computed changes (not for feature formula changes,
+# which reuse the same tracks).
+TRACK_VERSION = 1
+TRACK_DIR_ENV = "CVF_TRACK_DIR"
+TRACK_MAX_MB_ENV = "CVF_TRACK_MAX_MB"
+DEFAULT_TRACK_MAX_MB = 4096
+
+
+class TrackStore(ResultCache):
+    """On-disk store of per-recording analysis tracks (``.npz`` per entry).
+
+    Holds the arrays of :meth:`AnalysisContext.export_tracks` -- F0 and
+    voicing, glottal pulse times, harmonicity frames, formant frequencies
+    and bandwidths, MFCCs -- keyed by the decoded audio and the Praat
+    settings, but not by ENGINE_VERSION: a later run, or a backfill after a
+    feature formula changes, loads them instead of re-running Praat.  Same
+    atomic writes and LRU eviction as :class:`ResultCache`.
+    """
+
+    SUFFIX = ".npz"
+    DIR_ENV = TRACK_DIR_ENV
+    MAX_MB_ENV = TRACK_MAX_MB_ENV
+    DEFAULT_MAX_MB = DEFAULT_TRACK_MAX_MB
+
+    @staticmethod
+    def key(digest, params=None):
+        """Entry key for an audio digest (``params`` defaults to PRAAT_SETTINGS)."""
+        import hashlib
+        payload = json.dumps(
+            {"audio": digest, "tracks": TRACK_VERSION,
+             "params": PRAAT_SETTINGS if params is None else params},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        """Stored tracks for ``key`` as a dict of read-only arrays, or None."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                tracks = {name: _readonly(data[name]) for name in data.files}
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return tracks
+
+    def put(self, key, tracks):
+        """Store a dict of arrays under ``key``, then evict down to ``max_bytes``."""
+        arrays = {name: np.asarray(value) for name, value in tracks.items()}
+        self._write(key, lambda fh: np.savez(fh, **arrays))
+
+
+# ============================================================================
+# Job execution (shared by one-shot CLI and --serve worker)
+# ============================================================================
+
+VALID_TASK_TYPES = ("conversation", "sustained_vowel", "ddk", "fluency")
+ALLOWED_WHISPER_MODELS = frozenset({
+    "tiny", "base", "small", "medium", "large", "large-v2", "large-v3",
+})
+MAX_AUDIO_SIZE = 500 * 1024 * 1024  # 500MB
+STDIN_PATH = "-"
+PCM_FORMATS = {
+    "s16le": ("<i2", 32768.0),
+    "f32le": ("<f4", 1.0),
+}
+INPUT_FORMATS = ("wav",) + tuple(PCM_FORMATS)
+MAX_NOLDS_POINTS = 50000  # pair counting is O(n^2) time even in bounded memory
+
+F0_NORMS = {
+    "male": {"mean": 120, "sd": 20},
+    "female": {"mean": 210, "sd": 30},
+}
+
+# Feature keys each extract_* function returns, and the extractors every task
+# runs (merged in this order; later keys win).
+EXTRACTOR_KEYS = {
+    "tier1": _TIER1_KEYS,
+    "tier2": _TIER2_KEYS,
+    "v5_acoustic": _V5_KEYS,
+    "sustained_vowel": _SV_PULSE_KEYS + (
+        "hnr", "nhr", "cpp", "f0_mean", "f0_sd", "f0_min", "f0_max",
+        "f0_range", "rpde", "dfa", "ppe", "d2",
+    ),
+    "vowel_space": ("f1_mean", "f2_mean", "vsa", "vai"),
+    "ddk": _DDK_KEYS,
+}
+TASK_EXTRACTORS = {
+    "conversation": ("tier1", "tier2", "v5_acoustic"),
+    "sustained_vowel": ("sustained_vowel", "vowel_space", "v5_acoustic"),
+    "ddk": ("ddk",),
+    "fluency": ("tier1", "v5_acoustic"),
+}
+
+# Intermediate analyses each feature is computed from (the AnalysisContext /
+# SpectralCache object it reads).  plan_features() uses this to build only
+# what a requested subset needs.
+FEATURE_ANALYSES = {
+    **dict.fromkeys(
+        ("f0_mean", "f0_sd", "f0_min", "f0_max", "f0_range", "ppe",
+         "articulation_rate", "voice_breaks", "tremor_freq_power"),
+        ("pitch",),
+    ),
+    **dict.fromkeys(_SV_PULSE_KEYS, ("point_process",)),
+    "hnr": ("harmonicity",),
+    "nhr": ("harmonicity",),
+    "mfcc2_mean": ("mfcc",),
+    **dict.fromkeys(("rpde", "dfa", "d2"), ("nolds",)),
+    "cpp": ("cepstrum",),
+    **dict.fromkeys(
+        ("f1_mean", "f2_mean", "formant_bandwidth", "vsa", "vai"),
+        ("formant",),
+    ),
+    "spectral_tilt": ("spectrum",),
+    "breathiness_h1h2": ("pitch", "frames"),
+    "loudness_decay": ("frames",),
+    "spectral_harmonicity": ("stft",),
+    **dict.fromkeys(EXTRACTOR_KEYS["ddk"], ("stft",)),
+}
+
+# Formula revision of each feature, reported as ``feature_versions`` in
+# results.  Bump a key when its values change so stored results are seen as
+# stale by backfill_features.py; keys not listed are at revision 1.
+FEATURE_VERSIONS = {
+    "breathiness_h1h2": 2,  # every voiced frame instead of every third
+}
+
+
+def feature_version(key):
+    """Current formula revision of feature ``key``."""
+    return FEATURE_VERSIONS.get(key, 1)
+
+
+def task_feature_keys(task_type):
+    """Feature keys a full ``task_type`` extraction returns, in order."""
+    keys = {}
+    for name in TASK_EXTRACTORS.get(task_type, ()):
+        keys.update(dict.fromkeys(EXTRACTOR_KEYS[name]))
+    return tuple(keys)
+
+
+def plan_features(task_type, only=None):
+    """Work needed to produce the feature keys ``only`` for ``task_type``.
+
+    ``only`` None plans the full task.  Returns a dict with the requested
+    ``features`` the task produces (in result order), the ``extractors``
+    returning them, the intermediate ``analyses`` (FEATURE_ANALYSES) they
+    read, and the requested keys the task does not produce
+    (``unavailable``).
+    """
+    available = task_feature_keys(task_type)
+    requested = set(available if only is None else only)
+    features = [key for key in available if key in requested]
+    return {
+        "features": features,
+        "extractors": [
+            name for name in TASK_EXTRACTORS.get(task_type, ())
+            if requested.intersection(EXTRACTOR_KEYS[name])
+        ],
+        "analyses": sorted({
+            analysis for key in features
+            for analysis in FEATURE_ANALYSES.get(key, ())
+        }),
+        "unavailable": sorted(requested.difference(available)),
+    }
+
+
+def _run_extractor(name, sound, y, sr, ctx, mfccs=None):
+    """Call the extract_* function registered in EXTRACTOR_KEYS as ``name``."""
+    if name == "tier1":
+        return extract_tier1(sound, y, sr, mfccs=mfccs, ctx=ctx)
+    if name == "tier2":
+        return extract_tier2(sound, y, sr, ctx=ctx)
+    if name == "v5_acoustic":
+        return extract_v5_acoustic(sound, y, sr, ctx=ctx)
+    if name == "sustained_vowel":
+        return extract_sustained_vowel(sound, y, sr, ctx=ctx)
+    if name == "vowel_space":
+        return extract_vowel_space(sound, ctx=ctx)
+    if name == "ddk":
+        return extract_ddk(y, sr, ctx=ctx)
+    raise KeyError(name)
+
+_NULL_TEMPORAL = {
+    "pause_before_noun": None,
+    "pause_variability": None,
+    "syllable_rate_decay": None,
+    "word_duration_mean": None,
+    "voiced_ratio": None,
+}
+
+
+class JobError(ValueError):
+    """Raised for invalid job input; the message is safe to return to callers."""
+
+
+def error_result(message):
+    """Build the error payload printed on stdout for a failed job."""
+    return {"status": "error", "error": message, "features": None}
+
+
+# On/off job fields of the worker protocol; values must be JSON booleans
+JOB_FLAGS = (
+    "gpu", "word_timestamps", "streaming", "vad", "concurrent_asr", "profile",
+    "cache",
+)
+
+
+def validate_job(audio_path, task_type, gender="female", whisper_model="large-v3",
+                 harmonicity_mode="hpss", nolds_points=None,
+                 nolds_decimation="stride", streaming=False,
+                 asr_backend="whisper", features=None, flags=None):
+    """Validate job parameters and return the resolved audio path.
+
+    ``audio_path`` may be ``"-"`` (audio on stdin); it is returned as is
+    and the size checks happen in :func:`read_audio_stream`.  ``flags``
+    maps on/off job fields (see :data:`JOB_FLAGS`) to their values, which
+    must be real booleans: JSON ``"false"`` or ``0`` is rejected rather
+    than read as true.
+
+    Raises
+    ------
+    JobError
+        If the file is missing, empty or too large, or a parameter is not in
+        its allowlist.
+    """
+    for name, value in (flags or {}).items():
+        if not isinstance(value, bool):
+            raise JobError(f"{name} must be true or false")
+    if task_type not in VALID_TASK_TYPES:
+        raise JobError("Invalid task type")
+    if gender not in F0_NORMS:
+        raise JobError("Invalid gender")
+    if whisper_model not in ALLOWED_WHISPER_MODELS:
+        raise JobError("Invalid whisper model")
+    if asr_backend not in ASR_BACKENDS:
+        raise JobError("Invalid ASR backend")
+    if harmonicity_mode not in HARMONICITY_MODES:
+        raise JobError("Invalid harmonicity mode")
+    if nolds_points is not None and (
+        isinstance(nolds_points, bool) or not isinstance(nolds_points, int)
+        or not 100 <= nolds_points <= MAX_NOLDS_POINTS
+    ):
+        raise JobError(f"nolds_points must be an integer in [100, {MAX_NOLDS_POINTS}]")
+    if nolds_decimation not in NOLDS_DECIMATION:
+        raise JobError("Invalid nolds decimation")
+    if streaming and task_type not in STREAMING_TASK_KEYS:
+        raise JobError("Streaming mode supports conversation, fluency and ddk tasks")
+    if streaming and harmonicity_mode == "compare":
+        raise JobError("Streaming mode computes fast spectral harmonicity only")
+    if features is not None and (
+        not isinstance(features, (list, tuple)) or not features
+        or not all(isinstance(key, str) and key for key in features)
+    ):
+        raise JobError("features must be a non-empty list of feature keys")
+
+    if not isinstance(audio_path, str) or not audio_path:
+        raise JobError("Audio file not found")
+    if audio_path == STDIN_PATH:
+        return audio_path
+    audio_path = os.path.realpath(audio_path)
     if not os.path.isfile(audio_path):
-        print(json.dumps({
-            "status": "error",
-            "error": "Audio file not found",
-            "features": None,
-        }))
-        sys.exit(1)
+        raise JobError("Audio file not found")
 
-    # --- Audio file size limit (500MB max) ---
-    MAX_AUDIO_SIZE = 500 * 1024 * 1024
     file_size = os.path.getsize(audio_path)
     if file_size > MAX_AUDIO_SIZE:
-        print(json.dumps({
-            "status": "error",
-            "error": f"Audio file too large ({file_size} bytes, max {MAX_AUDIO_SIZE})",
-            "features": None,
-        }))
-        sys.exit(1)
+        raise JobError(
+            f"Audio file too large ({file_size} bytes, max {MAX_AUDIO_SIZE})"
+        )
     if file_size == 0:
-        print(json.dumps({
-            "status": "error",
-            "error": "Audio file is empty",
-            "features": None,
-        }))
-        sys.exit(1)
+        raise JobError("Audio file is empty")
+    return audio_path
 
-    # --- Validate task_type ---
-    valid_tasks = {"conversation", "sustained_vowel", "ddk", "fluency"}
-    if args.task_type not in valid_tasks:
-        print(json.dumps({
-            "status": "error",
-            "error": "Invalid task type",
-            "features": None,
-        }))
-        sys.exit(1)
 
-    # --- Device detection ---
-    device = get_device(prefer_gpu=args.gpu)
+def read_audio_stream(stream, input_format="wav", sample_rate=16000, sr=16000):
+    """Read one recording from a binary stream (stdin) and decode it.
+
+    ``input_format`` is ``wav`` (any WAV stream the decoders accept) or one
+    of PCM_FORMATS (headerless mono PCM at ``sample_rate``).  Nothing is
+    written to disk.
 
+    Returns
+    -------
+    y : np.ndarray -- mono float32 waveform at ``sr``
+    sr : int        -- sample rate
+    backend : str   -- "torchaudio"/"librosa" for WAV, "pcm" for raw PCM
+
+    Raises
+    ------
+    JobError
+        If the stream is empty or larger than MAX_AUDIO_SIZE.
+    """
+    data = stream.read(MAX_AUDIO_SIZE + 1)
+    if len(data) > MAX_AUDIO_SIZE:
+        raise JobError(f"Audio stream too large (max {MAX_AUDIO_SIZE} bytes)")
+    if not data:
+        raise JobError("Audio stream is empty")
+
+    if input_format == "wav":
+        return load_audio(io.BytesIO(data), sr=sr)
+    y, sr = decode_pcm(data, input_format, sample_rate, sr=sr)
+    del data
+    if y.size == 0:
+        raise JobError("Audio stream is empty")
+    return y, sr, "pcm"
+
+
+@contextlib.contextmanager
+def _deferred(fn, background):
+    """Start ``fn`` now in a worker thread, or not at all; yields a joiner.
+
+    Calling the yielded function gives ``fn()``'s result: the thread's
+    (waiting for it) when ``background`` is true, else a plain call.  On
+    exit, also through an exception, a call that has not started is
+    cancelled and a running one is waited for, so no thread outlives the
+    block.
+    """
+    if not background:
+        yield fn
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cvf-asr")
+    future = executor.submit(fn)
     try:
-        import parselmouth
+        yield future.result
+    finally:
+        future.cancel()
+        executor.shutdown(wait=True)
+
+
+def run_extraction(audio_path, task_type, gender="female", gpu=False,
+                   whisper_model="large-v3", word_timestamps=False,
+                   harmonicity_mode="hpss", nolds_points=None,
+                   nolds_decimation="stride", waveform=None,
+                   streaming=False, blocks=None, cache=None, tracks=None,
+                   only=None, vad=True, asr_backend="whisper",
+                   concurrent_asr=True, profile=False):
+    """Run the full V5 extraction for one recording.
+
+    Parameters mirror the CLI flags.  ``audio_path`` must already have been
+    checked with :func:`validate_job`.  ``waveform`` is an already decoded
+    ``(y, sr, backend)`` triple (see :func:`read_audio_stream`); when given,
+    ``audio_path`` is not read.  Whisper always receives the decoded 16 kHz
+    array rather than re-decoding the file with its own ffmpeg process,
+    except in streaming mode, where no full waveform exists.
+
+    With ``streaming`` the recording is never held in memory: it is fed
+    block by block to a :class:`StreamingExtractor` (a :class:`StreamingDDK`
+    for ddk tasks), from ``blocks`` (an iterable of 16 kHz float32 chunks,
+    e.g. :func:`iter_pcm_blocks`) or else from ``audio_path``.  Streaming
+    always computes the ``fast`` spectral harmonicity, which is not
+    interchangeable with the ``hpss`` default, so the result records it as
+    ``diagnostics.harmonicity.mode``.
+
+    ``cache`` (a :class:`ResultCache`) returns a stored result for the same
+    decoded audio and parameters without extracting anything; new results
+    are stored in it.  Results carry ``cache`` = "hit"/"miss" when a cache
+    is used.  Streamed stdin blocks cannot be hashed up front and bypass it.
+
+    ``tracks`` (a :class:`TrackStore`) supplies the pitch, pulse, harmonicity,
+    formant and MFCC tracks of a recording analysed before, so only the
+    feature formulas run; tracks computed by this run are added to it.
+    Streaming extraction does not use it.
+
+    ``only`` restricts the result to those feature keys: only the
+    extractors, and within them the analyses, those keys need are run (see
+    :func:`plan_features`).  Keys the task does not produce are listed under
+    ``plan.unavailable`` in the result rather than rejected.
+
+    With ``vad`` Whisper only transcribes the speech regions found by
+    :func:`detect_speech_regions` (not in streaming mode).  ``asr_backend``
+    selects the ASR implementation (ASR_BACKENDS).  With ``concurrent_asr``
+    transcription starts in a background thread as soon as the audio is
+    decoded (after VAD) and runs while the acoustic tiers are computed; the
+    two are joined before the temporal indicators.  PyTorch releases the GIL
+    in its kernels, so the stages genuinely overlap.
+
+    With ``profile`` the result gets a ``timings`` section: wall time, CPU
+    time and peak memory of decoding, each extractor and its feature blocks,
+    Whisper and the temporal indicators (see :class:`StageProfiler`).
+    Profiled runs bypass the result cache, whose hits would time nothing.
 
-        # Load audio + GPU-accelerated MFCCs (with librosa fallback)
-        y, sr, mfccs, audio_backend = load_audio_and_mfcc(
-            audio_path, sr=16000, n_mfcc=13, device=device,
+    Returns
+    -------
+    dict -- the result document printed by ``main()`` (``status`` == "ok").
+    """
+    plan = plan_features(task_type, only)
+    profiler = StageProfiler() if profile else None
+
+    # MFCC (torchaudio) and Whisper outputs differ between devices, so the
+    # resolved device is part of the cache key.
+    device = get_device(prefer_gpu=gpu)
+    cache_key = None
+    if cache is not None and blocks is None and not profile:
+        digest = (
+            audio_digest(waveform[0], waveform[1]) if waveform is not None
+            else file_audio_digest(audio_path)
         )
-        sound = parselmouth.Sound(audio_path)
-        duration_s = float(len(y) / sr)
-
-        f0_norms = {
-            "male": {"mean": 120, "sd": 20},
-            "female": {"mean": 210, "sd": 30},
-        }
+        cache_key = cache.key(digest, {
+            "task_type": task_type, "gender": gender,
+            "whisper_model": whisper_model, "word_timestamps": word_timestamps,
+            "harmonicity_mode": harmonicity_mode, "nolds_points": nolds_points,
+            "nolds_decimation": nolds_decimation, "streaming": streaming,
+            "features": sorted(set(only)) if only is not None else None,
+            "vad": vad, "asr_backend": asr_backend, "device": device,
+        })
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cached["cache"] = "hit"
+            return cached
+
+    # The ASR thread (if any) is finished before this returns or raises
+    with contextlib.ExitStack() as background:
+        ctx = None
+        join_asr = None
+
+        def schedule_asr(audio, speech_regions=None):
+            def transcribe():
+                with _stage(profiler, "whisper"):
+                    return extract_whisper_timestamps(
+                        audio, model_name=whisper_model, device=device,
+                        speech_regions=speech_regions, backend=asr_backend,
+                        profiler=profiler,
+                    )
+            return background.enter_context(_deferred(transcribe, concurrent_asr))
+
+        if streaming:
+            if word_timestamps:
+                join_asr = schedule_asr(audio_path)
+            # Blocks go straight into running sums; no full waveform is kept
+            if task_type == "ddk":
+                extractor = StreamingDDK(sr=16000)
+            elif blocks is None:
+                # One cheap decode pass gives the length and peak, so Praat
+                # blocks land on the full-signal frame grid and thresholds.
+                with _stage(profiler, "scan"):
+                    total, peak = stream_peak(iter_audio_file_blocks(audio_path))
+                extractor = StreamingExtractor(sr=16000, total_samples=total, global_peak=peak)
+            else:
+                extractor = StreamingExtractor(sr=16000)
+            with _stage(profiler, "stream"):
+                for block in (
+                    blocks if blocks is not None else iter_audio_file_blocks(audio_path)
+                ):
+                    extractor.push(block)
+                stream_features = extractor.finish()
+            y, sr = None, extractor.sr
+            duration_s = extractor.n_samples / sr
+            audio_backend = "soundfile" if blocks is None else "pcm"
+
+        # Decode once; MFCCs (GPU when available) and Praat share that waveform
+        elif waveform is None:
+            with _stage(profiler, "decode"):
+                y, sr, audio_backend = load_audio(audio_path, sr=16000)
+        else:
+            y, sr, audio_backend = waveform
+        if not streaming:
+            track_key, stored = None, {}
+            if tracks is not None:
+                track_key = tracks.key(audio_digest(y, sr))
+                stored = tracks.get(track_key) or {}
+            mfccs = None
+            if audio_backend != "librosa" and "mfcc" in plan["analyses"]:
+                mfccs = stored.get("mfccs")
+                if mfccs is None:
+                    with _stage(profiler, "mfcc"):
+                        try:
+                            mfccs = compute_mfcc(y, sr, n_mfcc=13, device=device)
+                        except Exception:
+                            mfccs = None
+                if waveform is not None:
+                    audio_backend = "torchaudio" if mfccs is not None else "librosa"
+            sound = sound_from_waveform(y, sr)
+            duration_s = float(len(y) / sr)
+            ctx = AnalysisContext(
+                sound, y, sr, mfccs=mfccs, harmonicity_mode=harmonicity_mode,
+                nolds_points=nolds_points, nolds_decimation=nolds_decimation,
+                tracks=stored, only=only, profiler=profiler,
+            )
+            if word_timestamps:
+                speech_regions = None
+                if vad:
+                    with _stage(profiler, "vad"):
+                        try:
+                            speech_regions = detect_speech_regions(ctx)
+                        except Exception:
+                            speech_regions = None
+                # The waveform is already 16 kHz mono float32, Whisper's native
+                # input; the ASR thread only reads it and never touches ctx.
+                join_asr = schedule_asr(y, speech_regions)
 
         result = {
-            "task_type": args.task_type,
-            "gender": args.gender,
+            "task_type": task_type,
+            "gender": gender,
             "duration_s": round(duration_s, 3),
             "sample_rate": sr,
             "device": device,
             "audio_backend": audio_backend,
-            "f0_norm_ref": f0_norms[args.gender],
+            "f0_norm_ref": F0_NORMS[gender],
+            "engine_version": ENGINE_VERSION,
         }
 
         # ----- Feature extraction per task type -----
-        if args.task_type == "conversation":
-            v4_features = {
-                **extract_tier1(sound, y, sr, mfccs=mfccs),
-                **extract_tier2(sound, y, sr),
-            }
-            v5_features = extract_v5_acoustic(sound, y, sr)
-            result["features"] = {**v4_features, **v5_features}
-
-        elif args.task_type == "sustained_vowel":
-            v4_features = {
-                **extract_sustained_vowel(sound, y, sr),
-                **extract_vowel_space(sound),
+        if streaming:
+            result["streaming"] = True
+            result["features"] = {
+                key: stream_features[key] for key in STREAMING_TASK_KEYS[task_type]
+                if key in plan["features"]
             }
-            v5_features = extract_v5_acoustic(sound, y, sr)
-            result["features"] = {**v4_features, **v5_features}
-
-        elif args.task_type == "ddk":
-            result["features"] = extract_ddk(y, sr)
-
-        elif args.task_type == "fluency":
-            v4_features = extract_tier1(sound, y, sr, mfccs=mfccs)
-            v5_features = extract_v5_acoustic(sound, y, sr)
-            result["features"] = {**v4_features, **v5_features}
+            if "spectral_harmonicity" in result["features"]:
+                # Whatever harmonicity_mode asked for; hpss needs the whole signal
+                result["diagnostics"] = {"harmonicity": {"mode": "fast"}}
 
         else:
-            result["features"] = {}
+            features = {}
+            for name in plan["extractors"]:
+                with _stage(profiler, name):
+                    features.update(_run_extractor(name, sound, y, sr, ctx, mfccs))
+            result["features"] = {
+                key: features[key] for key in plan["features"] if key in features
+            }
+        if only is not None:
+            result["plan"] = {
+                key: plan[key] for key in ("analyses", "unavailable")
+            }
 
         # Sanitize numeric features
         if "features" in result and isinstance(result["features"], dict):
             result["features"] = sanitize_features(result["features"])
+            result["feature_versions"] = {
+                key: feature_version(key) for key in result["features"]
+            }
+        if ctx is not None and ctx.diagnostics:
+            result["diagnostics"] = ctx.diagnostics
+        if ctx is not None and track_key is not None:
+            exported = ctx.export_tracks()
+            if exported.keys() - stored.keys():
+                try:
+                    tracks.put(track_key, exported)
+                except OSError as exc:
+                    print(f"Track store write failed: {exc}", file=sys.stderr)
 
         # ----- Whisper transcription + word timestamps -----
-        if args.word_timestamps:
-            whisper_result = extract_whisper_timestamps(
-                audio_path,
-                model_name=args.whisper_model,
-                device=device,
-            )
+        if word_timestamps:
+            # A sequential run records the transcription itself under "whisper"
+            with _stage(profiler if concurrent_asr else None, "asr_wait"):
+                whisper_result = join_asr()
             if whisper_result is not None:
                 result["whisper"] = whisper_result
                 # Compute temporal indicators from word timestamps
-                result["temporal"] = compute_temporal_from_whisper(
-                    whisper_result["words"], duration_s,
-                )
+                with _stage(profiler, "temporal"):
+                    result["temporal"] = compute_temporal_from_whisper(
+                        whisper_result["words"], duration_s,
+                    )
             else:
                 result["whisper"] = None
-                result["temporal"] = {
-                    "pause_before_noun": None,
-                    "pause_variability": None,
-                    "syllable_rate_decay": None,
-                    "word_duration_mean": None,
-                    "voiced_ratio": None,
-                }
+                result["temporal"] = dict(_NULL_TEMPORAL)
         else:
             result["whisper"] = None
             result["temporal"] = None
 
+        if profiler is not None:
+            result["timings"] = profiler.report()
         result["status"] = "ok"
+        if cache_key is not None:
+            try:
+                cache.put(cache_key, result)
+            except OSError as exc:
+                print(f"Result cache write failed: {exc}", file=sys.stderr)
+            result["cache"] = "miss"
+        return result
+
+
+# ============================================================================
+# Worker mode: newline-delimited JSON jobs on stdin
+# ============================================================================
+
+def _open_cache(args):
+    """ResultCache from the CLI flags / environment, or None (also on error)."""
+    if getattr(args, "no_cache", False):
+        return None
+    try:
+        return ResultCache.from_env(
+            getattr(args, "cache_dir", None), getattr(args, "cache_max_mb", None),
+        )
+    except (OSError, ValueError) as exc:
+        print(f"Result cache disabled: {exc}", file=sys.stderr)
+        return None
+
+
+def _open_track_store(args):
+    """TrackStore from the CLI flags / environment, or None (also on error)."""
+    if getattr(args, "no_cache", False):
+        return None
+    try:
+        return TrackStore.from_env(
+            getattr(args, "track_dir", None), getattr(args, "track_max_mb", None),
+        )
+    except (OSError, ValueError) as exc:
+        print(f"Track store disabled: {exc}", file=sys.stderr)
+        return None
+
+
+def serve(defaults, stdin=None, stdout=None):
+    """Process NDJSON jobs from ``stdin`` until EOF, one result line per job.
+
+    Each input line is an object with the same fields as the CLI flags::
+
+        {"id": "r1", "audio_path": "/tmp/rec.wav", "task_type": "ddk",
+         "gender": "male", "gpu": true, "whisper_model": "base",
+         "word_timestamps": false, "features": ["ddk_rate"]}
+
+    Missing fields fall back to ``defaults`` (the parsed CLI arguments).  The
+    output line uses the schema ``main()`` prints, plus ``id`` echoed back
+    when the job had one.  A failing job produces an error line, e.g. for
+    a flag in :data:`JOB_FLAGS` that is not ``true``/``false``; the worker
+    keeps running.
+
+    Imports, the device probe, torchaudio transforms and Whisper models are
+    cached in ``_WARM_CACHE`` and therefore paid once per worker.  The result
+    cache and track store (if configured) are shared by all jobs;
+    ``"cache": false`` in a job skips both.
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+
+    warm_imports()
+    get_device(prefer_gpu=defaults.gpu)
+    cache = _open_cache(defaults)
+    track_store = _open_track_store(defaults)
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job_id = None
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise JobError("Job must be a JSON object")
+            job_id = job.get("id")
+            params = {
+                "task_type": job.get("task_type", defaults.task_type),
+                "gender": job.get("gender", defaults.gender),
+                "gpu": job.get("gpu", defaults.gpu),
+                "whisper_model": job.get("whisper_model", defaults.whisper_model),
+                "word_timestamps": job.get(
+                    "word_timestamps", defaults.word_timestamps,
+                ),
+                "harmonicity_mode": job.get(
+                    "harmonicity_mode", defaults.harmonicity_mode,
+                ),
+                "nolds_points": job.get("nolds_points", defaults.nolds_points),
+                "nolds_decimation": job.get(
+                    "nolds_decimation", defaults.nolds_decimation,
+                ),
+                "streaming": job.get("streaming", defaults.streaming),
+                "vad": job.get("vad", defaults.vad),
+                "asr_backend": job.get("asr_backend", defaults.asr_backend),
+                "concurrent_asr": job.get(
+                    "concurrent_asr", defaults.concurrent_asr,
+                ),
+                "only": job.get("features", defaults.features),
+                "profile": job.get("profile", defaults.profile),
+            }
+            use_cache = job.get("cache", True)
+            if job.get("audio_path") == STDIN_PATH:
+                raise JobError("stdin audio is not available in --serve mode")
+            audio_path = validate_job(
+                job.get("audio_path"), params["task_type"],
+                params["gender"], params["whisper_model"],
+                params["harmonicity_mode"], params["nolds_points"],
+                params["nolds_decimation"], params["streaming"],
+                params["asr_backend"], params["only"],
+                flags={
+                    name: use_cache if name == "cache" else params[name]
+                    for name in JOB_FLAGS
+                },
+            )
+            # Keep library chatter off the protocol stream.
+            with contextlib.redirect_stdout(sys.stderr):
+                result = run_extraction(
+                    audio_path, cache=cache if use_cache else None,
+                    tracks=track_store if use_cache else None, **params,
+                )
+        except json.JSONDecodeError:
+            result = error_result("Invalid job JSON")
+        except JobError as exc:
+            result = error_result(str(exc))
+        except Exception as exc:
+            result = error_result(f"Feature extraction failed: {str(exc)}")
+
+        if job_id is not None:
+            result["id"] = job_id
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def _feature_list(value):
+    """argparse type for ``--features``: comma-separated keys."""
+    return [key.strip() for key in value.split(",") if key.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="MemoVoice CVF V5 GPU-accelerated acoustic feature extraction"
+    )
+    parser.add_argument(
+        "--audio-path", help="Path to input WAV file, or - to read audio from stdin",
+    )
+    parser.add_argument(
+        "--input-format", default="wav", choices=list(INPUT_FORMATS),
+        help="Format of stdin audio (--audio-path -): a WAV stream, or raw "
+             "mono little-endian PCM (s16le, f32le)",
+    )
+    parser.add_argument(
+        "--sample-rate", type=int, default=16000,
+        help="Sample rate of raw PCM stdin input (default 16000)",
+    )
+    parser.add_argument(
+        "--task-type",
+        choices=list(VALID_TASK_TYPES),
+        help="Micro-task type",
+    )
+    parser.add_argument(
+        "--gender", default="female", choices=["male", "female"],
+        help="Speaker gender for F0 normalization",
+    )
+    parser.add_argument(
+        "--gpu", action="store_true", default=False,
+        help="Prefer GPU acceleration (MPS/CUDA) when available",
+    )
+    parser.add_argument(
+        "--whisper-model", default="large-v3",
+        choices=sorted(ALLOWED_WHISPER_MODELS),
+        help="Whisper model name (default: large-v3)",
+    )
+    parser.add_argument(
+        "--word-timestamps", action="store_true", default=False,
+        help="Enable Whisper word-level timestamp extraction",
+    )
+    parser.add_argument(
+        "--asr-backend", default="whisper", choices=list(ASR_BACKENDS),
+        help="ASR implementation for --word-timestamps: whisper (native "
+             "precision), whisper-int8 (dynamically quantized, CPU) or stub "
+             "(deterministic, for tests)",
+    )
+    parser.add_argument(
+        "--sequential-asr", dest="concurrent_asr", action="store_false",
+        default=True,
+        help="Transcribe after the acoustic features instead of in a "
+             "background thread alongside them",
+    )
+    parser.add_argument(
+        "--features", type=_feature_list, default=None,
+        help="Comma-separated feature keys to compute (default: every key of "
+             "the task); only the analyses those keys need are run",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", default=False,
+        help="Add a timings section with wall time, CPU time and peak memory "
+             "per extraction stage and feature block",
+    )
+    parser.add_argument(
+        "--no-vad", dest="vad", action="store_false", default=True,
+        help="Send the whole recording to Whisper instead of only the speech "
+             "regions found by voice activity detection",
+    )
+    parser.add_argument(
+        "--harmonicity-mode", default="hpss", choices=list(HARMONICITY_MODES),
+        help="spectral_harmonicity implementation: hpss (reference), fast "
+             "(magnitude-domain, bounded memory) or compare (hpss value plus "
+             "an agreement report under diagnostics)",
+    )
+    parser.add_argument(
+        "--nolds-points", type=int, default=None,
+        help="Point budget for rpde/dfa/d2 (default: per-measure "
+             "NOLDS_POINT_BUDGET)",
+    )
+    parser.add_argument(
+        "--nolds-decimation", default="stride", choices=list(NOLDS_DECIMATION),
+        help="How the waveform is reduced to the nonlinear point budget: "
+             "stride (subsampling, default) or antialias (low-pass at the "
+             "decimated Nyquist frequency; removes most voice content)",
+    )
+    parser.add_argument(
+        "--streaming", action="store_true", default=False,
+        help="Bounded-memory mode for long conversation/fluency/ddk recordings: "
+             "analyse the audio in blocks and keep only running statistics "
+             "(rpde/dfa are not computed; spectral harmonicity is always fast)",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help=f"Result cache directory (default: ${CACHE_DIR_ENV}; unset = no cache)",
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=float, default=None,
+        help=f"Result cache size limit in MB, LRU eviction (default: "
+             f"${CACHE_MAX_MB_ENV} or {DEFAULT_CACHE_MAX_MB})",
+    )
+    parser.add_argument(
+        "--track-dir", default=None,
+        help=f"Analysis track store directory: pitch, pulses, formants, MFCCs "
+             f"per recording, reused instead of re-running Praat (default: "
+             f"${TRACK_DIR_ENV}; unset = no store)",
+    )
+    parser.add_argument(
+        "--track-max-mb", type=float, default=None,
+        help=f"Track store size limit in MB, LRU eviction (default: "
+             f"${TRACK_MAX_MB_ENV} or {DEFAULT_TRACK_MAX_MB})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", default=False,
+        help="Ignore the result cache and the track store for this run",
+    )
+    parser.add_argument(
+        "--serve", action="store_true", default=False,
+        help="Worker mode: read NDJSON jobs on stdin, write one JSON result "
+             "per line on stdout, keeping models loaded between jobs",
+    )
+    args = parser.parse_args()
+
+    if args.serve:
+        if args.word_timestamps:
+            # Preload the default ASR model so the first job is not slow.
+            try:
+                ASR_BACKENDS[args.asr_backend].load(
+                    args.whisper_model, get_device(prefer_gpu=args.gpu),
+                )
+            except Exception:
+                pass
+        serve(args)
+        return
+
+    if not args.audio_path or not args.task_type:
+        parser.error("--audio-path and --task-type are required unless --serve is set")
+    if args.input_format != "wav" and args.audio_path != STDIN_PATH:
+        parser.error("--input-format only applies to stdin input (--audio-path -)")
+    if not 4000 <= args.sample_rate <= 192000:
+        parser.error("--sample-rate must be between 4000 and 192000")
+    if args.streaming and args.audio_path == STDIN_PATH:
+        if args.input_format == "wav":
+            parser.error("--streaming from stdin needs raw PCM (--input-format s16le or f32le)")
+        if args.word_timestamps:
+            parser.error("--word-timestamps needs a file path in --streaming mode")
+
+    try:
+        audio_path = validate_job(
+            args.audio_path, args.task_type, args.gender, args.whisper_model,
+            args.harmonicity_mode, args.nolds_points, args.nolds_decimation,
+            args.streaming, args.asr_backend, args.features,
+        )
+        waveform = blocks = None
+        if audio_path == STDIN_PATH and args.streaming:
+            blocks = iter_pcm_blocks(
+                sys.stdin.buffer, args.input_format, args.sample_rate,
+            )
+        elif audio_path == STDIN_PATH:
+            waveform = read_audio_stream(
+                sys.stdin.buffer, args.input_format, args.sample_rate,
+            )
+    except JobError as exc:
+        print(json.dumps(error_result(str(exc))))
+        sys.exit(1)
+    except Exception as exc:
+        print(json.dumps(error_result(f"Could not decode audio stream: {str(exc)}")))
+        sys.exit(1)
+
+    try:
+        result = run_extraction(
+            audio_path, args.task_type,
+            gender=args.gender,
+            gpu=args.gpu,
+            whisper_model=args.whisper_model,
+            word_timestamps=args.word_timestamps,
+            harmonicity_mode=args.harmonicity_mode,
+            nolds_points=args.nolds_points,
+            nolds_decimation=args.nolds_decimation,
+            waveform=waveform,
+            streaming=args.streaming,
+            blocks=blocks,
+            cache=_open_cache(args),
+            tracks=_open_track_store(args),
+            vad=args.vad,
+            asr_backend=args.asr_backend,
+            concurrent_asr=args.concurrent_asr,
+            only=args.features,
+            profile=args.profile,
+        )
         print(json.dumps(result))
 
+    except JobError as exc:
+        print(json.dumps(error_result(str(exc))))
+        sys.exit(1)
     except Exception as exc:
-        print(json.dumps({
-            "status": "error",
-            "error": f"Feature extraction failed: {str(exc)}",
-            "features": None,
-        }))
+        print(json.dumps(error_result(f"Feature extraction failed: {str(exc)}")))
         sys.exit(1)
 
 
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+loadtest_features.py -- end-to-end load test of extract_features_v5.py.
+
+Sends a weighted mix of conversation / sustained_vowel / ddk / fluency jobs,
+part of them with ``--word-timestamps``, through the real extraction script
+at a fixed concurrency (closed loop: a new job starts as soon as one ends)
+and reports throughput, latency percentiles, CPU utilization and peak RSS.
+
+Two modes:
+
+  - ``oneshot`` : one ``extract_features_v5.py`` process per job, the way
+                  acoustic-pipeline.js runs it; each process is a worker
+  - ``serve``   : ``--concurrency`` persistent ``--serve`` workers fed NDJSON
+
+Inputs are the synthetic recordings of benchmark_features.py (speech for
+conversation and fluency, a vowel, /pataka/) unless ``--audio TASK=PATH``
+names real files.  Transcription uses the stub ASR backend by default;
+``--asr-backend whisper --whisper-model tiny`` measures a real small model.
+The result cache is always bypassed.
+
+Usage:
+    python loadtest_features.py --jobs 40 --concurrency 4
+    python loadtest_features.py --mode serve --concurrency 8 --jobs 200 \
+        --mix conversation=2,ddk=1 --word-timestamps-ratio 0.5
+
+CPU time and peak RSS come from ``wait4`` and need a Unix host.
+"""
+
+import argparse, json, os, queue, shutil, subprocess, sys, tempfile, threading, time
+
+import numpy as np
+
+import benchmark_features as bench
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extract_features_v5.py")
+TASK_TYPES = ("conversation", "sustained_vowel", "ddk", "fluency")
+TASK_SIGNALS = {
+    "conversation": "speech",
+    "sustained_vowel": "vowel",
+    "ddk": "pataka",
+    "fluency": "speech",
+}
+# Matches EXTRACTION_TIMEOUT_MS in engine/v5/acoustic-pipeline.js
+PIPELINE_TIMEOUT_S = 120.0
+
+
+# ============================================================================
+# Job plan
+# ============================================================================
+
+def parse_mix(value):
+    """``"conversation=2,ddk=1"`` -> {task: weight}."""
+    mix = {}
+    for item in value.split(","):
+        task, _, weight = item.strip().partition("=")
+        if task not in TASK_TYPES:
+            raise ValueError(f"unknown task type {task!r}")
+        mix[task] = float(weight) if weight else 1.0
+        if mix[task] < 0:
+            raise ValueError(f"negative weight for {task}")
+    if not sum(mix.values()):
+        raise ValueError("the mix has no positive weight")
+    return mix
+
+
+def plan_jobs(n_jobs, mix, word_timestamps_ratio, seed=0):
+    """Deterministic list of job dicts (task_type, gender, word_timestamps)."""
+    rng = np.random.default_rng(seed)
+    tasks = list(mix)
+    weights = np.array([mix[t] for t in tasks]) / sum(mix.values())
+    return [
+        {
+            "task_type": tasks[rng.choice(len(tasks), p=weights)],
+            "gender": ("female", "male")[int(rng.integers(2))],
+            "word_timestamps": bool(rng.random() < word_timestamps_ratio),
+        }
+        for _ in range(n_jobs)
+    ]
+
+
+def write_inputs(directory, duration_s):
+    """Synthetic WAV per task type in ``directory``; returns {task: path}."""
+    import soundfile as sf
+    paths, written = {}, {}
+    for task, signal in TASK_SIGNALS.items():
+        if signal not in written:
+            path = os.path.join(directory, f"{signal}.wav")
+            sf.write(path, bench.SIGNALS[signal](duration_s), bench.SR, subtype="PCM_16")
+            written[signal] = path
+        paths[task] = written[signal]
+    return paths
+
+
+# ============================================================================
+# Workers
+# ============================================================================
+
+def _rusage_stats(rusage):
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return {
+        "cpu_s": rusage.ru_utime + rusage.ru_stime,
+        "peak_rss_mb": rusage.ru_maxrss / scale,
+    }
+
+
+def run_oneshot(job, audio_path, options):
+    """One extraction process per job; returns the job record."""
+    args = [
+        sys.executable, SCRIPT, "--audio-path", audio_path,
+        "--task-type", job["task_type"], "--gender", job["gender"], "--no-cache",
+    ]
+    if job["word_timestamps"]:
+        args += [
+            "--word-timestamps", "--whisper-model", options.whisper_model,
+            "--asr-backend", options.asr_backend,
+        ]
+    started = time.perf_counter()
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    stdout = proc.stdout.read()
+    proc.stdout.close()
+    # wait4 instead of wait() to collect this child's own resource usage
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    record = {"latency_s": time.perf_counter() - started, "pid": proc.pid}
+    record.update(_rusage_stats(rusage))
+    try:
+        record["ok"] = json.loads(stdout).get("status") == "ok"
+    except ValueError:
+        record["ok"] = False
+    return record
+
+
+def _proc_cpu_s(pid):
+    """CPU time used so far by a live process (Linux ``/proc``), else None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of stat(5), in clock ticks
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class ServeWorker:
+    """A persistent ``--serve`` process handling one job at a time."""
+
+    def __init__(self, options):
+        self.proc = subprocess.Popen(
+            [
+                sys.executable, SCRIPT, "--serve",
+                "--whisper-model", options.whisper_model,
+                "--asr-backend", options.asr_backend,
+            ],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1,
+        )
+        self.jobs = 0
+        self.cpu = [None, None]
+
+    def start_clock(self):
+        """Mark the end of warm-up (CPU is counted from here)."""
+        self.jobs = 0
+        self.cpu[0] = _proc_cpu_s(self.proc.pid)
+
+    def stop_clock(self):
+        """Mark the end of the timed jobs, before interpreter teardown."""
+        self.cpu[1] = _proc_cpu_s(self.proc.pid)
+
+    def run(self, job, audio_path):
+        line = json.dumps({**job, "audio_path": audio_path, "cache": False})
+        started = time.perf_counter()
+        self.proc.stdin.write(line + "\n")
+        self.proc.stdin.flush()
+        reply = self.proc.stdout.readline()
+        record = {"latency_s": time.perf_counter() - started, "pid": self.proc.pid}
+        try:
+            record["ok"] = json.loads(reply).get("status") == "ok"
+        except ValueError:
+            record["ok"] = False
+        self.jobs += 1
+        return record
+
+    def close(self):
+        """Stop the worker; returns its pid, job count, CPU time and peak RSS.
+
+        ``cpu_s`` covers the timed jobs when ``/proc`` is readable, else the
+        whole process; ``total_cpu_s`` always covers the whole process,
+        including start-up, warm-up and exit.
+        """
+        self.proc.stdin.close()
+        self.proc.stdout.read()
+        self.proc.stdout.close()
+        _, status, rusage = os.wait4(self.proc.pid, 0)
+        self.proc.returncode = os.waitstatus_to_exitcode(status)
+        stats = {"pid": self.proc.pid, "jobs": self.jobs}
+        stats.update(_rusage_stats(rusage))
+        stats["total_cpu_s"] = stats["cpu_s"]
+        if None not in self.cpu:
+            stats["cpu_s"] = self.cpu[1] - self.cpu[0]
+        return stats
+
+
+# ============================================================================
+# Load test
+# ============================================================================
+
+def run_load(jobs, inputs, options, warmup_jobs=()):
+    """Run ``jobs`` at ``options.concurrency``; returns (records, workers, wall).
+
+    In ``serve`` mode every worker first runs ``warmup_jobs`` (imports,
+    model loading) before the clock starts; those are not recorded.
+    """
+    pending = queue.Queue()
+    for index, job in enumerate(jobs):
+        pending.put((index, job))
+    records = [None] * len(jobs)
+    workers = []
+    lock = threading.Lock()
+    gate = threading.Barrier(options.concurrency + 1)
+
+    def loop():
+        worker = ServeWorker(options) if options.mode == "serve" else None
+        if worker is not None:
+            with lock:
+                workers.append(worker)
+            for job in warmup_jobs:
+                worker.run(job, inputs[job["task_type"]])
+            worker.start_clock()
+        gate.wait()
+        while True:
+            try:
+                index, job = pending.get_nowait()
+            except queue.Empty:
+                if worker is not None:
+                    worker.stop_clock()
+                return
+            audio_path = inputs[job["task_type"]]
+            if worker is not None:
+                record = worker.run(job, audio_path)
+            else:
+                record = run_oneshot(job, audio_path, options)
+            record.update(job)
+            records[index] = record
+
+    threads = [threading.Thread(target=loop) for _ in range(options.concurrency)]
+    for thread in threads:
+        thread.start()
+    gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return records, [worker.close() for worker in workers], wall
+
+
+def _percentiles(values):
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return None
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "mean": round(float(np.mean(values)), 3),
+        "max": round(float(np.max(values)), 3),
+    }
+
+
+def summarize(records, workers, wall, options):
+    """The load-test report."""
+    latencies = [r["latency_s"] for r in records]
+    if options.mode == "serve":
+        cpu_s = sum(w["cpu_s"] for w in workers)
+        worker_stats = [
+            {
+                key: round(value, 2) if isinstance(value, float) else value
+                for key, value in w.items()
+            }
+            for w in workers
+        ]
+    else:
+        cpu_s = sum(r["cpu_s"] for r in records)
+        worker_stats = None
+    by_task = {}
+    for task in TASK_TYPES:
+        for word_timestamps in (False, True):
+            subset = [
+                r for r in records
+                if r["task_type"] == task and r["word_timestamps"] == word_timestamps
+            ]
+            if not subset:
+                continue
+            entry = {
+                "jobs": len(subset),
+                "latency_s": _percentiles([r["latency_s"] for r in subset]),
+            }
+            if options.mode == "oneshot":
+                entry["peak_rss_mb"] = _percentiles([r["peak_rss_mb"] for r in subset])
+            name = task + ("+asr" if word_timestamps else "")
+            by_task[name] = entry
+    report = {
+        "mode": options.mode,
+        "concurrency": options.concurrency,
+        "jobs": len(records),
+        "errors": sum(not r["ok"] for r in records),
+        "over_timeout": sum(r["latency_s"] > options.timeout for r in records),
+        "wall_s": round(wall, 3),
+        "throughput_jobs_s": round(len(records) / wall, 3) if wall > 0 else None,
+        "latency_s": _percentiles(latencies),
+        "cpu": {
+            "cpu_s": round(cpu_s, 2),
+            "cores": os.cpu_count(),
+            # Share of the host's cores kept busy by the extraction processes
+            "utilization": round(cpu_s / (wall * os.cpu_count()), 3) if wall > 0 else None,
+        },
+        "by_task": by_task,
+    }
+    if worker_stats is not None:
+        report["workers"] = worker_stats
+    else:
+        report["peak_rss_mb"] = _percentiles([r["peak_rss_mb"] for r in records])
+    return report
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test extract_features_v5.py with a mix of jobs"
+    )
+    parser.add_argument("--mode", choices=("oneshot", "serve"), default="oneshot")
+    parser.add_argument(
+        "--concurrency", type=int, default=os.cpu_count() or 1,
+        help="Jobs in flight at once (default: CPU count)",
+    )
+    parser.add_argument("--jobs", type=int, default=20, help="Timed jobs (default 20)")
+    parser.add_argument(
+        "--warmup", type=int, default=2,
+        help="Untimed jobs per worker before the run, serve mode only (default 2)",
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix,
+        default=parse_mix("conversation=1,sustained_vowel=1,ddk=1,fluency=1"),
+        help="Task weights, e.g. conversation=4,sustained_vowel=2,ddk=1,fluency=1",
+    )
+    parser.add_argument(
+        "--word-timestamps-ratio", type=float, default=0.5,
+        help="Share of jobs run with --word-timestamps (default 0.5)",
+    )
+    parser.add_argument("--whisper-model", default="tiny")
+    parser.add_argument(
+        "--asr-backend", choices=("whisper", "whisper-int8", "stub"), default="stub",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0,
+        help="Length of the synthetic recordings in seconds (default 30)",
+    )
+    parser.add_argument(
+        "--audio", action="append", default=[], metavar="TASK=PATH",
+        help="Use a real recording for a task type (repeatable)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=PIPELINE_TIMEOUT_S,
+        help="Latency counted as over the Node pipeline timeout (default 120)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.concurrency < 1 or args.jobs < 1 or args.warmup < 0:
+        parser.error("--concurrency and --jobs must be at least 1, --warmup at least 0")
+    if not 0.0 <= args.word_timestamps_ratio <= 1.0:
+        parser.error("--word-timestamps-ratio must be between 0 and 1")
+    if not hasattr(os, "wait4"):
+        parser.error("this harness needs os.wait4 (Unix)")
+
+    workdir = tempfile.mkdtemp(prefix="cvf-loadtest-")
+    try:
+        inputs = write_inputs(workdir, args.duration)
+        for item in args.audio:
+            task, _, path = item.partition("=")
+            if task not in TASK_TYPES or not os.path.isfile(path):
+                parser.error(f"--audio {item!r}: expected TASK=PATH to an existing file")
+            inputs[task] = os.path.abspath(path)
+
+        jobs = plan_jobs(args.jobs, args.mix, args.word_timestamps_ratio, args.seed)
+        warmup_jobs = plan_jobs(
+            args.warmup if args.mode == "serve" else 0, args.mix,
+            args.word_timestamps_ratio, args.seed + 1,
+        )
+        records, workers, wall = run_load(jobs, inputs, args, warmup_jobs)
+        report = summarize(records, workers, wall, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report["status"] = "ok"
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
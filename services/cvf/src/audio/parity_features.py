@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+parity_features.py -- numerical parity and speed of V5 against V4.
+
+Runs a reference engine and one or more candidate engines on the same
+recordings and reports, per feature, the absolute and relative difference of
+every candidate from the reference against a tolerance, next to the wall
+time of each engine.  A candidate passes when every shared feature stays
+within tolerance; it is worth enabling when it also beats the reference's
+wall time.
+
+Engines:
+
+  - ``v4``                      previous-engine-releases/audio/extract_features.py
+  - ``v5``                      run_extraction() with its defaults
+  - ``v5:key=value,...``        a V5 fast path, e.g. ``v5:harmonicity_mode=fast``
+                                or ``v5:streaming`` (options in V5_OPTIONS)
+
+Against V4, features whose formula was deliberately revised in V5
+(``FEATURE_VERSIONS`` > 1) are reported as "revised" and do not fail the
+run unless ``--strict``.  To qualify a fast path, compare it with plain V5:
+
+    python parity_features.py --audio-dir corpus/ --task-type sustained_vowel
+    python parity_features.py --manifest corpus.jsonl --reference v5 \
+        --engines v5:harmonicity_mode=fast,v5:nolds_decimation=stride
+
+``--synthetic 10`` runs on the benchmark suite's signals instead of a
+corpus.  Engines run in this process, one after another per recording,
+each warmed up on the first recording first.  V4 computes the nonlinear
+measures on the full-resolution waveform, so keep V4 corpora to short
+recordings.  The exit status is 1 when a candidate drifts.
+"""
+
+import argparse, importlib.util, json, os, statistics, sys, tempfile, time
+
+import extract_features_v5 as v5
+
+V4_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "..", "previous-engine-releases", "audio", "extract_features.py",
+)
+V5_OPTIONS = ("harmonicity_mode", "nolds_points", "nolds_decimation", "streaming")
+DEFAULT_TOLERANCE = {"abs": 1e-6, "rel": 0.01}
+# With sklearn installed nolds fits DFA and D2 with RANSAC (unseeded), so
+# repeated runs of one engine already differ by this much.  Without it both
+# use a least-squares polyfit and get the default tolerance.
+RANSAC_TOLERANCES = {
+    "dfa": {"abs": 0.05, "rel": 0.25},
+    "d2": {"abs": 0.05, "rel": 0.5},
+}
+SYNTHETIC_TASKS = {
+    "vowel": ("sustained_vowel",),
+    "pataka": ("ddk",),
+    "speech": ("conversation", "fluency"),
+}
+
+
+# ============================================================================
+# Engines
+# ============================================================================
+
+_V4 = None
+
+
+def _v4_module():
+    global _V4
+    if _V4 is None:
+        spec = importlib.util.spec_from_file_location(
+            "extract_features_v4", os.path.realpath(V4_SCRIPT),
+        )
+        _V4 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_V4)
+    return _V4
+
+
+def run_v4(audio_path, task_type, gender):
+    """V4 features for one recording, dispatched as V4's ``main()`` does."""
+    import librosa, parselmouth
+    v4 = _v4_module()
+    y, sr = librosa.load(audio_path, sr=16000, mono=True)
+    sound = parselmouth.Sound(audio_path)
+    if task_type == "conversation":
+        features = {**v4.extract_tier1(sound, y, sr), **v4.extract_tier2(sound, y, sr)}
+    elif task_type == "sustained_vowel":
+        features = {**v4.extract_sustained_vowel(sound, y, sr), **v4.extract_vowel_space(sound)}
+    elif task_type == "ddk":
+        features = v4.extract_ddk(y, sr)
+    else:
+        features = v4.extract_tier1(sound, y, sr)
+    return v4.sanitize_features(features)
+
+
+def parse_engine(spec):
+    """``"v5:harmonicity_mode=fast,streaming"`` -> ("v5", {options})."""
+    name, _, rest = spec.partition(":")
+    if name not in ("v4", "v5"):
+        raise ValueError(f"unknown engine {spec!r}")
+    options = {}
+    for item in filter(None, rest.split(",")):
+        key, eq, value = item.partition("=")
+        if name != "v5" or key not in V5_OPTIONS:
+            raise ValueError(f"unknown option {key!r} for engine {spec!r}")
+        if not eq:
+            options[key] = True
+        elif value.lower() in ("true", "false"):
+            options[key] = value.lower() == "true"
+        else:
+            options[key] = int(value) if value.isdigit() else value
+    return name, options
+
+
+def run_engine(spec, audio_path, task_type, gender):
+    """Features of ``spec`` for one recording.
+
+    Raises
+    ------
+    v5.JobError
+        If a V5 option is invalid or unsupported for the task (e.g.
+        streaming a sustained vowel).
+    """
+    name, options = parse_engine(spec)
+    if name == "v4":
+        return run_v4(audio_path, task_type, gender)
+    v5.validate_job(
+        audio_path, task_type, gender,
+        harmonicity_mode=options.get("harmonicity_mode", "hpss"),
+        nolds_points=options.get("nolds_points"),
+        nolds_decimation=options.get("nolds_decimation", "stride"),
+        streaming=options.get("streaming", False),
+    )
+    return v5.run_extraction(audio_path, task_type, gender=gender, **options)["features"]
+
+
+# ============================================================================
+# Comparison
+# ============================================================================
+
+def ransac_fits():
+    """True if nolds fits its DFA/D2 lines with sklearn's RANSAC."""
+    try:
+        import sklearn.linear_model  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def feature_tolerances():
+    """Per-feature tolerance overrides for this environment."""
+    return dict(RANSAC_TOLERANCES) if ransac_fits() else {}
+
+
+def tolerance_for(key, tolerances):
+    """{"abs", "rel"} for feature ``key`` from a tolerance config."""
+    tol = dict(tolerances.get("default", DEFAULT_TOLERANCE))
+    tol.update(tolerances.get("features", {}).get(key, {}))
+    return tol
+
+
+def diff_features(reference, candidate, tolerances):
+    """Per-feature differences for the keys both engines return.
+
+    A value pair is within tolerance when the absolute difference is at
+    most ``abs`` or the relative one (to the reference) at most ``rel``.
+    Two nulls match; one null never does.
+    """
+    rows = {}
+    for key in reference.keys() & candidate.keys():
+        ref, cand = reference[key], candidate[key]
+        tol = tolerance_for(key, tolerances)
+        if ref is None or cand is None:
+            rows[key] = {"abs": None, "rel": None, "ok": ref is None and cand is None}
+            continue
+        abs_diff = abs(float(cand) - float(ref))
+        rel_diff = abs_diff / abs(ref) if ref else (0.0 if not abs_diff else float("inf"))
+        rows[key] = {
+            "abs": abs_diff, "rel": rel_diff,
+            "ok": abs_diff <= tol["abs"] or rel_diff <= tol["rel"],
+        }
+    return rows
+
+
+def summarize_features(diffs, tolerances, revised=()):
+    """Aggregate per-recording ``diff_features`` rows by feature."""
+    by_key = {}
+    for rows in diffs:
+        for key, row in rows.items():
+            by_key.setdefault(key, []).append(row)
+    summary = {}
+    for key in sorted(by_key):
+        rows = by_key[key]
+        finite = [r["rel"] for r in rows if r["rel"] is not None and r["rel"] != float("inf")]
+        failures = sum(not r["ok"] for r in rows)
+        status = "ok" if not failures else ("revised" if key in revised else "drift")
+        summary[key] = {
+            "n": len(rows),
+            "max_abs": max((r["abs"] for r in rows if r["abs"] is not None), default=None),
+            "max_rel": max(finite, default=None),
+            "mean_rel": statistics.fmean(finite) if finite else None,
+            "out_of_tolerance": failures,
+            "tolerance": tolerance_for(key, tolerances),
+            "status": status,
+        }
+        for field in ("max_abs", "max_rel", "mean_rel"):
+            if summary[key][field] is not None:
+                summary[key][field] = round(summary[key][field], 6)
+    return summary
+
+
+# ============================================================================
+# Harness
+# ============================================================================
+
+def run_parity(jobs, reference, engines, tolerances, strict=False, details=False,
+               log=None):
+    """Run every engine on ``jobs`` and build the parity report."""
+    specs = [reference] + [e for e in engines if e != reference]
+    records = []
+    for index, job in enumerate(jobs):
+        record = {"id": job["id"], "task_type": job["task_type"], "engines": {}}
+        for spec in specs:
+            if index == 0:
+                # Untimed warm-up: imports, numba compilation, Praat start-up
+                try:
+                    run_engine(spec, job["audio_path"], job["task_type"], job["gender"])
+                except Exception:
+                    pass
+            started = time.perf_counter()
+            try:
+                features = run_engine(
+                    spec, job["audio_path"], job["task_type"], job["gender"],
+                )
+                entry = {"features": features}
+            except v5.JobError as exc:
+                entry = {"unsupported": str(exc)}
+            except Exception as exc:
+                entry = {"error": f"{type(exc).__name__}: {exc}"}
+            entry["wall_s"] = time.perf_counter() - started
+            record["engines"][spec] = entry
+        records.append(record)
+        if log is not None:
+            walls = " ".join(
+                f"{spec}={entry['wall_s']:.2f}s" for spec, entry in record["engines"].items()
+            )
+            print(f"{job['id']} [{job['task_type']}] {walls}", file=log)
+
+    revised = set()
+    if parse_engine(reference)[0] == "v4" and not strict:
+        revised = {key for key, rev in v5.FEATURE_VERSIONS.items() if rev > 1}
+    report = {"reference": reference, "recordings": len(records), "engines": {}}
+    drift = False
+    for spec in specs[1:]:
+        diffs, ref_walls, walls, out_of_tol = [], [], [], []
+        counts = {"compared": 0, "unsupported": 0, "errors": 0}
+        for record in records:
+            ref, cand = record["engines"][reference], record["engines"][spec]
+            if "unsupported" in cand or "unsupported" in ref:
+                counts["unsupported"] += 1
+                continue
+            if "error" in cand or "error" in ref:
+                counts["errors"] += 1
+                continue
+            counts["compared"] += 1
+            rows = diff_features(ref["features"], cand["features"], tolerances)
+            diffs.append(rows)
+            ref_walls.append(ref["wall_s"])
+            walls.append(cand["wall_s"])
+            bad = {k: r for k, r in rows.items() if not r["ok"]}
+            if bad:
+                out_of_tol.append({"id": record["id"], "task_type": record["task_type"], "features": bad})
+        features = summarize_features(diffs, tolerances, revised)
+        within = not counts["errors"] and all(
+            f["status"] != "drift" for f in features.values()
+        )
+        drift = drift or not within
+        speedup = sum(ref_walls) / sum(walls) if walls and sum(walls) > 0 else None
+        entry = {
+            **counts,
+            "wall_s": {
+                "total": round(sum(walls), 3),
+                "median": round(statistics.median(walls), 3) if walls else None,
+                "reference_total": round(sum(ref_walls), 3),
+                "reference_median": round(statistics.median(ref_walls), 3) if ref_walls else None,
+            },
+            "speedup": round(speedup, 3) if speedup is not None else None,
+            "within_tolerance": within,
+            "faster": speedup is not None and speedup > 1.0,
+            "features": features,
+        }
+        entry["verdict"] = "pass" if within and entry["faster"] else (
+            "slower" if within else "drift"
+        )
+        if details:
+            entry["out_of_tolerance"] = out_of_tol
+            entry["failures"] = [
+                {"id": r["id"], "error": r["engines"][spec]["error"]}
+                for r in records if "error" in r["engines"][spec]
+            ]
+        report["engines"][spec] = entry
+    report["status"] = "drift" if drift else "ok"
+    return report
+
+
+def synthetic_jobs(directory, duration_s):
+    """WAVs of the benchmark signals in ``directory`` as jobs per task."""
+    import soundfile as sf
+    import benchmark_features as bench
+    jobs = []
+    for signal, tasks in SYNTHETIC_TASKS.items():
+        path = os.path.join(directory, f"{signal}.wav")
+        sf.write(path, bench.SIGNALS[signal](duration_s), bench.SR, subtype="PCM_16")
+        for task in tasks:
+            jobs.append({"id": f"{signal}/{task}", "audio_path": path, "task_type": task})
+    return jobs
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    import backfill_features
+
+    parser = argparse.ArgumentParser(
+        description="Compare V5 (and its fast paths) with V4 feature by feature"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--audio-dir", help="Corpus directory (recursive)")
+    source.add_argument("--manifest", help="JSON-lines manifest as in backfill_features.py")
+    source.add_argument(
+        "--synthetic", type=float, metavar="SECONDS",
+        help="Use the benchmark suite's synthetic signals of this length",
+    )
+    parser.add_argument(
+        "--task-type", default="conversation",
+        help="Comma-separated task types for corpus entries without one "
+             "(each recording runs once per type; default conversation)",
+    )
+    parser.add_argument("--gender", choices=sorted(v5.F0_NORMS), default="female")
+    parser.add_argument("--reference", default="v4", help="Reference engine (default v4)")
+    parser.add_argument(
+        "--engines", default="v5",
+        help="Comma-separated candidate engines; separate a V5 spec's own "
+             "options with '+', e.g. v5,v5:harmonicity_mode=fast+nolds_decimation=stride",
+    )
+    parser.add_argument(
+        "--abs", type=float, default=DEFAULT_TOLERANCE["abs"],
+        help="Default absolute tolerance",
+    )
+    parser.add_argument(
+        "--rel", type=float, default=DEFAULT_TOLERANCE["rel"],
+        help="Default relative tolerance",
+    )
+    parser.add_argument(
+        "--tolerances", default=None,
+        help='JSON file: {"default": {"abs": ..., "rel": ...}, '
+             '"features": {"<key>": {"abs": ..., "rel": ...}}}',
+    )
+    parser.add_argument(
+        "--strict", action="store_true", default=False,
+        help="Against V4, fail revised features (FEATURE_VERSIONS) too",
+    )
+    parser.add_argument(
+        "--details", action="store_true", default=False,
+        help="List every out-of-tolerance value and engine failure",
+    )
+    args = parser.parse_args()
+
+    engines = [e.replace("+", ",") for e in args.engines.split(",") if e]
+    try:
+        for spec in [args.reference] + engines:
+            parse_engine(spec)
+    except ValueError as exc:
+        parser.error(str(exc))
+    task_types = [t for t in args.task_type.split(",") if t]
+    for task in task_types:
+        if task not in v5.VALID_TASK_TYPES:
+            parser.error(f"unknown task type {task!r}")
+
+    tolerances = {
+        "default": {"abs": args.abs, "rel": args.rel},
+        "features": feature_tolerances(),
+    }
+    if args.tolerances:
+        with open(args.tolerances, encoding="utf-8") as fh:
+            config = json.load(fh)
+        tolerances["default"].update(config.get("default", {}))
+        tolerances["features"].update(config.get("features", {}))
+
+    with tempfile.TemporaryDirectory(prefix="cvf-parity-") as workdir:
+        if args.synthetic is not None:
+            jobs = synthetic_jobs(workdir, args.synthetic)
+        else:
+            listed = (
+                backfill_features.iter_audio_dir(args.audio_dir) if args.audio_dir
+                else backfill_features.iter_manifest(args.manifest)
+            )
+            jobs = []
+            for job in listed:
+                for task in [job["task_type"]] if job.get("task_type") else task_types:
+                    jobs.append({**job, "task_type": task})
+        for job in jobs:
+            job.setdefault("gender", None)
+            job["gender"] = job["gender"] or args.gender
+        if not jobs:
+            parser.error("no recordings found")
+        report = run_parity(
+            jobs, args.reference, engines, tolerances, strict=args.strict,
+            details=args.details, log=sys.stderr,
+        )
+    print(json.dumps(report))
+    if report["status"] != "ok":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
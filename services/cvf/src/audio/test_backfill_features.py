@@ -0,0 +1,52 @@
+"""Unit tests for backfill_features.py staleness checks.
+
+Run from this directory: ``python -m pytest -q``.
+"""
+
+import backfill_features as backfill
+import extract_features_v5 as v5
+
+
+def _current(task_type):
+    keys = v5.task_feature_keys(task_type)
+    return {
+        "features": dict.fromkeys(keys, 1.0),
+        "feature_versions": {key: v5.feature_version(key) for key in keys},
+    }
+
+
+def test_current_result_is_not_stale():
+    assert backfill.stale_features(_current("conversation"), "conversation") == []
+
+
+def test_missing_features_are_stale():
+    result = _current("fluency")
+    del result["features"]["hnr"]
+    assert backfill.stale_features(result, "fluency") == ["hnr"]
+
+
+def test_stored_null_is_current():
+    result = _current("fluency")
+    result["features"]["hnr"] = None
+    assert backfill.stale_features(result, "fluency") == []
+
+
+def test_unversioned_result_counts_as_revision_one():
+    result = _current("conversation")
+    del result["feature_versions"]
+    revised = [
+        key for key in v5.task_feature_keys("conversation")
+        if v5.feature_version(key) > 1
+    ]
+    assert revised == ["breathiness_h1h2"]
+    assert backfill.stale_features(result, "conversation") == revised
+
+
+def test_older_revision_is_stale():
+    result = _current("conversation")
+    result["feature_versions"]["breathiness_h1h2"] = 1
+    assert backfill.stale_features(result, "conversation") == ["breathiness_h1h2"]
+
+
+def test_empty_result_needs_every_feature():
+    assert backfill.stale_features({}, "ddk") == list(v5.task_feature_keys("ddk"))
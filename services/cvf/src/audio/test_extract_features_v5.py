@@ -0,0 +1,213 @@
+"""Unit tests for extract_features_v5.py helpers that need no model downloads.
+
+Run from this directory: ``python -m pytest -q``.
+"""
+
+import argparse, io, json, os
+
+import numpy as np
+import pytest
+
+import extract_features_v5 as v5
+
+SR = 16000
+
+
+def _write_wav(path, y, sr=SR):
+    import soundfile as sf
+    sf.write(str(path), y, sr, subtype="PCM_16")
+    return str(path)
+
+
+def _serve_defaults(**overrides):
+    defaults = dict(
+        task_type="ddk", gender="female", gpu=False, whisper_model="base",
+        word_timestamps=False, harmonicity_mode="hpss", nolds_points=None,
+        nolds_decimation="stride", streaming=False, vad=True, asr_backend="stub",
+        concurrent_asr=True, features=None, profile=False, no_cache=True,
+    )
+    defaults.update(overrides)
+    return argparse.Namespace(**defaults)
+
+
+def _serve(lines, **overrides):
+    stdout = io.StringIO()
+    v5.serve(
+        _serve_defaults(**overrides),
+        stdin=io.StringIO("".join(json.dumps(line) + "\n" for line in lines)),
+        stdout=stdout,
+    )
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+# ============================================================================
+# VAD time remapping
+# ============================================================================
+
+REGIONS = np.array([[1 * SR, 2 * SR], [4 * SR, 5 * SR]], dtype=np.int64)
+
+
+def test_remap_times_inside_regions():
+    mapped = v5._remap_times([0.0, 0.5, 1.5], REGIONS, SR, "start")
+    np.testing.assert_allclose(mapped, [1.0, 1.5, 4.5])
+
+
+def test_remap_times_joint_depends_on_side():
+    # 1.0 s on the concatenated timeline is both the end of region 0 and
+    # the start of region 1.
+    assert v5._remap_times([1.0], REGIONS, SR, "start")[0] == pytest.approx(4.0)
+    assert v5._remap_times([1.0], REGIONS, SR, "end")[0] == pytest.approx(2.0)
+
+
+def test_remap_times_clamps_to_last_region():
+    assert v5._remap_times([2.7], REGIONS, SR, "end")[0] == pytest.approx(5.0)
+
+
+# ============================================================================
+# Job validation and worker mode
+# ============================================================================
+
+@pytest.fixture
+def wav_path(tmp_path):
+    t = np.arange(2 * SR) / SR
+    y = 0.3 * np.sin(2 * np.pi * 140 * t) * (np.sin(2 * np.pi * 3 * t) > 0)
+    return _write_wav(tmp_path / "clip.wav", y.astype(np.float32))
+
+
+@pytest.mark.parametrize("value", ["false", "true", 0, 1, None])
+def test_validate_job_rejects_non_boolean_flags(wav_path, value):
+    with pytest.raises(v5.JobError, match="vad must be true or false"):
+        v5.validate_job(wav_path, "ddk", flags={"vad": value})
+
+
+def test_validate_job_accepts_booleans(wav_path):
+    flags = dict.fromkeys(v5.JOB_FLAGS, False)
+    assert v5.validate_job(wav_path, "ddk", flags=flags) == os.path.realpath(wav_path)
+
+
+def test_validate_job_rejects_streaming_compare(wav_path):
+    with pytest.raises(v5.JobError):
+        v5.validate_job(
+            wav_path, "conversation", harmonicity_mode="compare", streaming=True,
+        )
+
+
+@pytest.mark.parametrize("flag", v5.JOB_FLAGS)
+def test_serve_reports_string_flag_per_job(wav_path, flag):
+    results = _serve([{"id": "a", "audio_path": wav_path, flag: "false"}])
+    assert results == [{
+        "status": "error", "error": f"{flag} must be true or false",
+        "features": None, "id": "a",
+    }]
+
+
+def test_serve_keeps_running_after_error(wav_path):
+    results = _serve([
+        {"id": "bad", "audio_path": wav_path, "streaming": "false"},
+        {"id": "ok", "audio_path": wav_path, "word_timestamps": True,
+         "features": ["ddk_rate"]},
+    ])
+    assert [r["id"] for r in results] == ["bad", "ok"]
+    assert results[0]["status"] == "error"
+    ok = results[1]
+    assert ok["status"] == "ok"
+    assert list(ok["features"]) == ["ddk_rate"]
+    # The stub ASR backend turns each 1/6 s burst into a word
+    assert ok["whisper"]["backend"] == "stub"
+    assert ok["whisper"]["vad"]["mode"] == "energy"
+    assert len(ok["whisper"]["words"]) == 6
+    starts = [w["start"] for w in ok["whisper"]["words"]]
+    assert starts == sorted(starts)
+
+
+# ============================================================================
+# Result cache
+# ============================================================================
+
+def test_result_cache_round_trip(tmp_path):
+    cache = v5.ResultCache(tmp_path / "cache")
+    key = cache.key("digest", {"task_type": "ddk"})
+    assert cache.get(key) is None
+    cache.put(key, {"status": "ok", "features": {"ddk_rate": 5.0}})
+    assert cache.get(key) == {"status": "ok", "features": {"ddk_rate": 5.0}}
+    assert os.stat(cache._path(key)).st_mode & 0o077 == 0
+
+
+def test_result_cache_key_covers_parameters():
+    base = v5.ResultCache.key("digest", {"task_type": "ddk", "gpu": False})
+    assert base == v5.ResultCache.key("digest", {"gpu": False, "task_type": "ddk"})
+    assert base != v5.ResultCache.key("digest", {"task_type": "ddk", "gpu": True})
+    assert base != v5.ResultCache.key("other", {"task_type": "ddk", "gpu": False})
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    result = {"blob": "x" * 1000}
+    entry_size = len(json.dumps(result))
+    cache = v5.ResultCache(tmp_path / "cache", max_bytes=2 * entry_size)
+    keys = [cache.key(f"d{i}", {}) for i in range(3)]
+    cache.put(keys[0], result)
+    cache.put(keys[1], result)
+    os.utime(cache._path(keys[0]), (1000, 1000))
+    os.utime(cache._path(keys[1]), (2000, 2000))
+    assert cache.get(keys[0]) is not None   # refreshes keys[0]
+    cache.put(keys[2], result)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_result_cache_failed_write_leaves_nothing(tmp_path):
+    cache = v5.ResultCache(tmp_path / "cache")
+    key = cache.key("digest", {})
+    cache.put(key, {"old": True})
+
+    def dump(fh):
+        fh.write(b'{"partial": ')
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        cache._write(key, dump)
+    assert cache.get(key) == {"old": True}
+    leftovers = [
+        name for _, _, files in os.walk(cache.directory) for name in files
+        if name.endswith(".tmp")
+    ]
+    assert leftovers == []
+
+
+def test_result_cache_drops_corrupt_entry(tmp_path):
+    cache = v5.ResultCache(tmp_path / "cache")
+    key = cache.key("digest", {})
+    cache.put(key, {"ok": True})
+    with open(cache._path(key), "w") as fh:
+        fh.write("{not json")
+    assert cache.get(key) is None
+    assert not os.path.exists(cache._path(key))
+
+
+# ============================================================================
+# Feature plans
+# ============================================================================
+
+def test_plan_full_task():
+    plan = v5.plan_features("conversation")
+    assert plan["features"] == list(v5.task_feature_keys("conversation"))
+    assert plan["extractors"] == list(v5.TASK_EXTRACTORS["conversation"])
+    assert plan["unavailable"] == []
+
+
+def test_plan_subset_runs_only_needed_extractors():
+    plan = v5.plan_features("conversation", ["cpp", "spectral_tilt"])
+    assert plan["features"] == ["cpp", "spectral_tilt"]
+    assert "tier2" in plan["extractors"] and "v5_acoustic" in plan["extractors"]
+    assert "tier1" not in plan["extractors"]
+    assert plan["analyses"] == ["cepstrum", "spectrum"]
+    assert "pitch" not in plan["analyses"]
+
+
+def test_plan_reports_unavailable_keys():
+    plan = v5.plan_features("ddk", ["ddk_rate", "hnr", "no_such_feature"])
+    assert plan["features"] == ["ddk_rate"]
+    assert plan["extractors"] == ["ddk"]
+    assert plan["analyses"] == ["stft"]
+    assert plan["unavailable"] == ["hnr", "no_such_feature"]
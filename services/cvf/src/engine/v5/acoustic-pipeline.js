@@ -11,11 +11,14 @@
  *   - computeWhisperTemporalIndicators() for converting Whisper word arrays into
  *     measured temporal indicators that replace text-proxy estimates
  *
+ * Audio reaches Python over stdin: ffmpeg decodes straight to 16kHz mono
+ * s16le PCM on a pipe, so no intermediate WAV is written to disk.
+ *
  * Graceful degradation: if Python or ffmpeg are unavailable, all audio
  * indicators return null rather than throwing.
  */
 
-import { execFile } from 'child_process';
+import { execFile, spawn } from 'child_process';
 import { promisify } from 'util';
 import path from 'path';
 import fs from 'fs/promises';
@@ -26,6 +29,14 @@ const execFileAsync = promisify(execFile);
 
 const VALID_TASK_TYPES = new Set(['conversation', 'sustained_vowel', 'ddk', 'fluency']);
 const VALID_GENDERS = new Set(['male', 'female']);
+const VALID_ASR_BACKENDS = new Set(['whisper', 'whisper-int8', 'stub']);
+
+// Containers ffmpeg cannot demux from a non-seekable pipe (index at the end
+// of the file). These are still staged to a temp input file.
+const SEEKABLE_INPUT_FORMATS = new Set(['mp4', 'm4a', 'mov', '3gp']);
+
+const EXTRACTION_TIMEOUT_MS = 120_000;
+const MAX_STDOUT_BYTES = 16 * 1024 * 1024;
 
 const PYTHON_SCRIPT = path.resolve(
   path.dirname(new URL(import.meta.url).pathname),
@@ -68,6 +79,13 @@ const PYTHON_KEY_TO_INDICATOR = {
   loudness_decay:        'ACU_LOUDNESS_DECAY',
 };
 
+// Keys computed here from other Python features (see extractAcousticFeatures);
+// requesting one asks Python for its inputs instead.
+const DERIVED_FEATURE_INPUTS = {
+  f1f2_ratio: ['f1_mean', 'f2_mean'],
+  monopitch:  ['f0_sd', 'f0_mean'],
+};
+
 // Features where HIGHER raw value = WORSE cognitive/motor health.
 // These use inverted sigmoid: score = 0.5 - 0.5 * tanh(...)
 const HIGHER_IS_WORSE = new Set([
@@ -141,6 +159,108 @@ export async function convertToWav(inputBuffer, inputFormat = 'wav') {
   }
 }
 
+// ─────────────────────────────────────────────────────────────────────────────
+// runExtractor
+// ─────────────────────────────────────────────────────────────────────────────
+
+/**
+ * Run the Python extractor with audio streamed on its stdin.
+ *
+ * With `ffmpegInput` set, ffmpeg decodes that file path (or `pipe:0`, fed
+ * from `inputBuffer`) to 16kHz mono s16le and its stdout is piped into
+ * Python. Otherwise `inputBuffer` is written to Python's stdin as is.
+ * Rejects like execFile: non-zero exit or timeout -> Error with `.stderr`.
+ *
+ * @param {string[]} args — Python script arguments.
+ * @param {Object} options
+ * @param {Buffer} options.inputBuffer — Bytes to feed (to ffmpeg or Python).
+ * @param {string|null} options.ffmpegInput — ffmpeg `-i` argument, or null to skip ffmpeg.
+ * @returns {Promise<{stdout: string}>}
+ */
+function runExtractor(args, { inputBuffer, ffmpegInput = null } = {}) {
+  return new Promise((resolve, reject) => {
+    const py = spawn('python3', args, { stdio: ['pipe', 'pipe', 'pipe'] });
+    const children = [py];
+    let ffmpeg = null;
+    let stdoutBytes = 0;
+    let settled = false;
+    const stdoutChunks = [];
+    let stderr = '';
+
+    const fail = (err) => {
+      if (settled) return;
+      settled = true;
+      clearTimeout(timer);
+      for (const child of children) child.kill('SIGKILL');
+      err.stderr = err.stderr || stderr;
+      reject(err);
+    };
+    const timer = setTimeout(
+      () => fail(new Error(`Extraction timed out after ${EXTRACTION_TIMEOUT_MS}ms`)),
+      EXTRACTION_TIMEOUT_MS,
+    );
+
+    // Exit codes resolve on 'close'; Node does not order the two children's
+    // events, so results are only judged once every child has exited.
+    const exitCode = (child) => new Promise((done) => child.on('close', done));
+    const exits = [exitCode(py)];
+
+    py.on('error', fail);
+    py.stdin.on('error', () => {}); // EPIPE if Python exits early; exit code reports it
+    py.stderr.on('data', (chunk) => {
+      if (stderr.length < 64 * 1024) stderr += chunk.toString();
+    });
+    py.stdout.on('data', (chunk) => {
+      stdoutBytes += chunk.length;
+      if (stdoutBytes > MAX_STDOUT_BYTES) {
+        fail(new Error('Extractor output exceeded limit'));
+        return;
+      }
+      stdoutChunks.push(chunk);
+    });
+
+    if (ffmpegInput) {
+      ffmpeg = spawn('ffmpeg', [
+        '-hide_banner', '-loglevel', 'error',
+        '-i', ffmpegInput,
+        '-ar', '16000',
+        '-ac', '1',
+        '-f', 's16le',
+        'pipe:1',
+      ], { stdio: ['pipe', 'pipe', 'pipe'] });
+      children.push(ffmpeg);
+      ffmpeg.on('error', fail);
+      ffmpeg.stdin.on('error', () => {});
+      ffmpeg.stderr.on('data', (chunk) => {
+        if (stderr.length < 64 * 1024) stderr += chunk.toString();
+      });
+      exits.push(exitCode(ffmpeg));
+      ffmpeg.stdout.pipe(py.stdin);
+      if (ffmpegInput === 'pipe:0') ffmpeg.stdin.end(inputBuffer);
+      else ffmpeg.stdin.end();
+    } else {
+      py.stdin.end(inputBuffer);
+    }
+
+    // A decoder that dies mid-stream leaves Python with truncated PCM, which
+    // it may still analyse and exit 0 on.
+    Promise.all(exits).then(([code, ffmpegCode = 0]) => {
+      if (settled) return;
+      if (ffmpegCode !== 0) {
+        fail(new Error('ffmpeg failed to decode audio'));
+        return;
+      }
+      if (code !== 0) {
+        fail(new Error(`Python extractor exited with code ${code}`));
+        return;
+      }
+      settled = true;
+      clearTimeout(timer);
+      resolve({ stdout: Buffer.concat(stdoutChunks).toString() });
+    });
+  });
+}
+
 // ─────────────────────────────────────────────────────────────────────────────
 // normalizeAcousticValue
 // ─────────────────────────────────────────────────────────────────────────────
@@ -313,7 +433,15 @@ export function computeWhisperTemporalIndicators(words) {
  * @param {boolean} options.gpu — Enable GPU acceleration (default true).
  * @param {string} options.whisperModel — Whisper model size (default 'large-v3').
  * @param {boolean} options.wordTimestamps — Request word-level timestamps (default true).
- * @returns {Promise<Object>} — { acousticVector, temporalIndicators, whisperResult }
+ * @param {string} options.asrBackend — ASR implementation: 'whisper', 'whisper-int8'
+ *   (int8-quantized, CPU) or 'stub' (deterministic, for tests) (default 'whisper').
+ * @param {string[]|null} options.features — Python feature keys to compute (derived keys
+ *   such as f1f2_ratio request their inputs); null computes every key of the task
+ *   (default null). Indicators of keys left out are null.
+ * @param {boolean} options.profile — Record per-stage wall time, CPU time and peak memory
+ *   (default false).
+ * @returns {Promise<Object>} — { acousticVector, temporalIndicators, whisperResult, timings }
+ *   (timings is null unless profile is set)
  */
 export async function extractAcousticFeatures(audioBuffer, {
   format = 'wav',
@@ -322,31 +450,46 @@ export async function extractAcousticFeatures(audioBuffer, {
   gpu = true,
   whisperModel = 'large-v3',
   wordTimestamps = true,
+  asrBackend = 'whisper',
+  features = null,
+  profile = false,
 } = {}) {
   if (!VALID_TASK_TYPES.has(taskType)) {
     throw new Error(`Invalid taskType: must be one of ${[...VALID_TASK_TYPES].join(', ')}`);
   }
+  if (!VALID_ASR_BACKENDS.has(asrBackend)) {
+    throw new Error(`Invalid asrBackend: must be one of ${[...VALID_ASR_BACKENDS].join(', ')}`);
+  }
+  if (features !== null && (!Array.isArray(features) || features.length === 0
+      || !features.every(key => typeof key === 'string' && /^[a-z0-9_]+$/.test(key)))) {
+    throw new Error('Invalid features: must be a non-empty array of feature keys');
+  }
   const safeGender = VALID_GENDERS.has(gender) ? gender : 'female';
 
   const tempFiles = [];
 
   try {
-    // Convert to 16kHz mono WAV if not already WAV
-    let wavPath;
-    if (format === 'wav') {
-      wavPath = tempPath('wav');
-      await fs.writeFile(wavPath, audioBuffer);
-      await fs.chmod(wavPath, 0o600);
-      tempFiles.push(wavPath);
-    } else {
-      wavPath = await convertToWav(audioBuffer, format);
-      tempFiles.push(wavPath);
+    // Stream audio to Python on stdin: WAV as is, anything else decoded by
+    // ffmpeg to 16kHz mono s16le PCM on a pipe
+    let ffmpegInput = null;
+    let inputFormat = 'wav';
+    if (format !== 'wav') {
+      inputFormat = 's16le';
+      ffmpegInput = 'pipe:0';
+      if (SEEKABLE_INPUT_FORMATS.has(format)) {
+        ffmpegInput = tempPath(format);
+        await fs.writeFile(ffmpegInput, audioBuffer);
+        await fs.chmod(ffmpegInput, 0o600);
+        tempFiles.push(ffmpegInput);
+      }
     }
 
     // Build Python invocation arguments
     const args = [
       PYTHON_SCRIPT,
-      '--audio-path', wavPath,
+      '--audio-path', '-',
+      '--input-format', inputFormat,
+      '--sample-rate', '16000',
       '--task-type', taskType,
       '--gender', safeGender,
     ];
@@ -354,10 +497,16 @@ export async function extractAcousticFeatures(audioBuffer, {
     if (wordTimestamps) {
       args.push('--whisper-model', whisperModel);
       args.push('--word-timestamps');
+      args.push('--asr-backend', asrBackend);
+    }
+    if (features !== null) {
+      const keys = new Set(features.flatMap(key => DERIVED_FEATURE_INPUTS[key] ?? [key]));
+      args.push('--features', [...keys].join(','));
     }
+    if (profile) args.push('--profile');
 
     // Invoke Python extraction script (V5 may take longer with Whisper — 120s timeout)
-    const { stdout } = await execFileAsync('python3', args, { timeout: 120_000 });
+    const { stdout } = await runExtractor(args, { inputBuffer: audioBuffer, ffmpegInput });
 
     // Parse Python output with prototype pollution protection
     const result = JSON.parse(stdout.trim(), (key, value) => {
@@ -374,6 +523,7 @@ export async function extractAcousticFeatures(audioBuffer, {
         acousticVector: buildNullVector(),
         temporalIndicators: {},
         whisperResult: null,
+        timings: null,
       };
     }
 
@@ -437,6 +587,7 @@ export async function extractAcousticFeatures(audioBuffer, {
       acousticVector: vector,
       temporalIndicators,
       whisperResult,
+      timings: result.timings ?? null,
     };
 
   } catch (err) {
@@ -450,6 +601,7 @@ export async function extractAcousticFeatures(audioBuffer, {
       acousticVector: buildNullVector(),
       temporalIndicators: {},
       whisperResult: null,
+      timings: null,
     };
   } finally {
     await cleanup(tempFiles);
@@ -474,7 +626,15 @@ export async function extractAcousticFeatures(audioBuffer, {
  * @param {boolean} options.gpu — Enable GPU acceleration (default true).
  * @param {string} options.whisperModel — Whisper model size (default 'large-v3').
  * @param {boolean} options.wordTimestamps — Request word-level timestamps (default true).
- * @returns {Promise<Object>} — { acousticVector, temporalIndicators, whisperResult }
+ * @param {string} options.asrBackend — ASR implementation: 'whisper', 'whisper-int8'
+ *   (int8-quantized, CPU) or 'stub' (deterministic, for tests) (default 'whisper').
+ * @param {string[]|null} options.features — Python feature keys to compute (derived keys
+ *   such as f1f2_ratio request their inputs); null computes every key of the task
+ *   (default null). Indicators of keys left out are null.
+ * @param {boolean} options.profile — Record per-stage wall time, CPU time and peak memory
+ *   (default false).
+ * @returns {Promise<Object>} — { acousticVector, temporalIndicators, whisperResult, timings }
+ *   (timings is null unless profile is set)
  */
 export async function extractMicroTaskAudio(audioBuffer, taskType, {
   format = 'wav',
@@ -482,6 +642,9 @@ export async function extractMicroTaskAudio(audioBuffer, taskType, {
   gpu = true,
   whisperModel = 'large-v3',
   wordTimestamps = true,
+  asrBackend = 'whisper',
+  features = null,
+  profile = false,
 } = {}) {
   if (!VALID_TASK_TYPES.has(taskType)) {
     throw new Error(`Invalid taskType: must be one of ${[...VALID_TASK_TYPES].join(', ')}`);
@@ -493,6 +656,9 @@ export async function extractMicroTaskAudio(audioBuffer, taskType, {
     gpu,
     whisperModel,
     wordTimestamps,
+    asrBackend,
+    features,
+    profile,
   });
 }
 